@@ -0,0 +1,114 @@
+"""
+게이트웨이 관리 라우터
+캐시 상태 조회 등 운영용 엔드포인트 (X-Admin-Token 헤더로 보호)
+"""
+import os
+import hmac
+import logging
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from dotenv import load_dotenv
+
+from app.foundation.jwt_cache import get_jwt_cache
+from app.foundation.token_revocation_cache import get_revocation_cache
+from app.foundation.response_cache import get_response_cache
+from app.foundation.resilience import get_all_upstream_stats
+from app.foundation.request_coalescer import get_request_coalescer
+from app.foundation.rate_limiter import get_rate_limiter
+from app.foundation.idempotency import get_idempotency_store
+from app.foundation.stream_proxy import get_connection_tracker
+from app.foundation.adaptive_concurrency import get_all_concurrency_stats
+from app.foundation.load_balancer import get_load_balancer
+from app.domain.model.service_type import ServiceType
+
+# 환경 변수 로드
+load_dotenv()
+
+# 로거 설정
+logger = logging.getLogger("gateway-api")
+
+# 관리 엔드포인트 접근 토큰 (미설정 시 관리 엔드포인트 비활성화)
+GATEWAY_ADMIN_TOKEN = os.getenv("GATEWAY_ADMIN_TOKEN")
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """X-Admin-Token 헤더 검증"""
+    if not GATEWAY_ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리 엔드포인트가 비활성화되어 있습니다."
+        )
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, GATEWAY_ADMIN_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리자 토큰이 올바르지 않습니다."
+        )
+
+
+# APIRouter 인스턴스 생성
+admin_router = APIRouter(tags=["Gateway Admin"], dependencies=[Depends(require_admin_token)])
+
+@admin_router.get("/stats/jwt-cache", summary="검증된 JWT 캐시 통계")
+async def jwt_cache_stats():
+    """JWT 캐시 크기 및 적중률을 반환합니다."""
+    return get_jwt_cache().stats()
+
+@admin_router.get("/stats/blacklist-cache", summary="토큰 블랙리스트 로컬 캐시 통계")
+async def blacklist_cache_stats():
+    """블랙리스트 로컬 캐시 구독 상태와 적중 카운터를 반환합니다."""
+    return get_revocation_cache().stats()
+
+@admin_router.get("/stats/response-cache", summary="공유 응답 캐시 통계")
+async def response_cache_stats():
+    """응답 캐시 적중률과 304 응답 수를 반환합니다."""
+    return get_response_cache().stats()
+
+@admin_router.get("/stats/coalescing", summary="동일 GET 요청 병합 통계")
+async def coalescing_stats():
+    """병합된 요청 수(hits)와 병합이 일어난 업스트림 호출 수(collapses)를 반환합니다."""
+    return get_request_coalescer().stats()
+
+@admin_router.get("/stats/upstreams", summary="업스트림 서킷 브레이커/재시도/헤지 상태")
+async def upstream_stats():
+    """ServiceType별 서킷 상태, 오류율, 재시도 예산, 헤지 횟수를 반환합니다."""
+    return get_all_upstream_stats()
+
+@admin_router.get("/stats/load-balancer", summary="업스트림 레플리카 상태")
+async def load_balancer_stats():
+    """ServiceType별 레플리카의 진행 중 요청 수, EWMA 지연, 제외 상태를 반환합니다."""
+    return {service_type.value: get_load_balancer(service_type).stats() for service_type in ServiceType}
+
+@admin_router.get("/stats/concurrency", summary="업스트림 적응형 동시 요청 한도/대기열 상태")
+async def concurrency_stats():
+    """서비스별 현재 한도, 진행 중 요청 수, 대기열 길이, 거부 횟수를 반환합니다."""
+    return get_all_concurrency_stats()
+
+@admin_router.get("/stats/rate-limit", summary="사용자별 속도/동시 요청 제한 통계")
+async def rate_limit_stats():
+    """적용 중인 규칙과 허용/거부 횟수를 반환합니다."""
+    return get_rate_limiter().stats()
+
+@admin_router.get("/stats/idempotency", summary="Idempotency-Key 중복 실행 방지 통계")
+async def idempotency_stats():
+    """실행/재생/대기/키 재사용 거부 횟수를 반환합니다."""
+    return get_idempotency_store().stats()
+
+@admin_router.get("/stats/streams", summary="SSE/WebSocket 장시간 연결 통계")
+async def stream_stats():
+    """활성 연결 수, 연결 수 제한 거부, 유휴 시간 초과 종료 횟수를 반환합니다."""
+    return get_connection_tracker().stats()
+
+@admin_router.post("/cache/purge", summary="공유 응답 캐시 삭제")
+async def purge_response_cache(
+    prefix: Optional[str] = Query(None, description="삭제할 게이트웨이 경로 접두사 (예: /api/disclosure/disclosure-data/terms), 생략 시 전체")
+):
+    """공유 응답 캐시(Redis 및 현재 레플리카의 L1)를 삭제합니다."""
+    try:
+        deleted = await get_response_cache().purge(prefix)
+    except Exception as e:
+        logger.error(f"응답 캐시 purge 실패: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"응답 캐시 삭제 실패: {str(e)}"
+        )
+    return {"prefix": prefix, "deleted": deleted}
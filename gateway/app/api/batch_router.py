@@ -0,0 +1,168 @@
+"""
+배치 프록시 라우터
+여러 하위 요청(method, service, path, body)을 한 번의 왕복으로 처리한다.
+
+- 인증은 배치 요청에 대해 한 번만 수행된다 (AuthMiddleware가 주입한 x-user-id를 하위 요청에 전달).
+- 하위 요청은 서비스별 공유 클라이언트로 동시에 보내되, 배치당 동시 실행 수를 제한한다.
+- 하위 요청에도 사용자별 속도/동시 요청 제한 규칙을 각각 적용한다 (배치로 우회하지 못하도록).
+- 결과는 요청 순서대로 항목별 상태 코드와 본문을 담아 반환한다.
+"""
+import os
+import json
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from pydantic import BaseModel, Field
+from dotenv import load_dotenv
+
+from app.domain.model.service_type import ServiceType
+from app.domain.model.service_factory import ServiceProxyFactory
+from app.foundation.rate_limiter import get_rate_limiter
+from app.foundation.request_deadline import ClientDisconnected, cancel_on_disconnect
+
+# 환경 변수 로드
+load_dotenv()
+
+# 로거 설정
+logger = logging.getLogger("gateway-api")
+
+# 배치당 최대 하위 요청 수 / 동시 실행 수
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "20"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "6"))
+
+ALLOWED_METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE"}
+# 배치 요청에서 하위 요청으로 전달하는 헤더
+FORWARDED_HEADERS = ("x-user-id", "authorization", "cookie", "accept-language", "x-request-id", "x-request-deadline")
+
+
+class BatchSubRequest(BaseModel):
+    """배치 하위 요청"""
+    id: Optional[str] = Field(None, description="클라이언트가 결과를 찾기 위한 식별자 (생략 시 순번)")
+    method: str = Field("GET", description="HTTP 메서드")
+    service: ServiceType
+    path: str = Field(..., description="서비스 내 경로 (예: disclosure-data/disclosures)")
+    query: Optional[Dict[str, Any]] = None
+    body: Optional[Any] = None
+
+
+class BatchRequest(BaseModel):
+    """배치 요청 본문"""
+    requests: List[BatchSubRequest] = Field(..., min_length=1)
+    concurrency: Optional[int] = Field(None, ge=1, description=f"동시 실행 수 (최대 {BATCH_MAX_CONCURRENCY})")
+
+
+class BatchSubResponse(BaseModel):
+    """배치 하위 응답"""
+    id: str
+    status: int
+    headers: Dict[str, str] = {}
+    body: Optional[Any] = None
+
+
+class BatchResponse(BaseModel):
+    """배치 응답 본문"""
+    results: List[BatchSubResponse]
+
+
+# APIRouter 인스턴스 생성
+batch_router = APIRouter(tags=["Batch"])
+
+
+def _decode_body(response) -> Any:
+    """하위 응답 본문을 JSON(가능하면) 또는 텍스트로 변환"""
+    if not response.content:
+        return None
+    content_type = response.headers.get("content-type", "")
+    if "json" in content_type:
+        try:
+            return response.json()
+        except ValueError:
+            pass
+    if content_type.startswith("text/") or "json" in content_type or not content_type:
+        return response.text
+    return {"detail": f"배치에서 지원하지 않는 응답 형식입니다: {content_type}"}
+
+
+async def _run_sub_request(
+    item_id: str,
+    sub_request: BatchSubRequest,
+    headers: Dict[str, str],
+    user_id: Optional[str],
+    semaphore: asyncio.Semaphore,
+) -> BatchSubResponse:
+    method = sub_request.method.upper()
+    if method not in ALLOWED_METHODS:
+        return BatchSubResponse(id=item_id, status=405, body={"detail": f"지원하지 않는 메서드입니다: {method}"})
+    path = sub_request.path.lstrip("/")
+
+    admission = None
+    async with semaphore:
+        try:
+            if user_id:
+                admission = await get_rate_limiter().admit(method, f"/api/{sub_request.service.value}/{path}", user_id)
+                if not admission.allowed:
+                    return BatchSubResponse(
+                        id=item_id,
+                        status=429,
+                        headers={"retry-after": str(max(int(admission.retry_after + 0.999), 1))},
+                        body={"detail": admission.detail},
+                    )
+
+            sub_headers = dict(headers)
+            body = None
+            if sub_request.body is not None:
+                body = json.dumps(sub_request.body, ensure_ascii=False).encode("utf-8")
+                sub_headers["content-type"] = "application/json"
+
+            factory = ServiceProxyFactory(service_type=sub_request.service)
+            response = await factory.request(
+                method=method,
+                path=path,
+                headers=sub_headers,
+                body=body,
+                params=sub_request.query,
+            )
+            response_headers = {
+                name: response.headers[name]
+                for name in ("content-type", "etag", "cache-control", "retry-after")
+                if name in response.headers
+            }
+            return BatchSubResponse(
+                id=item_id, status=response.status_code, headers=response_headers, body=_decode_body(response)
+            )
+        except Exception as e:
+            logger.error(f"배치 하위 요청 처리 실패: id={item_id}, {str(e)}")
+            return BatchSubResponse(id=item_id, status=502, body={"detail": f"하위 요청 처리 중 오류 발생: {str(e)}"})
+        finally:
+            if admission is not None and admission.lease is not None:
+                await get_rate_limiter().release(admission.lease)
+
+
+@batch_router.post("/batch", response_model=BatchResponse, summary="여러 하위 요청 일괄 처리")
+async def batch(batch_request: BatchRequest, request: Request):
+    """
+    하위 요청들을 동시에 실행하고 요청 순서대로 결과를 반환합니다.
+    개별 하위 요청의 실패는 해당 항목의 status로만 표시되며 배치 전체는 200을 반환합니다.
+    """
+    if len(batch_request.requests) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"배치당 최대 {BATCH_MAX_ITEMS}개의 하위 요청만 허용됩니다."
+        )
+
+    headers = {name: request.headers[name] for name in FORWARDED_HEADERS if name in request.headers}
+    user_id = request.headers.get("x-user-id")
+    concurrency = min(batch_request.concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    logger.info(f"📦 배치 요청: items={len(batch_request.requests)}, concurrency={concurrency}")
+    try:
+        # 클라이언트가 연결을 끊으면 남은 하위 요청도 모두 취소
+        results = await cancel_on_disconnect(request, asyncio.gather(*[
+            _run_sub_request(sub_request.id or str(index), sub_request, headers, user_id, semaphore)
+            for index, sub_request in enumerate(batch_request.requests)
+        ]))
+    except ClientDisconnected:
+        return Response(status_code=499)
+    return BatchResponse(results=list(results))
@@ -1,42 +1,218 @@
+import time
+import asyncio
 import httpx
-from app.domain.model.service_type import ServiceType, SERVICE_URLS
+from app.domain.model.service_type import ServiceType, SERVICE_URLS, SERVICE_TIMEOUTS
+from app.foundation.http_client_pool import get_upstream_client
+from app.foundation.resilience import CircuitOpenError, get_upstream_guard
+from app.foundation.metrics import record_timing
+from app.foundation.load_balancer import get_load_balancer
+from app.foundation.request_deadline import apply_deadline
+from app.foundation.adaptive_concurrency import ConcurrencyLimitExceeded, get_concurrency_limiter
+from app.foundation.upload_stream import UploadRejected
+
+# 레플리카 장애로 보고 로드 밸런서 헬스 상태에 반영하는 상태 코드
+REPLICA_FAILURE_STATUS_CODES = {502, 503, 504}
+
+class _SlotHoldingStream(httpx.AsyncByteStream):
+    """스트리밍 본문이 닫힐 때(끝까지 읽었거나 aclose) 동시 요청 슬롯을 반환"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            release, self._release = self._release, None
+            if release is not None:
+                release()
 
 class ServiceProxyFactory:
     """서비스 프록시 팩토리 클래스"""
-    
+
     def __init__(self, service_type: ServiceType):
         self.service_type = service_type
         self.base_url = SERVICE_URLS.get(service_type)
         if not self.base_url:
             raise ValueError(f"서비스 {service_type}에 대한 기본 URL이 구성되지 않았습니다.")
-    
-    async def request(self, method: str, path: str, headers=None, body=None, files=None, params=None, data=None, timeout=30):
-        """지정된 서비스에 요청을 전달합니다."""
-        url = f"{self.base_url}/{path}"
-        
-        # 헤더 처리 - 딕셔너리 형태로 수정
+        self.balancer = get_load_balancer(service_type)
+
+    @staticmethod
+    def _clean_headers(headers) -> dict:
+        """업스트림으로 전달하면 안 되는 헤더 제거"""
         clean_headers = {}
         if headers:
             for name, value in headers.items():
                 if name.lower() not in ['host', 'content-length']:
                     clean_headers[name] = value
-        
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            try:
-                response = await client.request(
+        return clean_headers
+
+    def _apply_deadline(self, clean_headers: dict, timeout) -> float:
+        """X-Request-Deadline 헤더 설정 후 남은 시간(업스트림 타임아웃으로 사용) 반환"""
+        if timeout is None:
+            timeout = SERVICE_TIMEOUTS.get(self.service_type, 30.0)
+        _, remaining = apply_deadline(clean_headers, timeout)
+        return remaining
+
+    async def _send_to_replica(self, send_to, headers: dict) -> httpx.Response:
+        """
+        로드 밸런서가 고른 레플리카로 한 번 전송 (재시도/헤지는 매번 다시 선택)
+        send_to: 레플리카 base URL을 받아 응답을 반환하는 코루틴 함수
+        """
+        affinity_key = headers.get("x-user-id") if self.balancer.sticky else None
+        endpoint = self.balancer.pick(affinity_key)
+        self.balancer.start(endpoint)
+        started = time.perf_counter()
+        failed = None  # None이면 취소되었거나 클라이언트 업로드가 거부됨
+        try:
+            response = await send_to(endpoint.url)
+            failed = response.status_code in REPLICA_FAILURE_STATUS_CODES
+            return response
+        except (asyncio.CancelledError, UploadRejected):
+            # 레플리카 상태와 무관한 종료는 헬스 상태에 반영하지 않음
+            raise
+        except Exception:
+            failed = True
+            raise
+        finally:
+            if failed is None:
+                self.balancer.release(endpoint)
+            else:
+                self.balancer.finish(endpoint, time.perf_counter() - started, failed)
+
+    async def _limited(self, call) -> httpx.Response:
+        """
+        적응형 동시 요청 제한 적용 (대상 서비스가 아니면 그대로 호출)
+        한도를 넘으면 대기열에서 기다리고, 응답 헤더까지의 지연과 실패 여부로 한도를 조절한다.
+        본문을 읽지 않은 스트리밍 응답(SSE 등)은 본문이 닫힐 때까지 슬롯을 유지한다.
+        """
+        limiter = get_concurrency_limiter(self.service_type)
+        if limiter is None:
+            return await call()
+
+        await limiter.acquire()
+        started = time.perf_counter()
+        latency = None
+        dropped = False
+        held = False
+        try:
+            response = await call()
+            latency = time.perf_counter() - started
+            dropped = response.status_code in REPLICA_FAILURE_STATUS_CODES
+            if not response.is_closed:
+                # 업스트림은 본문을 다 보낼 때까지 요청을 처리 중이므로 스트림이 닫힐 때 반환
+                response.stream = _SlotHoldingStream(response.stream, lambda: limiter.release(latency, dropped))
+                held = True
+            return response
+        except (asyncio.CancelledError, CircuitOpenError, UploadRejected):
+            # 업스트림 상태와 무관한 종료(취소, 서킷 차단, 클라이언트 업로드 거부)는 표본에서 제외
+            raise
+        except Exception:
+            dropped = True
+            raise
+        finally:
+            if not held:
+                limiter.release(latency, dropped)
+
+    def _error_response(self, error: Exception, as_json: bool) -> httpx.Response:
+        """
+        업스트림 호출 실패를 게이트웨이 응답으로 변환
+        서킷이 열렸거나 동시 요청 대기열이 가득 찬 경우 503 + Retry-After, 타임아웃은 504, 그 외 연결 오류는 502
+        """
+        headers = {}
+        if isinstance(error, (CircuitOpenError, ConcurrencyLimitExceeded)):
+            status_code = 503
+            headers["retry-after"] = str(int(error.retry_after + 0.999))
+            detail = str(error)
+        elif isinstance(error, httpx.TimeoutException):
+            status_code = 504
+            detail = f"{self.service_type.value} 서비스 응답 시간 초과: {str(error)}"
+        else:
+            status_code = 502
+            detail = f"서비스 요청 중 오류 발생: {str(error)}"
+
+        if as_json:
+            return httpx.Response(status_code=status_code, headers=headers, json={"detail": detail})
+        return httpx.Response(status_code=status_code, headers=headers, content=detail.encode())
+
+    async def request(self, method: str, path: str, headers=None, body=None, files=None, params=None, data=None, timeout=None):
+        """
+        지정된 서비스에 요청을 전달합니다.
+        서비스별 공유 클라이언트(커넥션 풀)를 사용하며, timeout을 생략하면 서비스별 기본 타임아웃을 따릅니다.
+        """
+        # 헤더 처리 - 딕셔너리 형태로 수정
+        clean_headers = self._clean_headers(headers)
+        # 서비스가 남은 시간을 알 수 있도록 마감 시각 전달 (타임아웃도 남은 시간으로 맞춤)
+        timeout = self._apply_deadline(clean_headers, timeout)
+
+        client = get_upstream_client(self.service_type)
+        guard = get_upstream_guard(self.service_type)
+        started = time.perf_counter()
+        try:
+            return await self._limited(lambda: guard.execute(method, lambda: self._send_to_replica(
+                lambda base_url: client.request(
                     method=method,
-                    url=url,
+                    url=f"{base_url}/{path}",
                     headers=clean_headers,
                     content=body,
                     files=files,
                     params=params,
-                    data=data
-                )
-                return response
-            except Exception as e:
-                # 예외 발생 시 에러 응답 반환
-                error_response = httpx.Response(
-                    status_code=500,
-                    content=f"서비스 요청 중 오류 발생: {str(e)}".encode()
-                )
-                return error_response
+                    data=data,
+                    timeout=timeout
+                ),
+                clean_headers
+            )))
+        except Exception as e:
+            # 예외 발생 시 에러 응답 반환
+            return self._error_response(e, as_json=False)
+        finally:
+            record_timing("upstream", time.perf_counter() - started)
+
+    async def stream(self, method: str, path: str, headers=None, body=None, files=None, params=None, data=None, timeout=None, idle_timeout=None):
+        """
+        지정된 서비스에 요청을 전달하고, 본문을 읽지 않은 응답을 반환합니다.
+        본문은 raw 바이트(content-encoding 유지) 그대로 읽어야 하며, 호출 측에서 aclose()로 커넥션을 반환해야 합니다.
+        idle_timeout을 주면 본문 청크 사이의 최대 대기 시간으로 사용합니다 (SSE 등 장시간 응답).
+        """
+        clean_headers = self._clean_headers(headers)
+        # 클라이언트가 압축을 요청하지 않았다면 업스트림도 압축하지 않도록 명시 (raw 바이트를 그대로 전달하므로)
+        if not any(name.lower() == "accept-encoding" for name in clean_headers):
+            clean_headers["accept-encoding"] = "identity"
+        timeout = self._apply_deadline(clean_headers, timeout)
+        if idle_timeout is not None:
+            timeout = httpx.Timeout(min(timeout, idle_timeout), read=idle_timeout)
+
+        client = get_upstream_client(self.service_type)
+        guard = get_upstream_guard(self.service_type)
+
+        def send_to(base_url: str):
+            # 재시도/헤지 시에도 매번 새 요청 객체로 전송
+            upstream_request = client.build_request(
+                method=method,
+                url=f"{base_url}/{path}",
+                headers=clean_headers,
+                content=body,
+                files=files,
+                params=params,
+                data=data,
+                timeout=timeout
+            )
+            return client.send(upstream_request, stream=True)
+
+        def send():
+            return self._send_to_replica(send_to, clean_headers)
+
+        started = time.perf_counter()
+        try:
+            return await self._limited(lambda: guard.execute(method, send))
+        except Exception as e:
+            # 예외 발생 시 에러 응답 반환 (스트리밍 모드에서는 JSON 본문으로 생성)
+            return self._error_response(e, as_json=True)
+        finally:
+            # 응답 헤더 수신까지의 시간 (본문 스트리밍 시간은 제외)
+            record_timing("upstream", time.perf_counter() - started)
@@ -18,3 +18,26 @@ SERVICE_URLS = {
     ServiceType.CLIMATE: os.getenv("CLIMATE_SERVICE_URL", "http://climate-service:8087"),
     ServiceType.N8N: os.getenv("N8N_SERVICE_URL", "http://n8n:5678"),
 }
+
+# 서비스별 업스트림 엔드포인트 목록 (환경 변수에 쉼표로 구분해 여러 레플리카 지정 가능)
+# 예: REPORT_SERVICE_URL=http://report-0:8082,http://report-1:8082
+SERVICE_ENDPOINTS = {
+    service_type: [url.strip().rstrip("/") for url in urls.split(",") if url.strip()]
+    for service_type, urls in SERVICE_URLS.items()
+}
+
+# 단일 URL이 필요한 곳에서 쓰는 대표(첫 번째) 엔드포인트
+SERVICE_URLS = {
+    service_type: endpoints[0] if endpoints else None
+    for service_type, endpoints in SERVICE_ENDPOINTS.items()
+}
+
+# 서비스별 업스트림 요청 타임아웃(초)
+SERVICE_TIMEOUTS = {
+    ServiceType.CHATBOT: float(os.getenv("CHATBOT_SERVICE_TIMEOUT", "30")),
+    ServiceType.REPORT: float(os.getenv("REPORT_SERVICE_TIMEOUT", "30")),
+    ServiceType.DISCLOSURE: float(os.getenv("DISCLOSURE_SERVICE_TIMEOUT", "30")),
+    ServiceType.AUTH: float(os.getenv("AUTH_SERVICE_TIMEOUT", "30")),
+    ServiceType.CLIMATE: float(os.getenv("CLIMATE_SERVICE_TIMEOUT", "30")),
+    ServiceType.N8N: float(os.getenv("N8N_SERVICE_TIMEOUT", "30")),
+}
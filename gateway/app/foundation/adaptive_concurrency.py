@@ -0,0 +1,213 @@
+"""
+업스트림별 적응형 동시 요청 제한 (ServiceType별)
+GPU 챗봇처럼 동시 처리량이 일정 수준을 넘으면 처리량은 줄고 지연만 늘어나는 업스트림 앞에서,
+관측한 지연으로 동시 요청 한도를 자동으로 조절하고 초과 요청은 게이트웨이에서 대기시킨다.
+
+- 알고리즘 (ADAPTIVE_LIMIT_ALGORITHM)
+  - gradient: 최소 지연(무부하 지연) 대비 현재 지연 비율(gradient)로 한도를 줄이고, 허용 범위 안이면 +√limit만큼 늘림
+    (최소 지연은 ADAPTIVE_LIMIT_MIN_RTT_RESET 표본마다 다시 측정해 업스트림 성능 변화를 따라감)
+  - aimd: 지연이 임계값 이하이면 한도 +1, 초과하거나 실패하면 한도 × ADAPTIVE_LIMIT_BACKOFF
+- 한도를 다 쓰지 않을 때(진행 중 < 한도/2)는 한도를 늘리지 않는다.
+- 초과 요청은 최대 ADAPTIVE_LIMIT_QUEUE_SIZE개까지 대기열에서 최대 ADAPTIVE_LIMIT_QUEUE_TIMEOUT초 기다리고,
+  대기열이 가득 차거나 대기 시간을 넘기면 503 + Retry-After
+- 한도/진행 중/대기열 길이는 /metrics와 /admin/stats/concurrency로 노출
+
+진행 중 요청은 응답 본문이 닫힐 때까지 센다 (스트리밍/SSE 응답은 업스트림이 본문을 다 보낼 때까지 처리 중).
+지연 표본은 응답 헤더까지의 시간을 사용한다 (스트리밍 길이가 한도 조절에 섞이지 않도록).
+"""
+import os
+import math
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from dotenv import load_dotenv
+
+from app.domain.model.service_type import ServiceType, SERVICE_TIMEOUTS
+
+load_dotenv()
+
+logger = logging.getLogger("gateway-api")
+
+# 적응형 제한을 적용할 서비스 (쉼표 구분 ServiceType 값)
+ADAPTIVE_LIMIT_SERVICES = {
+    value.strip() for value in os.getenv("ADAPTIVE_LIMIT_SERVICES", "chatbot").split(",") if value.strip()
+}
+ADAPTIVE_LIMIT_ALGORITHM = os.getenv("ADAPTIVE_LIMIT_ALGORITHM", "gradient").lower()
+ADAPTIVE_LIMIT_INITIAL = float(os.getenv("ADAPTIVE_LIMIT_INITIAL", "4"))
+ADAPTIVE_LIMIT_MIN = float(os.getenv("ADAPTIVE_LIMIT_MIN", "1"))
+ADAPTIVE_LIMIT_MAX = float(os.getenv("ADAPTIVE_LIMIT_MAX", "32"))
+ADAPTIVE_LIMIT_QUEUE_SIZE = int(os.getenv("ADAPTIVE_LIMIT_QUEUE_SIZE", "16"))
+ADAPTIVE_LIMIT_QUEUE_TIMEOUT = float(os.getenv("ADAPTIVE_LIMIT_QUEUE_TIMEOUT", "10"))
+# 실패/지연 초과 시 한도 감소 비율
+ADAPTIVE_LIMIT_BACKOFF = float(os.getenv("ADAPTIVE_LIMIT_BACKOFF", "0.9"))
+# aimd: 서비스 타임아웃 대비 지연 임계값 비율
+ADAPTIVE_LIMIT_LATENCY_FRACTION = float(os.getenv("ADAPTIVE_LIMIT_LATENCY_FRACTION", "0.5"))
+# gradient: 최소 지연 대비 허용 지연 배율, 최소 지연 재측정 주기(표본 수), 한도 변경 평활 계수
+ADAPTIVE_LIMIT_TOLERANCE = float(os.getenv("ADAPTIVE_LIMIT_TOLERANCE", "2.0"))
+ADAPTIVE_LIMIT_MIN_RTT_RESET = int(os.getenv("ADAPTIVE_LIMIT_MIN_RTT_RESET", "500"))
+ADAPTIVE_LIMIT_SMOOTHING = float(os.getenv("ADAPTIVE_LIMIT_SMOOTHING", "0.2"))
+# 평균 지연 EWMA 계수 (Retry-After 추정용)
+ADAPTIVE_LIMIT_RTT_ALPHA = float(os.getenv("ADAPTIVE_LIMIT_RTT_ALPHA", "0.1"))
+
+
+class ConcurrencyLimitExceeded(Exception):
+    """동시 요청 한도 초과로 대기열에 들어가지 못했거나 대기 시간을 넘김"""
+
+    def __init__(self, service_type: ServiceType, retry_after: float, reason: str):
+        self.service_type = service_type
+        self.retry_after = retry_after
+        self.reason = reason
+        detail = "대기열이 가득 찼습니다" if reason == "queue_full" else "대기 시간을 초과했습니다"
+        super().__init__(f"{service_type.value} 서비스 처리량 한도 도달 ({detail}). 잠시 후 다시 시도하세요.")
+
+
+class AdaptiveConcurrencyLimiter:
+    """ServiceType 하나의 동시 요청 한도, 대기열, 한도 조절"""
+
+    def __init__(self, service_type: ServiceType, algorithm: str = ADAPTIVE_LIMIT_ALGORITHM):
+        self.service_type = service_type
+        self.algorithm = algorithm
+        self.limit = ADAPTIVE_LIMIT_INITIAL
+        self.in_flight = 0
+        self.avg_rtt = 0.0  # 초, 0이면 아직 측정 전
+        self.min_rtt = 0.0
+        self._samples_since_reset = 0
+        self.latency_threshold = SERVICE_TIMEOUTS.get(service_type, 30.0) * ADAPTIVE_LIMIT_LATENCY_FRACTION
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.queued = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.drops = 0
+
+    def _has_capacity(self) -> bool:
+        return self.in_flight < max(int(self.limit), 1)
+
+    def _retry_after(self) -> float:
+        # 대기열이 한 번 빠지는 데 걸릴 대략의 시간
+        return max(self.avg_rtt * (len(self._waiters) + 1) / max(self.limit, 1.0), 1.0)
+
+    async def acquire(self, timeout: float = ADAPTIVE_LIMIT_QUEUE_TIMEOUT):
+        """슬롯 획득 (필요하면 대기열에서 대기). 실패 시 ConcurrencyLimitExceeded"""
+        if self._has_capacity() and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= ADAPTIVE_LIMIT_QUEUE_SIZE:
+            self.rejected_queue_full += 1
+            raise ConcurrencyLimitExceeded(self.service_type, self._retry_after(), "queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # 슬롯을 넘겨받은 직후에 취소/시간 초과된 경우 다음 대기자에게 넘김
+                self.in_flight -= 1
+                self._wake_waiters()
+            else:
+                waiter.cancel()
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.rejected_timeout += 1
+            raise ConcurrencyLimitExceeded(self.service_type, self._retry_after(), "queue_timeout")
+        self.admitted += 1
+
+    def _wake_waiters(self):
+        while self._waiters and self._has_capacity():
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(True)
+
+    def release(self, latency: Optional[float], dropped: bool = False):
+        """
+        슬롯 반환 및 한도 조절
+        latency: 응답 헤더까지 걸린 시간 (None이면 취소 등으로 표본에서 제외, 슬롯은 본문이 닫힐 때 반환)
+        dropped: 업스트림 과부하/실패 신호 (타임아웃, 502/503/504)
+        """
+        in_flight = self.in_flight
+        self.in_flight = max(self.in_flight - 1, 0)
+        if dropped:
+            self.drops += 1
+            self._set_limit(self.limit * ADAPTIVE_LIMIT_BACKOFF)
+        elif latency is not None:
+            self._update(latency, in_flight)
+        self._wake_waiters()
+
+    def _update(self, latency: float, in_flight: int):
+        self.avg_rtt = latency if self.avg_rtt == 0.0 else self.avg_rtt + ADAPTIVE_LIMIT_RTT_ALPHA * (latency - self.avg_rtt)
+        self._samples_since_reset += 1
+        if self.min_rtt == 0.0 or latency < self.min_rtt or self._samples_since_reset > ADAPTIVE_LIMIT_MIN_RTT_RESET:
+            if self._samples_since_reset > ADAPTIVE_LIMIT_MIN_RTT_RESET:
+                self._samples_since_reset = 0
+            self.min_rtt = latency
+        # 한도를 다 쓰지 않는 동안에는 늘리지 않음 (부하가 적을 때 한도가 무한정 커지지 않도록)
+        app_limited = in_flight < self.limit / 2
+
+        if self.algorithm == "aimd":
+            if latency > self.latency_threshold:
+                self._set_limit(self.limit * ADAPTIVE_LIMIT_BACKOFF)
+            elif not app_limited:
+                self._set_limit(self.limit + 1)
+            return
+
+        gradient = max(0.5, min(1.0, ADAPTIVE_LIMIT_TOLERANCE * self.min_rtt / max(latency, 1e-6)))
+        # 지연이 허용 범위 안이면 √limit만큼 여유를 더해 한도를 늘려 봄
+        headroom = math.sqrt(self.limit) if gradient >= 1.0 else 0.0
+        new_limit = self.limit * gradient + headroom
+        if app_limited and new_limit > self.limit:
+            return
+        self._set_limit(self.limit * (1 - ADAPTIVE_LIMIT_SMOOTHING) + new_limit * ADAPTIVE_LIMIT_SMOOTHING)
+
+    def _set_limit(self, limit: float):
+        previous = int(self.limit)
+        self.limit = min(max(limit, ADAPTIVE_LIMIT_MIN), ADAPTIVE_LIMIT_MAX)
+        if int(self.limit) != previous:
+            logger.info(f"🎚️ 동시 요청 한도 변경: service={self.service_type.value}, {previous} → {int(self.limit)}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "algorithm": self.algorithm,
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queue_depth": len(self._waiters),
+            "min_rtt_ms": round(self.min_rtt * 1000, 1),
+            "avg_rtt_ms": round(self.avg_rtt * 1000, 1),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "drops": self.drops,
+        }
+
+
+_limiters: Dict[ServiceType, AdaptiveConcurrencyLimiter] = {}
+
+# 어디서든 이 함수를 호출하여 서비스별 동시 요청 제한기를 가져올 수 있음 (적용 대상이 아니면 None)
+def get_concurrency_limiter(service_type: ServiceType) -> Optional[AdaptiveConcurrencyLimiter]:
+    if service_type.value not in ADAPTIVE_LIMIT_SERVICES:
+        return None
+    limiter = _limiters.get(service_type)
+    if limiter is None:
+        limiter = _limiters[service_type] = AdaptiveConcurrencyLimiter(service_type)
+    return limiter
+
+
+def get_all_concurrency_stats() -> Dict[str, Any]:
+    """적용 중인 모든 서비스의 동시 요청 제한 상태"""
+    return {
+        service_type.value: limiter.stats()
+        for service_type in ServiceType
+        if (limiter := get_concurrency_limiter(service_type)) is not None
+    }
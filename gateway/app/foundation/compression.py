@@ -0,0 +1,200 @@
+"""
+응답 압축 미들웨어 (gzip / brotli)
+Accept-Encoding으로 인코딩을 협상하고, 응답 본문을 청크 단위로 압축해 전달한다 (전체 본문을 모으지 않음).
+
+- 크기 임계값(COMPRESSION_MIN_SIZE) 미만 응답과 허용 목록 밖의 content-type은 압축하지 않는다.
+- 업스트림이 이미 압축한 응답(content-encoding 존재)과 application/pdf는 건드리지 않는다.
+- brotli 패키지가 설치되어 있지 않으면 gzip만 사용한다.
+"""
+import os
+import zlib
+import logging
+from typing import List, Optional, Tuple
+from dotenv import load_dotenv
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+load_dotenv()
+
+logger = logging.getLogger("gateway-api")
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+# 스트리밍 압축이므로 CPU 비용이 낮은 중간 품질을 기본값으로 사용
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+# 압축 대상 content-type (접두사 매칭)
+COMPRESSION_CONTENT_TYPES = tuple(
+    content_type.strip().lower()
+    for content_type in os.getenv(
+        "COMPRESSION_CONTENT_TYPES",
+        "application/json,application/problem+json,application/javascript,application/xml,text/html,text/plain,text/css,text/csv,image/svg+xml",
+    ).split(",")
+    if content_type.strip()
+)
+# 허용 목록과 관계없이 압축하지 않는 content-type (이미 압축된 형식, 이벤트 스트림)
+NEVER_COMPRESS_CONTENT_TYPES = ("application/pdf", "text/event-stream")
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Accept-Encoding(q 값 포함)에서 사용할 인코딩 선택 (br 우선)"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip()] = quality
+
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in candidates:
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class _Compressor:
+    """gzip/brotli 증분 압축기 공통 인터페이스"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._zlib = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data)
+        return self._zlib.compress(data)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for header_name, value in headers:
+        if header_name.lower() == name:
+            return value
+    return None
+
+
+def _is_compressible(headers: List[Tuple[bytes, bytes]]) -> bool:
+    if _header(headers, b"content-encoding"):
+        return False
+    content_type = (_header(headers, b"content-type") or b"").decode("latin-1").lower()
+    if content_type.startswith(NEVER_COMPRESS_CONTENT_TYPES):
+        return False
+    if not content_type.startswith(COMPRESSION_CONTENT_TYPES):
+        return False
+    content_length = _header(headers, b"content-length")
+    if content_length is not None and content_length.isdigit() and int(content_length) < COMPRESSION_MIN_SIZE:
+        return False
+    return True
+
+
+def _compressed_headers(headers: List[Tuple[bytes, bytes]], encoding: str) -> List[Tuple[bytes, bytes]]:
+    """content-length 제거, content-encoding/vary 추가, 강한 ETag는 약한 ETag로 변경"""
+    result = []
+    vary = None
+    for name, value in headers:
+        lowered = name.lower()
+        if lowered == b"content-length":
+            continue
+        if lowered == b"vary":
+            vary = value
+            continue
+        if lowered == b"etag" and not value.startswith(b"W/"):
+            value = b"W/" + value
+        result.append((name, value))
+    if vary is None:
+        vary = b"accept-encoding"
+    elif b"accept-encoding" not in vary.lower() and vary.strip() != b"*":
+        vary = vary + b", accept-encoding"
+    result.append((b"vary", vary))
+    result.append((b"content-encoding", encoding.encode("latin-1")))
+    return result
+
+
+class CompressionMiddleware:
+    """협상된 인코딩으로 응답 본문을 청크 단위 압축하는 ASGI 미들웨어"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not COMPRESSION_ENABLED or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = _header(scope["headers"], b"accept-encoding")
+        encoding = choose_encoding(accept_encoding.decode("latin-1")) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+        pending: List[bytes] = []
+        passthrough = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message, compressor, passthrough
+            message_type = message["type"]
+
+            if message_type == "http.response.start":
+                headers = list(message.get("headers", []))
+                if message["status"] < 200 or message["status"] in (204, 206, 304) or not _is_compressible(headers):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # 첫 본문 청크를 보고 결정하기 위해 시작 메시지를 보류
+                    start_message = message
+                return
+
+            if message_type != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                # 임계값에 도달하거나 본문이 끝날 때까지만 모아서 압축 여부 결정 (최대 minimum_size 바이트)
+                pending.append(body)
+                pending_size = sum(len(part) for part in pending)
+                if more_body and pending_size < self.minimum_size:
+                    return
+                if not more_body and pending_size < self.minimum_size:
+                    # 작은 응답은 그대로 전달
+                    passthrough = True
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": b"".join(pending), "more_body": False})
+                    return
+                compressor = _Compressor(encoding)
+                await send({**start_message, "headers": _compressed_headers(list(start_message.get("headers", [])), encoding)})
+                body = b"".join(pending)
+                pending.clear()
+
+            chunk = compressor.compress(body) if body else b""
+            if not more_body:
+                chunk += compressor.finish()
+            if chunk or not more_body:
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
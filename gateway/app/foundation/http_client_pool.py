@@ -0,0 +1,97 @@
+"""
+업스트림 HTTP 클라이언트 풀
+ServiceType별로 장수명 httpx.AsyncClient를 하나씩 유지하여 요청마다 발생하던
+TCP/DNS 핸드셰이크를 제거한다. 애플리케이션 lifespan에서 생성/종료한다.
+"""
+import os
+import logging
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+from app.domain.model.service_type import ServiceType, SERVICE_TIMEOUTS
+
+load_dotenv()
+
+logger = logging.getLogger("gateway-api")
+
+# 커넥션 풀 설정 (모든 업스트림 공통)
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "100"))
+UPSTREAM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+UPSTREAM_KEEPALIVE_EXPIRY = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", "30"))
+UPSTREAM_CONNECT_TIMEOUT = float(os.getenv("UPSTREAM_CONNECT_TIMEOUT", "5"))
+# "1.1" | "2" (TLS ALPN 협상) | "h2c" (평문 HTTP/2, prior knowledge)
+UPSTREAM_HTTP_VERSION = os.getenv("UPSTREAM_HTTP_VERSION", "1.1").lower()
+
+
+def _no_cookie_jar() -> CookieJar:
+    """
+    어떤 쿠키도 저장하지 않는 쿠키 저장소
+    공유 클라이언트가 업스트림의 Set-Cookie를 기억해 다른 사용자 요청에
+    실어 보내는 일을 막는다. 쿠키는 요청 헤더로만 전달한다.
+    """
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+class UpstreamClientPool:
+    _clients: Dict[ServiceType, httpx.AsyncClient] = {}
+
+    @classmethod
+    def _create_client(cls, service_type: ServiceType) -> httpx.AsyncClient:
+        timeout = SERVICE_TIMEOUTS.get(service_type, 30.0)
+        http2 = UPSTREAM_HTTP_VERSION in ("2", "h2c")
+        http1 = UPSTREAM_HTTP_VERSION != "h2c"
+
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=min(UPSTREAM_CONNECT_TIMEOUT, timeout)),
+            limits=httpx.Limits(
+                max_connections=UPSTREAM_MAX_CONNECTIONS,
+                max_keepalive_connections=UPSTREAM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=UPSTREAM_KEEPALIVE_EXPIRY,
+            ),
+            http1=http1,
+            http2=http2,
+            cookies=_no_cookie_jar(),
+        )
+
+    @classmethod
+    async def startup(cls):
+        """모든 ServiceType에 대한 클라이언트 생성"""
+        for service_type in ServiceType:
+            if service_type not in cls._clients:
+                cls._clients[service_type] = cls._create_client(service_type)
+        logger.info(
+            f"🔌 업스트림 클라이언트 풀 생성: services={len(cls._clients)}, "
+            f"max_connections={UPSTREAM_MAX_CONNECTIONS}, "
+            f"keepalive={UPSTREAM_MAX_KEEPALIVE_CONNECTIONS}, http={UPSTREAM_HTTP_VERSION}"
+        )
+
+    @classmethod
+    async def shutdown(cls):
+        """모든 클라이언트 종료 (유휴 커넥션 정리)"""
+        clients, cls._clients = cls._clients, {}
+        for service_type, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"업스트림 클라이언트 종료 실패: {service_type.value} - {str(e)}")
+        logger.info("🔌 업스트림 클라이언트 풀 종료")
+
+    @classmethod
+    def get_client(cls, service_type: ServiceType) -> httpx.AsyncClient:
+        """
+        서비스별 공유 클라이언트 반환
+        lifespan 밖(스크립트 등)에서 호출되면 지연 생성한다.
+        """
+        client: Optional[httpx.AsyncClient] = cls._clients.get(service_type)
+        if client is None or client.is_closed:
+            client = cls._create_client(service_type)
+            cls._clients[service_type] = client
+        return client
+
+
+# 어디서든 이 함수를 호출하여 서비스별 업스트림 클라이언트를 가져올 수 있음
+def get_upstream_client(service_type: ServiceType) -> httpx.AsyncClient:
+    return UpstreamClientPool.get_client(service_type)
@@ -0,0 +1,383 @@
+"""
+Idempotency-Key 기반 POST/PATCH 중복 실행 방지 (Redis 공유, 모든 게이트웨이 레플리카 공통)
+더블 클릭이나 프론트엔드 재시도로 같은 보고서 생성/답변 일괄 저장이 여러 번 실행되지 않도록 한다.
+
+- 키는 사용자별로 구분한다 (AuthMiddleware가 주입한 x-user-id + Idempotency-Key).
+- 처음 도착한 요청만 업스트림으로 보내고, 응답(상태/헤더/본문)을 IDEMPOTENCY_TTL 동안 저장한다.
+- 처리 중에 도착한 중복 요청은 다시 실행하지 않고 첫 요청의 결과를 기다린다 (최대 IDEMPOTENCY_WAIT_SECONDS).
+- 이후의 중복 요청에는 저장된 응답을 그대로 돌려준다 (Idempotent-Replayed: true).
+- 같은 키를 다른 메서드/경로/본문의 요청에 재사용하면 422를 반환한다
+  (본문은 해시로 비교하며, IDEMPOTENCY_MAX_REQUEST_BODY_BYTES를 넘는 요청은 중복 제거 없이 통과).
+- 5xx, 408/409/429, 클라이언트 연결 종료(499) 응답은 저장하지 않는다 (재시도 시 다시 실행).
+- Redis 장애 시에는 중복 제거 없이 그대로 통과시킨다 (fail-open).
+"""
+import os
+import json
+import time
+import uuid
+import asyncio
+import hashlib
+import logging
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.foundation.redis_client import get_binary_redis_client
+
+load_dotenv()
+
+logger = logging.getLogger("gateway-api")
+
+IDEMPOTENCY_ENABLED = os.getenv("IDEMPOTENCY_ENABLED", "true").lower() == "true"
+# 완료된 응답 보관 시간(초)
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", "86400"))
+# 처리 중 표시의 보관 시간(초) - 게이트웨이가 비정상 종료되어도 이 시간이 지나면 다시 실행할 수 있음
+IDEMPOTENCY_LOCK_SECONDS = float(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "360"))
+# 중복 요청이 첫 요청의 결과를 기다리는 최대 시간(초)과 Redis 확인 주기(초)
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "330"))
+IDEMPOTENCY_POLL_INTERVAL = float(os.getenv("IDEMPOTENCY_POLL_INTERVAL", "0.25"))
+# 저장할 최대 응답 본문 크기(바이트), 넘으면 저장하지 않음
+IDEMPOTENCY_MAX_BODY_BYTES = int(os.getenv("IDEMPOTENCY_MAX_BODY_BYTES", str(4 * 1024 * 1024)))
+# 요청 식별을 위해 미리 읽는 최대 요청 본문 크기(바이트), 넘으면 중복 제거 없이 통과 (파일 업로드 등)
+IDEMPOTENCY_MAX_REQUEST_BODY_BYTES = int(os.getenv("IDEMPOTENCY_MAX_REQUEST_BODY_BYTES", str(1024 * 1024)))
+IDEMPOTENCY_MAX_KEY_LENGTH = 255
+
+IDEMPOTENCY_METHODS = {"POST", "PATCH"}
+IDEMPOTENCY_KEY_PREFIX = "idem:"
+# 저장하지 않는 응답 상태 코드 (5xx는 별도로 제외)
+NON_STORABLE_STATUS_CODES = {408, 409, 429, 499}
+# 저장된 응답에서 제외하는 헤더
+EXCLUDED_STORED_HEADERS = {b"content-length", b"date", b"server-timing"}
+
+# KEYS[1]=멱등 키(hash), ARGV: 요청 식별(메서드 경로 본문 해시), 처리 토큰, 처리 중 보관 시간(ms)
+# 반환: {1} 선점 성공 / {0, state, fingerprint} 이미 존재
+IDEMPOTENCY_BEGIN_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+  local state = redis.call('HMGET', KEYS[1], 'state', 'fingerprint')
+  return {0, state[1] or '', state[2] or ''}
+end
+redis.call('HSET', KEYS[1], 'state', 'processing', 'fingerprint', ARGV[1], 'token', ARGV[2])
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+return {1}
+"""
+
+# KEYS[1]=멱등 키, ARGV[1]=처리 토큰 - 자신이 선점한 처리 중 표시만 삭제
+IDEMPOTENCY_ABANDON_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'token') == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for header_name, value in headers:
+        if header_name == name:
+            return value
+    return None
+
+
+async def _read_request_body(receive: Receive) -> Tuple[List[Message], Optional[bytes]]:
+    """
+    요청 본문을 최대 IDEMPOTENCY_MAX_REQUEST_BODY_BYTES까지 미리 읽음
+    (읽은 메시지, 본문) - 크기를 넘거나 연결이 끊겨 끝까지 읽지 못하면 본문은 None
+    """
+    messages: List[Message] = []
+    chunks: List[bytes] = []
+    size = 0
+    while True:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            return messages, None
+        chunk = message.get("body", b"")
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > IDEMPOTENCY_MAX_REQUEST_BODY_BYTES:
+            return messages, None
+        if not message.get("more_body", False):
+            return messages, b"".join(chunks)
+
+
+def _replaying_receive(messages: List[Message], receive: Receive) -> Receive:
+    """미리 읽은 메시지를 먼저 돌려주고 이후는 원래 receive로 읽음"""
+    pending = deque(messages)
+
+    async def replay() -> Message:
+        if pending:
+            return pending.popleft()
+        return await receive()
+
+    return replay
+
+
+def _is_storable(status: int) -> bool:
+    return status < 500 and status not in NON_STORABLE_STATUS_CODES
+
+
+def _error(status_code: int, detail: str, retry_after: Optional[int] = None) -> JSONResponse:
+    headers = {"retry-after": str(retry_after)} if retry_after else None
+    return JSONResponse(status_code=status_code, content={"detail": detail}, headers=headers)
+
+
+class IdempotencyStore:
+    """Redis에 멱등 키의 처리 상태와 완료된 응답을 저장"""
+
+    def __init__(self):
+        self._begin_script = None
+        self._abandon_script = None
+        # 같은 프로세스 안의 중복 요청은 Redis 폴링 대신 이벤트로 깨움
+        self._local: Dict[str, asyncio.Event] = {}
+        self.executed = 0
+        self.replayed = 0
+        self.waited = 0
+        self.mismatches = 0
+        self.timeouts = 0
+        self.not_stored = 0
+        self.skipped = 0
+        self.errors = 0
+
+    def _scripts(self):
+        if self._begin_script is None:
+            redis_client = get_binary_redis_client()
+            self._begin_script = redis_client.register_script(IDEMPOTENCY_BEGIN_SCRIPT)
+            self._abandon_script = redis_client.register_script(IDEMPOTENCY_ABANDON_SCRIPT)
+        return self._begin_script, self._abandon_script
+
+    @staticmethod
+    def key(user_id: str, idempotency_key: str) -> str:
+        return f"{IDEMPOTENCY_KEY_PREFIX}{user_id}:{idempotency_key}"
+
+    async def begin(self, key: str, fingerprint: str, token: str) -> Tuple[bool, str, str]:
+        """처리 선점 시도. (선점 여부, 기존 상태, 기존 요청 식별)"""
+        begin_script, _ = self._scripts()
+        result = await begin_script(keys=[key], args=[fingerprint, token, int(IDEMPOTENCY_LOCK_SECONDS * 1000)])
+        if int(result[0]) == 1:
+            self._local.setdefault(key, asyncio.Event())
+            return True, "", ""
+        state, stored_fingerprint = (value.decode() if isinstance(value, bytes) else value for value in result[1:3])
+        return False, state, stored_fingerprint
+
+    async def complete(self, key: str, status: int, headers: List[Tuple[bytes, bytes]], body: bytes):
+        """완료된 응답 저장 후 대기 중인 요청을 깨움"""
+        meta = {
+            "status": status,
+            "headers": [[name.decode("latin-1"), value.decode("latin-1")] for name, value in headers],
+        }
+        try:
+            redis_client = get_binary_redis_client()
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.hset(key, mapping={"state": "done", "meta": json.dumps(meta), "body": body})
+                pipe.hdel(key, "token")
+                pipe.expire(key, IDEMPOTENCY_TTL)
+                await pipe.execute()
+        except Exception as e:
+            # 저장하지 못하면 다음 중복 요청은 처리 중 표시가 만료된 뒤 다시 실행됨
+            self.errors += 1
+            logger.warning(f"⚠️ 멱등 응답 저장 실패: {str(e)}")
+        finally:
+            self._wake(key)
+
+    async def abandon(self, key: str, token: str):
+        """저장하지 않는 결과(실패/연결 종료)면 처리 중 표시를 지워 재시도가 다시 실행되도록 함"""
+        self.not_stored += 1
+        try:
+            _, abandon_script = self._scripts()
+            await abandon_script(keys=[key], args=[token])
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"⚠️ 멱등 처리 중 표시 삭제 실패: {str(e)}")
+        finally:
+            self._wake(key)
+
+    def _wake(self, key: str):
+        event = self._local.pop(key, None)
+        if event is not None:
+            event.set()
+
+    async def load(self, key: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """완료된 응답 조회 (처리 중이거나 없으면 None)"""
+        redis_client = get_binary_redis_client()
+        state, raw_meta, body = await redis_client.hmget(key, "state", "meta", "body")
+        if state != b"done" or raw_meta is None:
+            return None
+        return json.loads(raw_meta), body or b""
+
+    async def wait(self, key: str, deadline: float) -> Optional[str]:
+        """첫 요청의 처리가 끝날 때까지 대기. 'done' / 'gone'(실패로 삭제됨) / None(시간 초과)"""
+        redis_client = get_binary_redis_client()
+        while time.monotonic() < deadline:
+            event = self._local.get(key)
+            timeout = min(IDEMPOTENCY_POLL_INTERVAL, max(deadline - time.monotonic(), 0))
+            if event is not None:
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(timeout)
+            state = await redis_client.hget(key, "state")
+            if state is None:
+                return "gone"
+            if state == b"done":
+                return "done"
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": IDEMPOTENCY_ENABLED,
+            "ttl_seconds": IDEMPOTENCY_TTL,
+            "in_flight_local": len(self._local),
+            "executed": self.executed,
+            "replayed": self.replayed,
+            "waited": self.waited,
+            "mismatches": self.mismatches,
+            "timeouts": self.timeouts,
+            "not_stored": self.not_stored,
+            "skipped_large_body": self.skipped,
+            "errors": self.errors,
+        }
+
+
+def _replayed_response(meta: Dict[str, Any], body: bytes) -> Response:
+    response = Response(content=body, status_code=meta["status"])
+    response.raw_headers.extend(
+        (name.encode("latin-1"), value.encode("latin-1")) for name, value in meta["headers"]
+    )
+    response.raw_headers.append((b"idempotent-replayed", b"true"))
+    return response
+
+
+class IdempotencyMiddleware:
+    """
+    Idempotency-Key 헤더가 있는 POST/PATCH 요청의 중복 실행을 막는 ASGI 미들웨어
+    AuthMiddleware 안쪽, RateLimitMiddleware 바깥쪽에 배치한다
+    (인증된 x-user-id를 사용하고, 재생된 응답은 속도 제한 토큰을 소비하지 않도록).
+    """
+
+    def __init__(self, app: ASGIApp, store: Optional[IdempotencyStore] = None):
+        self.app = app
+        self.store = store or get_idempotency_store()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not IDEMPOTENCY_ENABLED or scope["method"] not in IDEMPOTENCY_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = scope["headers"]
+        raw_key = _header(headers, b"idempotency-key")
+        user_id = _header(headers, b"x-user-id")
+        if raw_key is None or user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        idempotency_key = raw_key.decode("latin-1").strip()
+        if not idempotency_key or len(idempotency_key) > IDEMPOTENCY_MAX_KEY_LENGTH:
+            await _error(400, f"Idempotency-Key는 1~{IDEMPOTENCY_MAX_KEY_LENGTH}자여야 합니다.")(scope, receive, send)
+            return
+
+        messages, body = await _read_request_body(receive)
+        receive = _replaying_receive(messages, receive)
+        if body is None:
+            self.store.skipped += 1
+            await self.app(scope, receive, send)
+            return
+
+        key = self.store.key(user_id.decode("latin-1"), idempotency_key)
+        query = scope.get("query_string", b"").decode("latin-1")
+        fingerprint = f"{scope['method']} {scope['path']}?{query} {hashlib.sha256(body).hexdigest()}"
+        token = uuid.uuid4().hex
+        wait_deadline = time.monotonic() + IDEMPOTENCY_WAIT_SECONDS
+
+        while True:
+            try:
+                acquired, state, stored_fingerprint = await self.store.begin(key, fingerprint, token)
+            except Exception as e:
+                self.store.errors += 1
+                logger.warning(f"⚠️ 멱등 키 확인 실패, 중복 제거 없이 통과: {str(e)}")
+                await self.app(scope, receive, send)
+                return
+
+            if acquired:
+                await self._execute(key, token, scope, receive, send)
+                return
+
+            if stored_fingerprint != fingerprint:
+                self.store.mismatches += 1
+                await _error(422, "Idempotency-Key가 다른 요청에 이미 사용되었습니다.")(scope, receive, send)
+                return
+
+            try:
+                if state != "done":
+                    self.store.waited += 1
+                    outcome = await self.store.wait(key, wait_deadline)
+                    if outcome is None:
+                        self.store.timeouts += 1
+                        await _error(409, "같은 Idempotency-Key의 요청이 아직 처리 중입니다.", retry_after=5)(scope, receive, send)
+                        return
+                    if outcome == "gone":
+                        # 첫 요청이 저장하지 않는 결과로 끝남 - 이 요청이 다시 선점해 실행
+                        continue
+                stored = await self.store.load(key)
+            except Exception as e:
+                self.store.errors += 1
+                logger.warning(f"⚠️ 멱등 응답 조회 실패, 중복 제거 없이 통과: {str(e)}")
+                await self.app(scope, receive, send)
+                return
+
+            if stored is None:
+                # 조회 사이에 만료됨
+                continue
+            self.store.replayed += 1
+            meta, body = stored
+            logger.info(f"🔁 멱등 응답 재생: {scope['method']} {scope['path']}, status={meta['status']}")
+            await _replayed_response(meta, body)(scope, receive, send)
+            return
+
+    async def _execute(self, key: str, token: str, scope: Scope, receive: Receive, send: Send):
+        """요청을 실행하면서 응답을 복사해 두었다가, 저장 가능한 결과면 저장"""
+        self.store.executed += 1
+        status = 0
+        stored_headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+        size = 0
+        storable = True
+        completed = False
+
+        async def send_wrapper(message: Message):
+            nonlocal status, stored_headers, size, storable, completed
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                storable = _is_storable(status)
+                stored_headers = [
+                    (name, value) for name, value in message.get("headers", [])
+                    if name.lower() not in EXCLUDED_STORED_HEADERS
+                ]
+            elif message["type"] == "http.response.body" and storable:
+                body = message.get("body", b"")
+                size += len(body)
+                if size > IDEMPOTENCY_MAX_BODY_BYTES:
+                    storable = False
+                    chunks.clear()
+                else:
+                    chunks.append(body)
+                if not message.get("more_body", False):
+                    completed = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if storable and completed:
+                await self.store.complete(key, status, stored_headers, b"".join(chunks))
+            else:
+                await self.store.abandon(key, token)
+
+
+_idempotency_store = IdempotencyStore()
+
+# 어디서든 이 함수를 호출하여 프로세스 공용 멱등 키 저장소를 가져올 수 있음
+def get_idempotency_store() -> IdempotencyStore:
+    return _idempotency_store
@@ -2,19 +2,25 @@
 JWT 인증 미들웨어
 Gateway에서 모든 요청에 대해 JWT 토큰을 검증하는 미들웨어
 Redis 블랙리스트 확인 기능 포함
+
+BaseHTTPMiddleware 대신 순수 ASGI 미들웨어로 구현하여
+요청/응답 본문을 별도 태스크와 큐로 감싸는 오버헤드를 제거한다.
 """
 import os
+import json
+import time
+import random
 import logging
-from typing import Union
+from typing import Iterable, Optional
 from pydantic import BaseModel
 from jose import jwt, JWTError
-from starlette.requests import Request
+from starlette.requests import cookie_parser
 from starlette.responses import JSONResponse as StarletteJSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp, Receive, Scope, Send
-from starlette.datastructures import MutableHeaders
 from dotenv import load_dotenv
-from app.foundation.redis_client import get_redis_client
+from app.foundation.jwt_cache import get_jwt_cache
+from app.foundation.token_revocation_cache import get_revocation_cache
+from app.foundation.metrics import record_timing
 
 # 환경 변수 로드
 load_dotenv()
@@ -26,136 +32,175 @@ logger = logging.getLogger("gateway-api")
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 
+# 로그 샘플링 비율 (0.0 ~ 1.0)
+# 통과 요청은 낮은 비율로, 거부 요청은 기본적으로 모두 기록
+AUTH_LOG_SAMPLE_RATE = float(os.getenv("AUTH_LOG_SAMPLE_RATE", "0.01"))
+AUTH_REJECT_LOG_SAMPLE_RATE = float(os.getenv("AUTH_REJECT_LOG_SAMPLE_RATE", "1.0"))
+
+# 인증이 필요 없는 경로들
+DEFAULT_EXEMPT_PATHS = (
+    "/docs", "/redoc", "/openapi.json",
+    "/auth/google/login", "/auth/google/callback", "/auth/me",
+    "/", "/api/health", "/api/health/",
+    # Prometheus 메트릭 (GATEWAY_METRICS_TOKEN으로 별도 보호)
+    "/metrics",
+    # disclosure-data 관련 공개 API들
+    "/api/disclosure/disclosure-data/concepts",
+    "/api/disclosure/disclosure-data/adoption-status",
+    "/api/disclosure/disclosure-data/disclosures",
+    "/api/disclosure/disclosure-data/requirements",
+    "/api/disclosure/disclosure-data/terms",
+    "/api/disclosure/health", "/api/disclosure/health/",
+)
+
+# 경로 패턴 매칭을 위한 접두사들
+DEFAULT_EXEMPT_PREFIXES = (
+    "/api/disclosure/disclosure-data/",
+    # 게이트웨이 관리 API (X-Admin-Token으로 별도 보호)
+    "/admin/",
+)
+
+USER_ID_HEADER = b"x-user-id"
+
 # JWT 검증을 위한 Pydantic 모델 정의
 class JWTAuthToken(BaseModel):
     user_id: str  # user_id가 UUID라면 str
     exp: int  # expiration time
     # 여기에 필요한 다른 JWT 클레임 추가
 
-# JWT 인증 미들웨어 클래스
-class AuthMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
-        # 인증이 필요 없는 경로들
-        self.exempt_paths = {
-            "/docs", "/redoc", "/openapi.json", 
-            "/auth/google/login", "/auth/google/callback", "/auth/me",
-            "/", "/api/health", "/api/health/",
-            # disclosure-data 관련 공개 API들
-            "/api/disclosure/disclosure-data/concepts",
-            "/api/disclosure/disclosure-data/adoption-status",
-            "/api/disclosure/disclosure-data/disclosures",
-            "/api/disclosure/disclosure-data/requirements", 
-            "/api/disclosure/disclosure-data/terms",
-            "/api/disclosure/health", "/api/disclosure/health/"
-        }
-        
-        # 경로 패턴 매칭을 위한 접두사들 (선택사항)
-        self.exempt_prefixes = [
-            "/api/disclosure/disclosure-data/"
-        ]
-    
+
+def _log_sampled(level: int, event: str, sample_rate: float, **fields):
+    """샘플링된 구조화 로그 (한 줄 JSON)"""
+    if sample_rate <= 0 or (sample_rate < 1 and random.random() >= sample_rate):
+        return
+    if not logger.isEnabledFor(level):
+        return
+    logger.log(level, json.dumps({"event": event, "sample_rate": sample_rate, **fields}, ensure_ascii=False))
+
+
+# JWT 인증 미들웨어 클래스 (순수 ASGI)
+class AuthMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        exempt_paths: Optional[Iterable[str]] = None,
+        exempt_prefixes: Optional[Iterable[str]] = None,
+    ):
+        self.app = app
+        # 정확한 경로 매칭은 frozenset, 접두사 매칭은 str.startswith(tuple)로 미리 구성
+        self.exempt_paths = frozenset(exempt_paths if exempt_paths is not None else DEFAULT_EXEMPT_PATHS)
+        self.exempt_prefixes = tuple(exempt_prefixes if exempt_prefixes is not None else DEFAULT_EXEMPT_PREFIXES)
+
     def _is_exempt_path(self, path: str) -> bool:
         """경로가 인증 면제 대상인지 확인"""
-        # 정확한 경로 매칭
-        if path in self.exempt_paths:
-            return True
-        
-        # 접두사 매칭
-        for prefix in self.exempt_prefixes:
-            if path.startswith(prefix):
-                return True
-                
-        return False
-    
-    async def dispatch(self, request: Request, call_next):
-        # CORS Preflight OPTIONS 요청은 인증 검사를 건너뛰고 즉시 통과
-        if request.method == "OPTIONS":
-            return await call_next(request)
-        
-        # 디버깅을 위한 출력 (print로 변경)
-        print(f"🔍 Request path: {request.url.path}")
-        print(f"📋 Exempt paths: {self.exempt_paths}")
-        print(f"📂 Exempt prefixes: {self.exempt_prefixes}")
-        
-        # 디버깅: 특정 경로 확인
-        if request.url.path == "/api/health/":
-            print(f"🔍 Special check for /api/health/: {'/api/health/' in self.exempt_paths}")
-        
-        # 미인증 경로 제외
-        if self._is_exempt_path(request.url.path):
-            print(f"✅ Exempt path: {request.url.path}")
-            return await call_next(request)
-        else:
-            print(f"🔒 Authentication required for: {request.url.path}")
-        
-        # 토큰 추출 로직 (Authorization 헤더 우선, 쿠키 보조)
-        token: str | None = None
-        
+        return path in self.exempt_paths or (bool(self.exempt_prefixes) and path.startswith(self.exempt_prefixes))
+
+    @staticmethod
+    def _extract_token(headers) -> Optional[str]:
+        """토큰 추출 (Authorization 헤더 우선, access_token 쿠키 보조)"""
+        authorization = None
+        cookie = None
+        for name, value in headers:
+            if name == b"authorization":
+                authorization = value
+            elif name == b"cookie":
+                cookie = value
+
         # 1. 먼저 Authorization 헤더 확인
-        authorization: str | None = request.headers.get("Authorization")
         if authorization:
-            try:
-                scheme, token_from_header = authorization.split()
-                if scheme.lower() == "bearer":
-                    token = token_from_header
-                    print(f"✅ Token extracted from Authorization header")
-            except ValueError:
-                # 헤더 형식이 잘못된 경우, 무시하고 쿠키 확인으로 넘어감
-                print(f"⚠️ Invalid Authorization header format, checking cookie...")
-                pass
-        
+            parts = authorization.decode("latin-1").split()
+            if len(parts) == 2 and parts[0].lower() == "bearer":
+                return parts[1]
+            # 헤더 형식이 잘못된 경우, 무시하고 쿠키 확인으로 넘어감
+
         # 2. 헤더에 유효한 토큰이 없으면, 쿠키 확인
+        if cookie:
+            return cookie_parser(cookie.decode("latin-1")).get("access_token") or None
+        return None
+
+    @staticmethod
+    def _with_user_id(scope: Scope, user_id: Optional[str]) -> Scope:
+        """
+        scope 헤더를 재작성하여 x-user-id 주입
+        클라이언트가 직접 보낸 x-user-id는 항상 제거한다 (사용자 위장 방지).
+        """
+        if user_id is None and not any(name == USER_ID_HEADER for name, _ in scope["headers"]):
+            return scope
+        headers = [(name, value) for name, value in scope["headers"] if name != USER_ID_HEADER]
+        if user_id is not None:
+            headers.append((USER_ID_HEADER, str(user_id).encode("utf-8")))
+        scope = dict(scope)
+        scope["headers"] = headers
+        return scope
+
+    @staticmethod
+    async def _reject(scope: Scope, receive: Receive, send: Send, status_code: int, detail: str):
+        """인증 실패 응답 (WebSocket은 핸드셰이크 전에 닫아 클라이언트가 403을 받도록 함)"""
+        if scope["type"] == "websocket":
+            await send({"type": "websocket.close", "code": 1008, "reason": detail})
+            return
+        response = StarletteJSONResponse(status_code=status_code, content={"detail": detail})
+        await response(scope, receive, send)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        # HTTP/WebSocket 외(lifespan)와 CORS Preflight OPTIONS 요청은 인증 검사를 건너뛰고 즉시 통과
+        if scope["type"] not in ("http", "websocket") or scope.get("method") == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+
+        # 미인증 경로 제외
+        if self._is_exempt_path(path):
+            _log_sampled(logging.DEBUG, "auth.exempt", AUTH_LOG_SAMPLE_RATE, path=path)
+            await self.app(self._with_user_id(scope, None), receive, send)
+            return
+
+        auth_started = time.perf_counter()
+        token = self._extract_token(scope["headers"])
+
+        # 최종적으로 토큰이 없는 경우에만 401 에러 반환
         if not token:
-            token = request.cookies.get("access_token")
-            if token:
-                print(f"✅ Token extracted from access_token cookie")
-        
-        # 3. 최종적으로 토큰이 없는 경우에만 401 에러 반환
-        if not token:
-            print("❌ Authorization 헤더와 access_token 쿠키 모두에서 토큰을 찾을 수 없습니다.")
-            return StarletteJSONResponse(
-                status_code=401,
-                content={"detail": "인증 정보가 없습니다."}
-            )
-        
-        try:
-            # JWT 검증
-            decoded_token = jwt.decode(
-                token,
-                JWT_SECRET_KEY,
-                algorithms=[JWT_ALGORITHM]
-            )
-            
-            # 블랙리스트 확인
-            jti = decoded_token.get("jti")
-            if jti:
-                redis_client = get_redis_client()
-                if await redis_client.exists(f"blacklist:{jti}"):
-                    logger.warning(f"블랙리스트 토큰 사용 시도: jti={jti}")
-                    return StarletteJSONResponse(
-                        status_code=401,
-                        content={"detail": "무효화된 토큰입니다. 다시 로그인해주세요."}
-                    )
-            
-            # 사용자 ID 추출
-            user_id = decoded_token.get("user_id")
-            
-            # request.scope['headers']는 (b'key', b'value') 튜플의 리스트임
-            # 기존 헤더 리스트에 새로운 헤더 튜플을 추가
-            request.scope['headers'].append(
-                (b'x-user-id', str(user_id).encode('utf-8'))
-            )
-            
-        except JWTError as e:
-            logger.warning(f"JWT validation failed: {str(e)}")
-            return StarletteJSONResponse(
-                status_code=403,
-                content={"detail": "유효하지 않거나 만료된 토큰입니다."}
-            )
-        
+            _log_sampled(logging.WARNING, "auth.missing_token", AUTH_REJECT_LOG_SAMPLE_RATE, path=path)
+            record_timing("auth", time.perf_counter() - auth_started)
+            await self._reject(scope, receive, send, 401, "인증 정보가 없습니다.")
+            return
+
+        # 검증된 토큰 캐시 확인 (적중 시 서명 검증과 클레임 파싱 생략)
+        jwt_cache = get_jwt_cache()
+        decoded_token = jwt_cache.get(token)
+        if decoded_token is None:
+            try:
+                # JWT 검증
+                decoded_token = jwt.decode(
+                    token,
+                    JWT_SECRET_KEY,
+                    algorithms=[JWT_ALGORITHM]
+                )
+            except JWTError as e:
+                _log_sampled(logging.WARNING, "auth.invalid_token", AUTH_REJECT_LOG_SAMPLE_RATE, path=path, error=str(e))
+                record_timing("auth", time.perf_counter() - auth_started)
+                await self._reject(scope, receive, send, 403, "유효하지 않거나 만료된 토큰입니다.")
+                return
+            jwt_cache.put(token, decoded_token)
+
+        # 블랙리스트 확인 (구독 중이면 로컬 캐시, 아니면 Redis 직접 확인)
+        jti = decoded_token.get("jti")
+        if jti:
+            if await get_revocation_cache().is_revoked(jti):
+                _log_sampled(logging.WARNING, "auth.blacklisted_token", AUTH_REJECT_LOG_SAMPLE_RATE, path=path, jti=jti)
+                record_timing("auth", time.perf_counter() - auth_started)
+                await self._reject(scope, receive, send, 401, "무효화된 토큰입니다. 다시 로그인해주세요.")
+                return
+
+        # 사용자 ID 추출
+        user_id = decoded_token.get("user_id")
+        _log_sampled(logging.INFO, "auth.ok", AUTH_LOG_SAMPLE_RATE, path=path, user_id=str(user_id))
+
+        record_timing("auth", time.perf_counter() - auth_started)
+
         # 다음 미들웨어/라우터로 요청 전달
-        return await call_next(request)
+        await self.app(self._with_user_id(scope, user_id), receive, send)
 
 # 외부로 노출할 요소들
-__all__ = ["AuthMiddleware", "JWTAuthToken"] 
\ No newline at end of file
+__all__ = ["AuthMiddleware", "JWTAuthToken"]
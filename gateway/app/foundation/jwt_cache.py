@@ -0,0 +1,106 @@
+"""
+검증된 JWT 캐시
+같은 access_token이 세션 동안 반복 전송되므로, 서명 검증을 통과한 토큰의 클레임을
+프로세스 메모리에 LRU로 보관하여 재검증(jwt.decode)을 건너뛴다.
+항목은 토큰의 exp가 지나면 제거된다.
+"""
+import os
+import time
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 캐시 최대 항목 수
+JWT_CACHE_MAX_SIZE = int(os.getenv("JWT_CACHE_MAX_SIZE", "10000"))
+# exp와 무관한 최대 보관 시간(초) - exp 클레임이 없는 토큰 대비
+JWT_CACHE_MAX_TTL = float(os.getenv("JWT_CACHE_MAX_TTL", "300"))
+
+# 캐시에 보관하는 클레임
+CACHED_CLAIMS = ("user_id", "jti", "exp")
+
+
+class VerifiedTokenCache:
+    """토큰 해시 → (만료 시각, 클레임) LRU 캐시"""
+
+    def __init__(self, max_size: int = JWT_CACHE_MAX_SIZE, max_ttl: float = JWT_CACHE_MAX_TTL):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        """원본 토큰 대신 해시를 키로 사용 (메모리에 토큰을 남기지 않음)"""
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """유효한 캐시 항목이 있으면 클레임 반환, 없거나 만료되었으면 None"""
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, claims = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return claims
+
+    def put(self, token: str, decoded_token: Dict[str, Any]):
+        """검증을 통과한 토큰의 클레임 저장"""
+        if self.max_size <= 0:
+            return
+
+        now = time.time()
+        expires_at = now + self.max_ttl
+        exp = decoded_token.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= now:
+            return
+
+        key = self._key(token)
+        self._entries[key] = (expires_at, {claim: decoded_token.get(claim) for claim in CACHED_CLAIMS})
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, token: str):
+        """특정 토큰 항목 제거"""
+        self._entries.pop(self._key(token), None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """크기 및 적중률 카운터"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+_jwt_cache = VerifiedTokenCache()
+
+# 어디서든 이 함수를 호출하여 프로세스 공용 JWT 캐시를 가져올 수 있음
+def get_jwt_cache() -> VerifiedTokenCache:
+    return _jwt_cache
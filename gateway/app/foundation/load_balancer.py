@@ -0,0 +1,164 @@
+"""
+업스트림 레플리카 로드 밸런서 (ServiceType별)
+SERVICE_ENDPOINTS에 엔드포인트가 여러 개인 서비스에서 요청마다 보낼 레플리카를 고른다.
+
+- 선택 전략 (LB_STRATEGY)
+  - ewma: 임의의 두 후보 중 (EWMA 지연 × (진행 중 요청 + 1)) 비용이 낮은 쪽 (power of two choices)
+  - least_in_flight: 임의의 두 후보 중 진행 중 요청이 적은 쪽 (같으면 EWMA가 낮은 쪽)
+- 수동 헬스 체크: 연속 실패가 LB_EJECT_AFTER_FAILURES 이상이면 일정 시간 제외하고,
+  시간이 지나면 다시 후보에 넣는다 (다시 실패하면 제외 시간을 두 배로 늘림).
+- 고정 라우팅: LB_STICKY_SERVICES의 서비스는 x-user-id 기준 rendezvous 해싱으로 같은 레플리카를 사용
+  (해당 레플리카가 제외되면 다음 순위 레플리카로 이동)
+
+진행 중 요청 수는 응답 헤더를 받을 때까지 센다. 보고서 생성/챗봇처럼 오래 걸리는 요청은
+생성이 끝나야 헤더가 오므로 대부분의 처리 시간이 포함된다.
+"""
+import os
+import time
+import random
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from app.domain.model.service_type import ServiceType, SERVICE_ENDPOINTS
+
+load_dotenv()
+
+logger = logging.getLogger("gateway-api")
+
+LB_STRATEGY = os.getenv("LB_STRATEGY", "ewma").lower()
+LB_EWMA_ALPHA = float(os.getenv("LB_EWMA_ALPHA", "0.3"))
+LB_EJECT_AFTER_FAILURES = int(os.getenv("LB_EJECT_AFTER_FAILURES", "3"))
+LB_EJECT_SECONDS = float(os.getenv("LB_EJECT_SECONDS", "30"))
+LB_EJECT_MAX_SECONDS = float(os.getenv("LB_EJECT_MAX_SECONDS", "300"))
+# 쉼표 구분 ServiceType 값
+LB_STICKY_SERVICES = {
+    value.strip() for value in os.getenv("LB_STICKY_SERVICES", "chatbot").split(",") if value.strip()
+}
+
+
+class Endpoint:
+    """업스트림 레플리카 하나의 상태"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.in_flight = 0
+        self.ewma = 0.0  # 초, 0이면 아직 측정 전 (새 레플리카가 먼저 선택됨)
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.eject_seconds = LB_EJECT_SECONDS
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+
+    def is_available(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+    def cost(self) -> float:
+        return self.ewma * (self.in_flight + 1)
+
+
+class UpstreamBalancer:
+    """ServiceType 하나의 엔드포인트 선택 및 상태 기록"""
+
+    def __init__(self, service_type: ServiceType, urls: List[str], strategy: str = LB_STRATEGY):
+        self.service_type = service_type
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.strategy = strategy
+        self.sticky = service_type.value in LB_STICKY_SERVICES
+
+    def _candidates(self) -> List[Endpoint]:
+        now = time.monotonic()
+        available = [endpoint for endpoint in self.endpoints if endpoint.is_available(now)]
+        if available:
+            return available
+        # 모두 제외된 경우 가장 먼저 복귀할 레플리카로 시도 (전체 차단보다 낫다)
+        return [min(self.endpoints, key=lambda endpoint: endpoint.ejected_until)]
+
+    @staticmethod
+    def _rendezvous(candidates: List[Endpoint], affinity_key: str) -> Endpoint:
+        return max(
+            candidates,
+            key=lambda endpoint: hashlib.blake2b(f"{affinity_key}|{endpoint.url}".encode(), digest_size=8).digest(),
+        )
+
+    def pick(self, affinity_key: Optional[str] = None) -> Endpoint:
+        """요청을 보낼 엔드포인트 선택"""
+        if len(self.endpoints) == 1:
+            return self.endpoints[0]
+
+        candidates = self._candidates()
+        if len(candidates) == 1:
+            return candidates[0]
+        if self.sticky and affinity_key:
+            return self._rendezvous(candidates, affinity_key)
+
+        first, second = random.sample(candidates, 2)
+        if self.strategy == "least_in_flight":
+            return min((first, second), key=lambda endpoint: (endpoint.in_flight, endpoint.ewma))
+        return min((first, second), key=lambda endpoint: endpoint.cost())
+
+    def start(self, endpoint: Endpoint):
+        endpoint.in_flight += 1
+        endpoint.requests += 1
+
+    def finish(self, endpoint: Endpoint, latency: float, failed: bool):
+        """요청 결과 기록 (실패 누적 시 제외, 성공 시 복귀 상태 초기화)"""
+        endpoint.in_flight = max(endpoint.in_flight - 1, 0)
+        if failed:
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            if endpoint.consecutive_failures >= LB_EJECT_AFTER_FAILURES and len(self.endpoints) > 1:
+                self._eject(endpoint)
+            return
+
+        endpoint.ewma = latency if endpoint.ewma == 0.0 else endpoint.ewma + LB_EWMA_ALPHA * (latency - endpoint.ewma)
+        endpoint.consecutive_failures = 0
+        endpoint.eject_seconds = LB_EJECT_SECONDS
+
+    def release(self, endpoint: Endpoint):
+        """결과 없이 끝난 요청(헤지 취소 등)의 진행 중 카운트만 반환"""
+        endpoint.in_flight = max(endpoint.in_flight - 1, 0)
+
+    def _eject(self, endpoint: Endpoint):
+        endpoint.ejected_until = time.monotonic() + endpoint.eject_seconds
+        endpoint.ejections += 1
+        logger.warning(
+            f"⚠️ 업스트림 레플리카 제외: service={self.service_type.value}, url={endpoint.url}, "
+            f"seconds={endpoint.eject_seconds:.0f}"
+        )
+        endpoint.eject_seconds = min(endpoint.eject_seconds * 2, LB_EJECT_MAX_SECONDS)
+        # 복귀 후 한 번만 더 실패해도 다시 제외되도록
+        endpoint.consecutive_failures = LB_EJECT_AFTER_FAILURES - 1
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "strategy": self.strategy,
+            "sticky": self.sticky,
+            "endpoints": [
+                {
+                    "url": endpoint.url,
+                    "available": endpoint.is_available(now),
+                    "in_flight": endpoint.in_flight,
+                    "ewma_ms": round(endpoint.ewma * 1000, 1),
+                    "requests": endpoint.requests,
+                    "failures": endpoint.failures,
+                    "ejections": endpoint.ejections,
+                    "ejected_for_seconds": round(max(endpoint.ejected_until - now, 0.0), 1),
+                }
+                for endpoint in self.endpoints
+            ],
+        }
+
+
+_balancers: Dict[ServiceType, UpstreamBalancer] = {}
+
+# 어디서든 이 함수를 호출하여 서비스별 로드 밸런서를 가져올 수 있음
+def get_load_balancer(service_type: ServiceType) -> UpstreamBalancer:
+    balancer = _balancers.get(service_type)
+    if balancer is None:
+        balancer = _balancers[service_type] = UpstreamBalancer(service_type, SERVICE_ENDPOINTS.get(service_type, []))
+    return balancer
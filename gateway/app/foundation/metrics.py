@@ -0,0 +1,297 @@
+"""
+게이트웨이 메트릭
+외부 의존성 없이 Prometheus 텍스트 형식(/metrics)으로 내보내는 최소 구현.
+
+- ServiceType/경로 템플릿별 요청 수, 상태 코드 클래스, 전체/업스트림 지연 히스토그램
+- 서비스별 진행 중 요청 게이지, 전달 바이트 수
+- 수집 시점에 업스트림 커넥션 풀, JWT/블랙리스트/응답 캐시, 서킷 브레이커, 동시 요청 한도/대기열 상태를 함께 내보냄
+- 응답에 Server-Timing 헤더(auth/upstream/serialization) 추가
+
+요청 단위 구간 시간은 contextvars로 전달하므로 미들웨어와 ServiceProxyFactory가 서로를 알 필요가 없다.
+"""
+import os
+import re
+import time
+import logging
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.domain.model.service_type import ServiceType
+from app.foundation.http_client_pool import UpstreamClientPool, UPSTREAM_MAX_CONNECTIONS
+from app.foundation.jwt_cache import get_jwt_cache
+from app.foundation.token_revocation_cache import get_revocation_cache
+from app.foundation.response_cache import get_response_cache
+from app.foundation.request_coalescer import get_request_coalescer
+from app.foundation.resilience import CircuitBreaker, get_upstream_guard
+from app.foundation.adaptive_concurrency import get_all_concurrency_stats
+
+load_dotenv()
+
+logger = logging.getLogger("gateway-api")
+
+# 서로 다른 경로 템플릿 라벨의 최대 개수 (초과 시 "other"로 집계하여 카디널리티 제한)
+METRICS_MAX_ROUTES = int(os.getenv("METRICS_MAX_ROUTES", "500"))
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+SERVICE_NAMES = frozenset(service_type.value for service_type in ServiceType)
+
+# 숫자, UUID, 긴 16진수/토큰 형태의 경로 세그먼트는 {id}로 치환
+_ID_SEGMENT = re.compile(
+    r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|[0-9a-fA-F]{16,}|[A-Za-z0-9_-]{32,})$"
+)
+
+# 요청 단위 구간 시간 (auth, upstream 등 초 단위 누적)
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("gateway_request_timings", default=None)
+
+
+def record_timing(name: str, seconds: float):
+    """현재 요청의 구간 시간 누적 (MetricsMiddleware 밖에서 호출되면 무시)"""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, labels: Tuple[str, ...], amount: float = 1.0):
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    def dec(self, labels: Tuple[str, ...], amount: float = 1.0):
+        self.inc(labels, -amount)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(buckets)
+        # 라벨 → [버킷별 개수..., +Inf 개수], 합계
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float):
+        entry = self._values.get(labels)
+        if entry is None:
+            entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = entry
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                bucket_labels = _format_labels(self.label_names, labels, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            cumulative += counts[-1]
+            bucket_labels = _format_labels(self.label_names, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {total[0]}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+REQUESTS_TOTAL = Counter(
+    "gateway_requests_total", "게이트웨이 요청 수", ("service", "route", "method", "status_class")
+)
+REQUEST_DURATION = Histogram(
+    "gateway_request_duration_seconds", "게이트웨이 전체 처리 시간(응답 본문 전송 완료까지)", ("service", "route")
+)
+UPSTREAM_DURATION = Histogram(
+    "gateway_upstream_duration_seconds", "업스트림 응답 헤더 수신까지 걸린 시간", ("service", "route")
+)
+IN_FLIGHT = Gauge("gateway_requests_in_flight", "처리 중인 요청 수", ("service",))
+PROXIED_BYTES = Counter("gateway_proxied_bytes_total", "전달한 본문 바이트 수", ("service", "direction"))
+
+
+class _RouteLabels:
+    """경로 → (서비스, 경로 템플릿) 라벨 변환 (카디널리티 제한)"""
+
+    def __init__(self, max_routes: int = METRICS_MAX_ROUTES):
+        self.max_routes = max_routes
+        self._seen: set = set()
+
+    def __call__(self, path: str) -> Tuple[str, str]:
+        segments = [segment for segment in path.split("/") if segment]
+        if len(segments) >= 2 and segments[0] == "api" and segments[1] in SERVICE_NAMES:
+            service = segments[1]
+        elif segments and segments[0] == "auth":
+            service = ServiceType.AUTH.value
+        else:
+            service = "gateway"
+
+        route = "/" + "/".join("{id}" if _ID_SEGMENT.match(segment) else segment for segment in segments)
+        if route not in self._seen:
+            if len(self._seen) >= self.max_routes:
+                return service, "other"
+            self._seen.add(route)
+        return service, route
+
+
+route_labels = _RouteLabels()
+
+
+def _server_timing(timings: Dict[str, float], elapsed: float) -> bytes:
+    auth = timings.get("auth", 0.0)
+    upstream = timings.get("upstream", 0.0)
+    serialization = max(elapsed - auth - upstream, 0.0)
+    parts = [f"auth;dur={auth * 1000:.1f}"]
+    if "upstream" in timings:
+        parts.append(f"upstream;dur={upstream * 1000:.1f}")
+    parts.append(f"serialization;dur={serialization * 1000:.1f}")
+    return ", ".join(parts).encode("latin-1")
+
+
+class MetricsMiddleware:
+    """
+    요청 수/지연/바이트 수를 기록하는 ASGI 미들웨어
+    가장 바깥쪽에 배치해야 인증 시간까지 포함한 전체 시간을 잴 수 있다.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        service, route = route_labels(scope["path"])
+        method = scope["method"]
+        timings: Dict[str, float] = {}
+        token = _request_timings.set(timings)
+        started = time.perf_counter()
+        status_code = 500
+        bytes_in = 0
+        bytes_out = 0
+
+        async def receive_wrapper() -> Message:
+            nonlocal bytes_in
+            message = await receive()
+            if message["type"] == "http.request":
+                bytes_in += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code, bytes_out
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if SERVER_TIMING_ENABLED:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", _server_timing(timings, time.perf_counter() - started)))
+                    message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                bytes_out += len(message.get("body", b""))
+            await send(message)
+
+        IN_FLIGHT.inc((service,))
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            IN_FLIGHT.dec((service,))
+            _request_timings.reset(token)
+            REQUESTS_TOTAL.inc((service, route, method, f"{status_code // 100}xx"))
+            REQUEST_DURATION.observe((service, route), time.perf_counter() - started)
+            if "upstream" in timings:
+                UPSTREAM_DURATION.observe((service, route), timings["upstream"])
+            if bytes_in:
+                PROXIED_BYTES.inc((service, "request"), bytes_in)
+            if bytes_out:
+                PROXIED_BYTES.inc((service, "response"), bytes_out)
+
+
+def _pool_lines() -> List[str]:
+    """업스트림 커넥션 풀 사용률 (httpx/httpcore 내부 상태 기반, 실패 시 생략)"""
+    lines = [
+        "# HELP gateway_upstream_pool_connections 업스트림 커넥션 풀의 커넥션 수",
+        "# TYPE gateway_upstream_pool_connections gauge",
+    ]
+    for service_type, client in list(UpstreamClientPool._clients.items()):
+        try:
+            connections = client._transport._pool.connections
+        except AttributeError:
+            continue
+        idle = sum(1 for connection in connections if connection.is_idle())
+        lines.append(f'gateway_upstream_pool_connections{{service="{service_type.value}",state="active"}} {len(connections) - idle}')
+        lines.append(f'gateway_upstream_pool_connections{{service="{service_type.value}",state="idle"}} {idle}')
+        lines.append(f'gateway_upstream_pool_connections{{service="{service_type.value}",state="max"}} {UPSTREAM_MAX_CONNECTIONS}')
+    return lines
+
+
+def _stats_lines(component: str, stats: Dict[str, Any], labels: str = "") -> List[str]:
+    """컴포넌트 stats() 딕셔너리의 숫자 값을 gateway_{component}_{key} 게이지로 변환"""
+    lines = []
+    for key, value in stats.items():
+        if isinstance(value, bool):
+            value = int(value)
+        if isinstance(value, (int, float)):
+            lines.append(f"gateway_{component}_{key}{labels} {value}")
+    return lines
+
+
+def render_metrics() -> str:
+    """Prometheus 텍스트 형식으로 모든 메트릭 렌더링"""
+    lines: List[str] = []
+    for metric in (REQUESTS_TOTAL, REQUEST_DURATION, UPSTREAM_DURATION, IN_FLIGHT, PROXIED_BYTES):
+        lines.extend(metric.render())
+
+    try:
+        lines.extend(_pool_lines())
+    except Exception as e:
+        logger.debug(f"커넥션 풀 메트릭 수집 실패: {str(e)}")
+
+    lines.extend(_stats_lines("jwt_cache", get_jwt_cache().stats()))
+    lines.extend(_stats_lines("blacklist_cache", get_revocation_cache().stats()))
+    lines.extend(_stats_lines("response_cache", get_response_cache().stats()))
+    lines.extend(_stats_lines("coalescing", get_request_coalescer().stats()))
+
+    circuit_states = {CircuitBreaker.CLOSED: 0, CircuitBreaker.HALF_OPEN: 1, CircuitBreaker.OPEN: 2}
+    for service_type in ServiceType:
+        guard_stats = get_upstream_guard(service_type).stats()
+        labels = f'{{service="{service_type.value}"}}'
+        circuit = guard_stats.pop("circuit")
+        circuit["state"] = circuit_states[circuit["state"]]
+        lines.extend(_stats_lines("upstream_circuit", circuit, labels))
+        lines.extend(_stats_lines("upstream", guard_stats, labels))
+
+    for service, concurrency in get_all_concurrency_stats().items():
+        lines.extend(_stats_lines("upstream_concurrency", concurrency, f'{{service="{service}"}}'))
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,55 @@
+"""
+프록시 응답 유틸리티
+업스트림 httpx 응답을 디코딩/재직렬화 없이 클라이언트로 전달하는 응답 생성 함수 모음
+"""
+from typing import Iterable, List, Optional, Tuple
+from starlette.background import BackgroundTask
+from starlette.responses import StreamingResponse
+
+# 스트리밍 전달 시 복사하지 않는 hop-by-hop 헤더
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailer", "transfer-encoding", "upgrade",
+}
+
+
+def forwardable_headers(raw_headers: Iterable[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    """업스트림 raw 헤더 중 클라이언트로 전달할 헤더만 (소문자 이름으로) 반환"""
+    return [
+        (name.lower(), value)
+        for name, value in raw_headers
+        if name.lower().decode("latin-1") not in HOP_BY_HOP_HEADERS
+    ]
+
+
+async def iter_upstream(response, prefix: Optional[List[bytes]] = None, chunks=None):
+    """
+    업스트림 raw 바이트를 청크 단위로 전달하고, 끝나면 커넥션을 풀에 반환
+    prefix/chunks: 이미 일부를 읽은 경우 앞서 읽은 청크와 이어서 읽을 이터레이터
+    """
+    try:
+        for chunk in prefix or ():
+            yield chunk
+        if chunks is None:
+            if response.is_stream_consumed:
+                # 게이트웨이에서 생성한 오류 응답처럼 본문이 이미 메모리에 있는 경우
+                yield response.content
+                return
+            chunks = response.aiter_raw()
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        await response.aclose()
+
+
+def create_streaming_response(response, prefix: Optional[List[bytes]] = None, chunks=None) -> StreamingResponse:
+    """업스트림 응답을 디코딩/재직렬화 없이 그대로 전달하는 StreamingResponse 생성"""
+    proxied = StreamingResponse(
+        iter_upstream(response, prefix, chunks),
+        status_code=response.status_code,
+        # 스트림이 시작되기 전에 클라이언트가 끊긴 경우에도 커넥션 반환
+        background=BackgroundTask(response.aclose)
+    )
+    # content-type, content-encoding, cache-control, etag, set-cookie 등 헤더 보존 (중복 헤더 포함)
+    proxied.raw_headers.extend(forwardable_headers(response.headers.raw))
+    return proxied
@@ -0,0 +1,296 @@
+"""
+사용자별 분산 속도 제한 / 동시 요청 제한 (Redis Lua 스크립트 기반)
+AuthMiddleware가 주입한 x-user-id를 키로, 모든 게이트웨이 레플리카가 같은 한도를 공유한다.
+
+- 토큰 버킷: 규칙별 분당 허용량(rate_per_minute)과 순간 허용량(burst)
+- 동시 요청 제한: 보고서 생성/챗봇처럼 비싼 경로에서 사용자당 진행 중 요청 수(max_concurrent)
+- 초과 시 429 + Retry-After
+- Redis 장애 시에는 요청을 막지 않는다 (fail-open)
+
+규칙은 RATE_LIMIT_RULES 환경 변수(JSON 배열)로 바꿀 수 있으며, 위에서부터 처음 일치하는 규칙 하나만 적용된다.
+  {"name": "report-generate", "service": "report", "methods": ["POST"], "path": "reports*",
+   "rate_per_minute": 6, "burst": 3, "max_concurrent": 1}
+  - service: ServiceType 값 또는 "*"
+  - path: /api/{service}/ 뒤의 경로에 대한 glob 패턴
+"""
+import os
+import json
+import time
+import uuid
+import logging
+from dataclasses import asdict, dataclass
+from fnmatch import fnmatchcase
+from typing import Any, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from starlette.responses import JSONResponse
+
+from app.domain.model.service_type import ServiceType, SERVICE_TIMEOUTS
+from app.foundation.redis_client import get_redis_client
+
+load_dotenv()
+
+logger = logging.getLogger("gateway-api")
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+
+DEFAULT_RATE_LIMIT_RULES = [
+    {"name": "report-generate", "service": "report", "methods": ["POST"], "path": "reports*",
+     "rate_per_minute": 6, "burst": 3, "max_concurrent": 1},
+    {"name": "chatbot", "service": "chatbot", "methods": ["POST"], "path": "*",
+     "rate_per_minute": 30, "burst": 5, "max_concurrent": 2},
+    {"name": "default", "service": "*", "methods": ["*"], "path": "*",
+     "rate_per_minute": 600, "burst": 100},
+]
+
+SERVICE_TIMEOUTS_BY_NAME = {service_type.value: timeout for service_type, timeout in SERVICE_TIMEOUTS.items()}
+
+RATE_LIMIT_KEY_PREFIX = "ratelimit:"
+CONCURRENCY_KEY_PREFIX = "inflight:"
+
+# KEYS[1]=버킷 키, ARGV: 초당 보충량, 버킷 크기, 현재 시각(ms)
+# 반환: {허용 여부(1/0), 재시도까지 대기(ms)}
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+  tokens = capacity
+  ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate / 1000)
+local allowed = 0
+local wait_ms = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+else
+  wait_ms = math.ceil((1 - tokens) * 1000 / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity * 1000 / rate) + 1000)
+return {allowed, wait_ms}
+"""
+
+# KEYS[1]=진행 중 요청 집합(zset), ARGV: 한도, 현재 시각(ms), 임대 만료(ms), 임대 ID
+# 비정상 종료로 반환되지 않은 임대는 만료 시각이 지나면 정리된다.
+CONCURRENCY_ACQUIRE_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local now = tonumber(ARGV[2])
+local lease_ms = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - lease_ms)
+if redis.call('ZCARD', KEYS[1]) >= limit then
+  return 0
+end
+redis.call('ZADD', KEYS[1], now, ARGV[4])
+redis.call('PEXPIRE', KEYS[1], lease_ms)
+return 1
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """속도 제한 규칙"""
+    name: str
+    service: str
+    methods: Tuple[str, ...]
+    path: str
+    rate_per_minute: float
+    burst: int
+    max_concurrent: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "RateLimitRule":
+        service = raw.get("service", "*")
+        if service != "*":
+            ServiceType(service)  # 알 수 없는 서비스면 ValueError
+        methods = raw.get("methods", ["*"])
+        return cls(
+            name=raw["name"],
+            service=service,
+            methods=tuple(method.upper() for method in methods),
+            path=raw.get("path", "*"),
+            rate_per_minute=float(raw["rate_per_minute"]),
+            burst=int(raw.get("burst", 1)),
+            max_concurrent=int(raw["max_concurrent"]) if raw.get("max_concurrent") else None,
+        )
+
+    def matches(self, method: str, service: str, path: str) -> bool:
+        return (
+            (self.service == "*" or self.service == service)
+            and ("*" in self.methods or method in self.methods)
+            and fnmatchcase(path, self.path)
+        )
+
+
+@dataclass
+class Admission:
+    """속도 제한 판정 결과"""
+    allowed: bool
+    rule: Optional[RateLimitRule] = None
+    retry_after: float = 0.0
+    detail: str = ""
+    lease: Optional[Tuple[str, str]] = None
+
+
+def _load_rules() -> List[RateLimitRule]:
+    raw_rules = os.getenv("RATE_LIMIT_RULES")
+    rules = json.loads(raw_rules) if raw_rules else DEFAULT_RATE_LIMIT_RULES
+    return [RateLimitRule.from_dict(rule) for rule in rules]
+
+
+class RateLimiter:
+    """규칙 매칭 및 Redis 토큰 버킷/동시 요청 제한"""
+
+    def __init__(self, rules: Optional[List[RateLimitRule]] = None):
+        self.rules = rules if rules is not None else _load_rules()
+        self._bucket_script = None
+        self._acquire_script = None
+        self.allowed = 0
+        self.rejected_rate = 0
+        self.rejected_concurrency = 0
+        self.errors = 0
+
+    def match(self, method: str, path: str) -> Optional[Tuple[RateLimitRule, str]]:
+        """게이트웨이 경로(/api/{service}/...)에 적용할 규칙과 서비스 이름"""
+        if not path.startswith("/api/"):
+            return None
+        service, _, rest = path[len("/api/"):].partition("/")
+        for rule in self.rules:
+            if rule.matches(method, service, rest):
+                return rule, service
+        return None
+
+    def _scripts(self):
+        if self._bucket_script is None:
+            redis_client = get_redis_client()
+            self._bucket_script = redis_client.register_script(TOKEN_BUCKET_SCRIPT)
+            self._acquire_script = redis_client.register_script(CONCURRENCY_ACQUIRE_SCRIPT)
+        return self._bucket_script, self._acquire_script
+
+    async def check_rate(self, rule: RateLimitRule, user_id: str) -> float:
+        """토큰 하나 소비. 허용되면 0, 거부되면 재시도까지 대기 시간(초)"""
+        bucket_script, _ = self._scripts()
+        allowed, wait_ms = await bucket_script(
+            keys=[f"{RATE_LIMIT_KEY_PREFIX}{rule.name}:{user_id}"],
+            args=[rule.rate_per_minute / 60, rule.burst, int(time.time() * 1000)],
+        )
+        return 0.0 if int(allowed) == 1 else int(wait_ms) / 1000
+
+    async def acquire(self, rule: RateLimitRule, service: str, user_id: str) -> Optional[Tuple[str, str]]:
+        """동시 요청 슬롯 획득. 성공 시 (키, 임대 ID), 한도 초과 시 None"""
+        _, acquire_script = self._scripts()
+        key = f"{CONCURRENCY_KEY_PREFIX}{rule.name}:{user_id}"
+        lease_id = uuid.uuid4().hex
+        # 업스트림 타임아웃보다 길게 잡아 정상 요청의 임대가 먼저 만료되지 않도록 함
+        timeout = SERVICE_TIMEOUTS_BY_NAME.get(service, 30.0)
+        lease_ms = int((timeout + 30) * 1000)
+        acquired = await acquire_script(
+            keys=[key],
+            args=[rule.max_concurrent, int(time.time() * 1000), lease_ms, lease_id],
+        )
+        return (key, lease_id) if int(acquired) == 1 else None
+
+    async def release(self, lease: Tuple[str, str]):
+        key, lease_id = lease
+        try:
+            await get_redis_client().zrem(key, lease_id)
+        except Exception as e:
+            # 반환에 실패해도 임대 만료 시각이 지나면 정리됨
+            logger.warning(f"⚠️ 동시 요청 슬롯 반환 실패: {str(e)}")
+
+    async def admit(self, method: str, path: str, user_id: str) -> "Admission":
+        """
+        게이트웨이 경로 요청의 허용 여부 결정 (토큰 소비 + 필요 시 동시 요청 슬롯 획득)
+        허용되어 lease가 있으면 요청이 끝난 뒤 release()를 호출해야 한다.
+        """
+        matched = self.match(method, path) if RATE_LIMIT_ENABLED else None
+        if matched is None:
+            return Admission(allowed=True)
+
+        rule, service = matched
+        lease = None
+        try:
+            retry_after = await self.check_rate(rule, user_id)
+            if retry_after > 0:
+                self.rejected_rate += 1
+                return Admission(False, rule, retry_after, "요청이 너무 많습니다. 잠시 후 다시 시도하세요.")
+            if rule.max_concurrent:
+                lease = await self.acquire(rule, service, user_id)
+                if lease is None:
+                    self.rejected_concurrency += 1
+                    return Admission(False, rule, 1.0, "이미 처리 중인 요청이 있습니다. 완료 후 다시 시도하세요.")
+        except Exception as e:
+            # Redis 장애로 전체 서비스가 멈추지 않도록 제한 없이 통과
+            self.errors += 1
+            logger.warning(f"⚠️ 속도 제한 확인 실패, 제한 없이 통과: {str(e)}")
+
+        self.allowed += 1
+        return Admission(True, rule, lease=lease)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": RATE_LIMIT_ENABLED,
+            "rules": [asdict(rule) for rule in self.rules],
+            "allowed": self.allowed,
+            "rejected_rate": self.rejected_rate,
+            "rejected_concurrency": self.rejected_concurrency,
+            "errors": self.errors,
+        }
+
+
+def _too_many_requests(detail: str, retry_after: float, rule: RateLimitRule) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"detail": detail},
+        headers={"retry-after": str(max(int(retry_after + 0.999), 1)), "x-ratelimit-rule": rule.name},
+    )
+
+
+class RateLimitMiddleware:
+    """
+    사용자별 속도/동시 요청 제한 ASGI 미들웨어
+    AuthMiddleware 안쪽에 배치해야 인증된 x-user-id를 사용할 수 있다 (x-user-id가 없으면 적용하지 않음).
+    """
+
+    def __init__(self, app, limiter: Optional["RateLimiter"] = None):
+        self.app = app
+        self.limiter = limiter or get_rate_limiter()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not RATE_LIMIT_ENABLED or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        user_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-user-id":
+                user_id = value.decode("latin-1")
+                break
+        if user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        admission = await self.limiter.admit(scope["method"], scope["path"], user_id)
+        if not admission.allowed:
+            response = _too_many_requests(admission.detail, admission.retry_after, admission.rule)
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if admission.lease is not None:
+                await self.limiter.release(admission.lease)
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+# 어디서든 이 함수를 호출하여 프로세스 공용 속도 제한기를 가져올 수 있음
+def get_rate_limiter() -> RateLimiter:
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter()
+    return _rate_limiter
@@ -6,6 +6,7 @@ load_dotenv()
 
 class RedisClient:
     _pool = None
+    _binary_pool = None
 
     @classmethod
     def get_pool(cls):
@@ -28,6 +29,30 @@ class RedisClient:
         pool = cls.get_pool()
         return redis.Redis(connection_pool=pool)
 
+    @classmethod
+    def get_binary_pool(cls):
+        """응답 본문 등 바이너리 값을 다루기 위한 풀 (디코딩 없음)"""
+        if cls._binary_pool is None:
+            redis_host = os.getenv("REDIS_HOST", "redis")
+            redis_port = int(os.getenv("REDIS_PORT", "6379"))
+
+            cls._binary_pool = redis.ConnectionPool(
+                host=redis_host,
+                port=redis_port,
+                db=0,
+                decode_responses=False
+            )
+        return cls._binary_pool
+
+    @classmethod
+    def get_binary_connection(cls):
+        pool = cls.get_binary_pool()
+        return redis.Redis(connection_pool=pool)
+
 # 어디서든 이 함수를 호출하여 Redis 클라이언트를 가져올 수 있음
 def get_redis_client():
-    return RedisClient.get_connection() 
\ No newline at end of file
+    return RedisClient.get_connection() 
+
+# 바이너리(bytes) 값을 그대로 읽고 쓰는 Redis 클라이언트
+def get_binary_redis_client():
+    return RedisClient.get_binary_connection()
@@ -0,0 +1,160 @@
+"""
+동일 GET 요청 단일 비행(single-flight) 병합
+동시에 들어온 동일한 GET(메서드 + 서비스 + 경로 + 쿼리 + vary 헤더)은
+업스트림 호출 하나를 공유하고, 그 결과를 대기 중인 모든 요청에 나누어 준다.
+
+- 캐시가 아니므로 호출이 끝나면 결과를 보관하지 않는다 (오래된 응답이 생기지 않음).
+- 공유하려면 본문을 메모리에 모아야 하므로 COALESCE_MAX_BODY_BYTES를 넘는 응답이나
+  Set-Cookie가 있는 응답은 공유하지 않고, 대기하던 요청은 각자 업스트림을 호출한다.
+"""
+import os
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger("gateway-api")
+
+COALESCE_ENABLED = os.getenv("COALESCE_ENABLED", "true").lower() == "true"
+# 병합 키에 포함할 요청 헤더 (사용자별 응답 경로는 x-user-id 필수)
+COALESCE_VARY_HEADERS = tuple(
+    header.strip().lower()
+    for header in os.getenv("COALESCE_VARY_HEADERS", "x-user-id,accept,accept-encoding").split(",")
+    if header.strip()
+)
+# 응답 자체가 달라지는 조건부/범위 요청 헤더 - 설정과 관계없이 항상 병합 키에 포함
+# (재검증 요청이 받은 빈 304나 206 부분 응답이 조건 없는 요청에 전달되지 않도록)
+CONDITIONAL_REQUEST_HEADERS = (
+    "if-none-match", "if-modified-since", "if-match", "if-unmodified-since", "if-range", "range",
+)
+# 공유할 최대 본문 크기(바이트)
+COALESCE_MAX_BODY_BYTES = int(os.getenv("COALESCE_MAX_BODY_BYTES", str(4 * 1024 * 1024)))
+
+# (상태 코드, raw 헤더, 본문)
+SharedResult = Tuple[int, List[Tuple[bytes, bytes]], bytes]
+
+
+class _ReplayStream(httpx.AsyncByteStream):
+    """이미 읽은 청크를 먼저 내보내고, 남은 업스트림 스트림이 있으면 이어서 전달"""
+
+    def __init__(self, chunks: List[bytes], rest: Optional[AsyncIterator[bytes]] = None, upstream=None):
+        self._chunks = chunks
+        self._rest = rest
+        self._upstream = upstream
+
+    async def __aiter__(self):
+        for chunk in self._chunks:
+            yield chunk
+        if self._rest is not None:
+            async for chunk in self._rest:
+                yield chunk
+
+    async def aclose(self):
+        if self._upstream is not None:
+            await self._upstream.aclose()
+
+
+def _replay(status_code: int, raw_headers, stream: _ReplayStream) -> httpx.Response:
+    """본문을 읽지 않은 상태의 httpx 응답 생성 (raw 바이트, content-encoding 유지)"""
+    return httpx.Response(status_code=status_code, headers=list(raw_headers), stream=stream)
+
+
+class RequestCoalescer:
+    """키별 진행 중인 업스트림 호출을 공유"""
+
+    def __init__(self, vary_headers: Tuple[str, ...] = COALESCE_VARY_HEADERS):
+        self.vary_headers = vary_headers
+        self._key_headers = tuple(dict.fromkeys(vary_headers + CONDITIONAL_REQUEST_HEADERS))
+        self._inflight: Dict[str, "asyncio.Future[Optional[SharedResult]]"] = {}
+        self._joined: set = set()
+        self.leaders = 0
+        self.hits = 0
+        self.collapses = 0
+        self.fallbacks = 0
+
+    def key(self, service: str, path: str, query: str, headers: Mapping[str, str]) -> str:
+        """headers: 업스트림으로 보낼 요청 헤더 (소문자 이름)"""
+        vary = "|".join(f"{name}={headers.get(name, '')}" for name in self._key_headers)
+        return f"GET {service}/{path}?{query}|{vary}"
+
+    async def run(self, key: str, fetch: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """
+        같은 키의 호출이 진행 중이면 그 결과를 기다리고, 아니면 직접 호출해 결과를 공유
+        fetch: 본문을 읽지 않은 httpx 응답을 반환하는 코루틴 함수 (ServiceProxyFactory.stream)
+        반환값도 본문을 읽지 않은 httpx 응답이므로 호출 측에서 그대로 스트리밍하면 된다.
+        """
+        if not COALESCE_ENABLED:
+            return await fetch()
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            if key not in self._joined:
+                # 업스트림 호출 하나에 대기 요청이 처음 합류한 경우만 집계
+                self._joined.add(key)
+                self.collapses += 1
+            # 대기 중인 요청이 취소되어도 공유 Future는 취소되지 않도록 shield
+            shared = await asyncio.shield(pending)
+            if shared is None:
+                self.fallbacks += 1
+                return await fetch()
+            self.hits += 1
+            status_code, raw_headers, body = shared
+            return _replay(status_code, raw_headers, _ReplayStream([body]))
+
+        future: "asyncio.Future[Optional[SharedResult]]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.leaders += 1
+        try:
+            upstream = await fetch()
+            if upstream.is_stream_consumed:
+                # 게이트웨이에서 생성한 오류 응답 - 공유하지 않고 대기 요청은 각자 재시도
+                return upstream
+
+            content_length = upstream.headers.get("content-length")
+            too_large = bool(content_length and content_length.isdigit() and int(content_length) > COALESCE_MAX_BODY_BYTES)
+            if too_large or "set-cookie" in upstream.headers:
+                return upstream
+
+            chunks: List[bytes] = []
+            size = 0
+            iterator = upstream.aiter_raw()
+            async for chunk in iterator:
+                chunks.append(chunk)
+                size += len(chunk)
+                if size > COALESCE_MAX_BODY_BYTES:
+                    # 공유를 포기하고 나머지는 이 요청에만 스트리밍
+                    return _replay(upstream.status_code, upstream.headers.raw, _ReplayStream(chunks, iterator, upstream))
+            await upstream.aclose()
+
+            body = b"".join(chunks)
+            future.set_result((upstream.status_code, list(upstream.headers.raw), body))
+            return _replay(upstream.status_code, upstream.headers.raw, _ReplayStream([body]))
+        finally:
+            if not future.done():
+                future.set_result(None)
+            self._inflight.pop(key, None)
+            self._joined.discard(key)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.leaders + self.hits + self.fallbacks
+        return {
+            "enabled": COALESCE_ENABLED,
+            "vary_headers": list(self.vary_headers),
+            "in_flight": len(self._inflight),
+            "upstream_calls": self.leaders,
+            "hits": self.hits,
+            "collapses": self.collapses,
+            "fallbacks": self.fallbacks,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+_request_coalescer = RequestCoalescer()
+
+# 어디서든 이 함수를 호출하여 프로세스 공용 요청 병합기를 가져올 수 있음
+def get_request_coalescer() -> RequestCoalescer:
+    return _request_coalescer
@@ -0,0 +1,80 @@
+"""
+요청 마감 시각(deadline) 전파 및 클라이언트 연결 종료 시 업스트림 호출 취소
+
+- 업스트림 호출에 X-Request-Deadline 헤더(Unix epoch 밀리초)를 붙여 서비스가 남은 시간을 알 수 있게 한다.
+  클라이언트가 이미 더 이른 마감 시각을 보냈다면 그 값을 유지한다.
+- 클라이언트가 응답을 기다리다 연결을 끊으면 진행 중인 업스트림 호출을 취소한다
+  (업스트림 커넥션이 닫히므로 서비스도 연결 종료를 감지할 수 있다).
+"""
+import time
+import asyncio
+import logging
+from typing import Awaitable, Optional, Tuple, TypeVar
+
+from starlette.requests import Request
+
+logger = logging.getLogger("gateway-api")
+
+DEADLINE_HEADER = "x-request-deadline"
+
+T = TypeVar("T")
+
+
+class ClientDisconnected(Exception):
+    """응답을 받기 전에 클라이언트가 연결을 끊음"""
+
+
+def parse_deadline(value: Optional[str]) -> Optional[float]:
+    """X-Request-Deadline 헤더 값(epoch ms)을 epoch 초로 변환"""
+    if not value:
+        return None
+    try:
+        return int(value) / 1000
+    except ValueError:
+        return None
+
+
+def apply_deadline(headers: dict, timeout: float) -> Tuple[float, float]:
+    """
+    업스트림 요청 헤더에 마감 시각을 설정하고 (마감 시각, 남은 타임아웃)을 반환
+    클라이언트가 보낸 마감 시각이 더 이르면 그 값을 사용하고, 타임아웃도 남은 시간으로 줄인다.
+    """
+    incoming = None
+    for name in [name for name in headers if name.lower() == DEADLINE_HEADER]:
+        incoming = parse_deadline(headers.pop(name))
+
+    deadline = time.time() + timeout
+    if incoming is not None and incoming < deadline:
+        deadline = incoming
+    headers[DEADLINE_HEADER] = str(int(deadline * 1000))
+    return deadline, max(deadline - time.time(), 0.001)
+
+
+async def cancel_on_disconnect(request: Request, awaitable: Awaitable[T]) -> T:
+    """
+    클라이언트 연결이 끊기면 awaitable을 취소하고 ClientDisconnected를 발생
+    요청 본문을 이미 읽은 뒤(또는 본문이 없는 요청)에만 사용해야 한다.
+    """
+    task = asyncio.ensure_future(awaitable)
+
+    async def wait_for_disconnect():
+        while True:
+            message = await request.receive()
+            if message["type"] == "http.disconnect":
+                return
+
+    watcher = asyncio.ensure_future(wait_for_disconnect())
+    try:
+        done, _ = await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    finally:
+        watcher.cancel()
+
+    if task in done:
+        return task.result()
+
+    task.cancel()
+    logger.info(f"🔌 클라이언트 연결 종료로 업스트림 호출 취소: {request.url.path}")
+    raise ClientDisconnected()
@@ -0,0 +1,325 @@
+"""
+업스트림 복원력 계층 (ServiceType별)
+- 서킷 브레이커: 최근 구간의 오류율/지연(느린 호출 비율)로 열림 → 즉시 503 반환, 일정 시간 후 반열림 탐침
+- 재시도 예산: 요청마다 토큰을 적립하고 재시도 1회에 1토큰 소모 (멱등 메서드만 재시도)
+- 헤지 요청: 설정된 서비스의 GET이 최근 p95 지연을 넘기면 두 번째 요청을 보내 먼저 끝난 쪽을 사용
+
+포화된 업스트림(GPU 챗봇, 보고서 생성 등)에 소켓과 코루틴이 쌓이는 대신 빠르게 부하를 덜어낸다.
+"""
+import os
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+import httpx
+from dotenv import load_dotenv
+
+from app.domain.model.service_type import ServiceType, SERVICE_TIMEOUTS
+from app.foundation.upload_stream import UploadRejected
+
+load_dotenv()
+
+logger = logging.getLogger("gateway-api")
+
+# 서킷 브레이커 설정
+CB_WINDOW_SECONDS = float(os.getenv("CB_WINDOW_SECONDS", "30"))
+CB_MIN_REQUESTS = int(os.getenv("CB_MIN_REQUESTS", "20"))
+CB_ERROR_RATE = float(os.getenv("CB_ERROR_RATE", "0.5"))
+CB_SLOW_CALL_RATE = float(os.getenv("CB_SLOW_CALL_RATE", "0.8"))
+# 서비스 타임아웃 대비 '느린 호출'로 간주하는 비율
+CB_SLOW_CALL_TIMEOUT_FRACTION = float(os.getenv("CB_SLOW_CALL_TIMEOUT_FRACTION", "0.8"))
+CB_OPEN_SECONDS = float(os.getenv("CB_OPEN_SECONDS", "10"))
+CB_HALF_OPEN_PROBES = int(os.getenv("CB_HALF_OPEN_PROBES", "1"))
+
+# 재시도 예산 설정
+RETRY_BUDGET_RATIO = float(os.getenv("RETRY_BUDGET_RATIO", "0.1"))
+RETRY_BUDGET_MAX_TOKENS = float(os.getenv("RETRY_BUDGET_MAX_TOKENS", "10"))
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "2"))
+RETRY_BACKOFF_SECONDS = float(os.getenv("RETRY_BACKOFF_SECONDS", "0.05"))
+
+# 헤지 요청 설정 (쉼표 구분 ServiceType 값, 예: "disclosure,climate-service")
+HEDGE_SERVICES = {
+    value.strip() for value in os.getenv("HEDGE_SERVICES", "").split(",") if value.strip()
+}
+HEDGE_MIN_DELAY_MS = float(os.getenv("HEDGE_MIN_DELAY_MS", "50"))
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+RETRYABLE_EXCEPTIONS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError, httpx.PoolTimeout)
+
+# 지연 분위수 계산에 쓰는 최근 표본 수
+LATENCY_SAMPLES = 256
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 요청을 보내지 않음"""
+
+    def __init__(self, service_type: ServiceType, retry_after: float):
+        self.service_type = service_type
+        self.retry_after = retry_after
+        super().__init__(f"{service_type.value} 서비스 서킷이 열려 있습니다. {retry_after:.0f}초 후 다시 시도하세요.")
+
+
+class CircuitBreaker:
+    """오류율/느린 호출 비율 기반 서킷 브레이커"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, slow_call_seconds: float):
+        self.slow_call_seconds = slow_call_seconds
+        self.state = self.CLOSED
+        self._outcomes: Deque[Tuple[float, bool, bool]] = deque()  # (시각, 실패 여부, 느린 호출 여부)
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self.opened_count = 0
+        self.rejected = 0
+
+    def _prune(self, now: float):
+        while self._outcomes and self._outcomes[0][0] < now - CB_WINDOW_SECONDS:
+            self._outcomes.popleft()
+
+    def retry_after(self) -> float:
+        return max(self._opened_at + CB_OPEN_SECONDS - time.monotonic(), 1.0)
+
+    def allow(self) -> bool:
+        """요청을 보내도 되는지 확인 (반열림 상태에서는 제한된 탐침만 허용)"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < CB_OPEN_SECONDS:
+                self.rejected += 1
+                return False
+            self.state = self.HALF_OPEN
+            self._probes_in_flight = 0
+        if self.state == self.HALF_OPEN:
+            if self._probes_in_flight >= CB_HALF_OPEN_PROBES:
+                self.rejected += 1
+                return False
+            self._probes_in_flight += 1
+        return True
+
+    def _open(self, now: float):
+        if self.state != self.OPEN:
+            self.opened_count += 1
+        self.state = self.OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+
+    def record(self, failed: bool, latency: float):
+        """요청 결과 기록 및 상태 전이"""
+        now = time.monotonic()
+        slow = latency >= self.slow_call_seconds
+
+        if self.state == self.HALF_OPEN:
+            self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+            if failed or slow:
+                self._open(now)
+            else:
+                self.state = self.CLOSED
+                self._outcomes.clear()
+            return
+
+        self._outcomes.append((now, failed, slow))
+        self._prune(now)
+        total = len(self._outcomes)
+        if total < CB_MIN_REQUESTS:
+            return
+        failures = sum(1 for _, is_failed, _ in self._outcomes if is_failed)
+        slow_calls = sum(1 for _, _, is_slow in self._outcomes if is_slow)
+        if failures / total >= CB_ERROR_RATE or slow_calls / total >= CB_SLOW_CALL_RATE:
+            self._open(now)
+
+    def release(self):
+        """결과 없이 끝난 요청(취소 등)의 탐침 슬롯 반환"""
+        if self.state == self.HALF_OPEN:
+            self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        self._prune(time.monotonic())
+        total = len(self._outcomes)
+        failures = sum(1 for _, is_failed, _ in self._outcomes if is_failed)
+        slow_calls = sum(1 for _, _, is_slow in self._outcomes if is_slow)
+        return {
+            "state": self.state,
+            "window_requests": total,
+            "error_rate": round(failures / total, 4) if total else 0.0,
+            "slow_call_rate": round(slow_calls / total, 4) if total else 0.0,
+            "slow_call_seconds": self.slow_call_seconds,
+            "opened_count": self.opened_count,
+            "rejected": self.rejected,
+        }
+
+
+class RetryBudget:
+    """요청 비례 토큰 버킷 - 재시도/헤지가 전체 트래픽의 일정 비율을 넘지 않도록 제한"""
+
+    def __init__(self, ratio: float = RETRY_BUDGET_RATIO, max_tokens: float = RETRY_BUDGET_MAX_TOKENS):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self):
+        self.tokens = min(self.tokens + self.ratio, self.max_tokens)
+
+    def withdraw(self) -> bool:
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class UpstreamGuard:
+    """ServiceType 하나에 대한 서킷 브레이커 + 재시도 예산 + 헤지 요청"""
+
+    def __init__(self, service_type: ServiceType):
+        self.service_type = service_type
+        timeout = SERVICE_TIMEOUTS.get(service_type, 30.0)
+        self.breaker = CircuitBreaker(slow_call_seconds=timeout * CB_SLOW_CALL_TIMEOUT_FRACTION)
+        self.budget = RetryBudget()
+        self.hedge_enabled = service_type.value in HEDGE_SERVICES
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.requests = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def p95(self) -> Optional[float]:
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+
+    @staticmethod
+    def _close_quietly(task: "asyncio.Task"):
+        """버려진 요청이 응답을 받았다면 커넥션 반환"""
+        if task.cancelled() or task.exception() is not None:
+            return
+        asyncio.ensure_future(task.result().aclose())
+
+    async def _hedged(self, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """p95 지연을 넘기면 두 번째 요청을 보내고 먼저 성공한 응답을 사용"""
+        p95 = self.p95()
+        delay = max(p95 if p95 is not None else 0.0, HEDGE_MIN_DELAY_MS / 1000)
+        primary = asyncio.ensure_future(send())
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not self.budget.withdraw():
+                response = await primary
+                tasks.discard(primary)
+                return response
+
+            self.hedges += 1
+            hedge = asyncio.ensure_future(send())
+            tasks.add(hedge)
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        tasks.discard(task)
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # 반환하지 않은(진) 요청만 취소하고, 이미 응답을 받았다면 커넥션 반환
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                task.add_done_callback(self._close_quietly)
+
+    async def execute(self, method: str, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """
+        서킷 브레이커/재시도 예산/헤지를 적용해 요청 실행
+        send: 요청을 한 번 보내고 (본문을 읽지 않은) 응답을 반환하는 코루틴 함수
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(self.service_type, self.breaker.retry_after())
+
+        self.requests += 1
+        self.budget.deposit()
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        hedge = self.hedge_enabled and method.upper() == "GET"
+        attempt = 1
+
+        while True:
+            started = time.monotonic()
+            recorded = False
+            try:
+                response = await (self._hedged(send) if hedge else send())
+                latency = time.monotonic() - started
+                failed = response.status_code >= 500
+                self.breaker.record(failed, latency)
+                recorded = True
+                self._latencies.append(latency)
+
+                if (
+                    response.status_code in RETRYABLE_STATUS_CODES
+                    and idempotent
+                    and attempt < RETRY_MAX_ATTEMPTS
+                    and self.breaker.state == CircuitBreaker.CLOSED
+                    and self.budget.withdraw()
+                ):
+                    await response.aclose()
+                    self.retries += 1
+                    attempt += 1
+                    await asyncio.sleep(RETRY_BACKOFF_SECONDS)
+                    continue
+                return response
+            except RETRYABLE_EXCEPTIONS:
+                self.breaker.record(True, time.monotonic() - started)
+                recorded = True
+                if (
+                    idempotent
+                    and attempt < RETRY_MAX_ATTEMPTS
+                    and self.breaker.state == CircuitBreaker.CLOSED
+                    and self.budget.withdraw()
+                ):
+                    self.retries += 1
+                    attempt += 1
+                    await asyncio.sleep(RETRY_BACKOFF_SECONDS)
+                    continue
+                raise
+            except httpx.TimeoutException:
+                self.breaker.record(True, time.monotonic() - started)
+                recorded = True
+                raise
+            except UploadRejected:
+                # 클라이언트 업로드 거부는 업스트림 실패가 아님 (finally에서 표본 없이 반환)
+                raise
+            finally:
+                if not recorded:
+                    self.breaker.release()
+
+    def stats(self) -> Dict[str, Any]:
+        p95 = self.p95()
+        return {
+            "circuit": self.breaker.stats(),
+            "requests": self.requests,
+            "retries": self.retries,
+            "retry_budget_tokens": round(self.budget.tokens, 2),
+            "hedge_enabled": self.hedge_enabled,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+
+_guards: Dict[ServiceType, UpstreamGuard] = {}
+
+# 어디서든 이 함수를 호출하여 서비스별 복원력 계층을 가져올 수 있음
+def get_upstream_guard(service_type: ServiceType) -> UpstreamGuard:
+    guard = _guards.get(service_type)
+    if guard is None:
+        guard = _guards[service_type] = UpstreamGuard(service_type)
+    return guard
+
+
+def get_all_upstream_stats() -> Dict[str, Any]:
+    """모든 ServiceType의 복원력 상태"""
+    return {service_type.value: get_upstream_guard(service_type).stats() for service_type in ServiceType}
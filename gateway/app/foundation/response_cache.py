@@ -0,0 +1,329 @@
+"""
+게이트웨이 공유 응답 캐시
+설정된 GET 경로 접두사(기본: 공개 disclosure-data 마스터 데이터)의 응답을
+Redis(모든 게이트웨이 레플리카 공유, L2)와 프로세스 메모리(L1)에 저장한다.
+
+- 업스트림 Cache-Control(no-store/private, s-maxage/max-age)을 따른다.
+- no-cache 응답은 ETag가 있을 때만 저장하고, RESPONSE_CACHE_NO_CACHE_FRESH_SECONDS가 지나면
+  저장된 ETag로 조건부 요청(If-None-Match)을 보내 재검증한다 (304면 저장된 본문 사용).
+- ETag는 업스트림 값을 쓰고, 없으면 본문 해시로 생성한다.
+- If-None-Match가 캐시된 ETag와 일치하면 업스트림 호출 없이 304를 반환한다.
+- 캐시 대상 경로는 사용자별 응답이 아니어야 한다 (x-user-id가 주입되지 않는 공개 경로).
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from dotenv import load_dotenv
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.foundation.redis_client import get_binary_redis_client
+from app.foundation.proxy_response import create_streaming_response, forwardable_headers
+
+load_dotenv()
+
+logger = logging.getLogger("gateway-api")
+
+# 캐시 대상 GET 경로 접두사 (쉼표 구분, 빈 값이면 캐시 비활성화)
+RESPONSE_CACHE_PREFIXES = tuple(
+    prefix.strip()
+    for prefix in os.getenv("RESPONSE_CACHE_PREFIXES", "/api/disclosure/disclosure-data/").split(",")
+    if prefix.strip()
+)
+# 업스트림이 max-age를 주지 않았을 때의 기본 TTL(초)
+RESPONSE_CACHE_DEFAULT_TTL = int(os.getenv("RESPONSE_CACHE_DEFAULT_TTL", "300"))
+# L1(프로세스 메모리) TTL과 최대 항목 수 - 다른 레플리카의 purge가 반영되는 최대 지연
+RESPONSE_CACHE_L1_TTL = float(os.getenv("RESPONSE_CACHE_L1_TTL", "5"))
+RESPONSE_CACHE_L1_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_L1_MAX_ENTRIES", "1000"))
+# no-cache 응답을 재검증 없이 사용하는 시간(초, 0이면 사용할 때마다 재검증)
+RESPONSE_CACHE_NO_CACHE_FRESH_SECONDS = float(os.getenv("RESPONSE_CACHE_NO_CACHE_FRESH_SECONDS", "5"))
+# 캐시할 최대 본문 크기(바이트)
+RESPONSE_CACHE_MAX_BODY_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BODY_BYTES", str(2 * 1024 * 1024)))
+
+CACHE_KEY_PREFIX = "gwcache:"
+# 캐시를 채우는 요청에서 빼는 클라이언트 검증 헤더 (업스트림 304는 저장할 수 없으므로
+# 전체 응답을 받아 저장한 뒤 클라이언트의 If-None-Match에는 게이트웨이가 304로 응답)
+FILL_REQUEST_HEADER_OVERRIDES: Dict[str, Optional[str]] = {"if-none-match": None, "if-modified-since": None}
+# 캐시된 응답에서 제외하는 헤더 (본문 길이는 다시 계산하고, 쿠키는 공유 캐시에 저장하지 않음)
+EXCLUDED_CACHED_HEADERS = {b"content-length", b"set-cookie", b"date"}
+
+
+def _parse_cache_control(value: str) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = {}
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, arg = part.partition("=")
+        directives[name.strip().lower()] = arg.strip().strip('"') if arg else None
+    return directives
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 약한 비교 (W/ 접두사 무시)"""
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    normalized = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == normalized:
+            return True
+    return False
+
+
+class ResponseCache:
+    """Redis(L2) + 프로세스 메모리(L1) 2단계 응답 캐시"""
+
+    def __init__(self, prefixes: Tuple[str, ...] = RESPONSE_CACHE_PREFIXES):
+        self.prefixes = prefixes
+        self._l1: "OrderedDict[str, Tuple[float, Dict[str, Any], bytes]]" = OrderedDict()
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.stores = 0
+        self.bypasses = 0
+        self.revalidations = 0
+
+    def matches(self, method: str, path: str) -> bool:
+        """캐시 대상 요청인지 확인"""
+        return method == "GET" and bool(self.prefixes) and path.startswith(self.prefixes)
+
+    @staticmethod
+    def _key(request: Request) -> str:
+        # 업스트림 raw 바이트를 그대로 저장하므로 Accept-Encoding별로 구분
+        accept_encoding = request.headers.get("accept-encoding", "")
+        return f"{CACHE_KEY_PREFIX}{request.url.path}?{request.url.query}|{accept_encoding}"
+
+    # ---- 저장소 ----
+
+    def _l1_get(self, key: str):
+        entry = self._l1.get(key)
+        if entry is None:
+            return None
+        l1_expires_at, meta, body = entry
+        if l1_expires_at <= time.monotonic() or meta["expires_at"] <= time.time():
+            del self._l1[key]
+            return None
+        self._l1.move_to_end(key)
+        return meta, body
+
+    def _l1_put(self, key: str, meta: Dict[str, Any], body: bytes):
+        if RESPONSE_CACHE_L1_MAX_ENTRIES <= 0:
+            return
+        self._l1[key] = (time.monotonic() + RESPONSE_CACHE_L1_TTL, meta, body)
+        self._l1.move_to_end(key)
+        while len(self._l1) > RESPONSE_CACHE_L1_MAX_ENTRIES:
+            self._l1.popitem(last=False)
+
+    async def _lookup(self, key: str):
+        cached = self._l1_get(key)
+        if cached is not None:
+            self.l1_hits += 1
+            return cached
+
+        try:
+            redis_client = get_binary_redis_client()
+            raw_meta, body = await redis_client.hmget(key, "meta", "body")
+        except Exception as e:
+            logger.debug(f"응답 캐시 조회 실패 (miss로 처리): {str(e)}")
+            return None
+        if raw_meta is None or body is None:
+            return None
+
+        meta = json.loads(raw_meta)
+        if meta["expires_at"] <= time.time():
+            return None
+        self.l2_hits += 1
+        self._l1_put(key, meta, body)
+        return meta, body
+
+    async def _store(self, key: str, meta: Dict[str, Any], body: bytes, ttl: int):
+        self._l1_put(key, meta, body)
+        try:
+            redis_client = get_binary_redis_client()
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.hset(key, mapping={"meta": json.dumps(meta), "body": body})
+                pipe.expire(key, ttl)
+                await pipe.execute()
+            self.stores += 1
+        except Exception as e:
+            logger.debug(f"응답 캐시 저장 실패: {str(e)}")
+
+    # ---- 응답 생성 ----
+
+    @staticmethod
+    def _cached_response(meta: Dict[str, Any], body: bytes, cache_status: str) -> Response:
+        response = Response(content=body, status_code=meta["status"])
+        response.raw_headers.extend(
+            (name.encode("latin-1"), value.encode("latin-1")) for name, value in meta["headers"]
+        )
+        response.raw_headers.append((b"x-gateway-cache", cache_status.encode("latin-1")))
+        return response
+
+    @staticmethod
+    def _not_modified_response(meta: Dict[str, Any]) -> Response:
+        headers = {"etag": meta["etag"], "x-gateway-cache": "HIT"}
+        for name, value in meta["headers"]:
+            if name in ("cache-control", "vary", "content-location", "expires"):
+                headers[name] = value
+        return Response(status_code=304, headers=headers)
+
+    @staticmethod
+    def _ttl_for(upstream) -> Tuple[int, bool]:
+        """업스트림 Cache-Control에서 (공유 캐시 TTL, 재검증 필요 여부) 결정 (TTL 0이면 저장하지 않음)"""
+        directives = _parse_cache_control(upstream.headers.get("cache-control", ""))
+        if "no-store" in directives or "private" in directives:
+            return 0, False
+        if "no-cache" in directives:
+            # 저장은 가능하지만 사용 전 재검증 필요 - 재검증할 ETag가 있을 때만 저장
+            return (RESPONSE_CACHE_DEFAULT_TTL if upstream.headers.get("etag") else 0), True
+        for directive in ("s-maxage", "max-age"):
+            if directives.get(directive):
+                try:
+                    return max(int(directives[directive]), 0), False
+                except ValueError:
+                    return 0, False
+        return RESPONSE_CACHE_DEFAULT_TTL, False
+
+    def _respond(self, request: Request, meta: Dict[str, Any], body: bytes, cache_status: str) -> Response:
+        """캐시된 항목으로 응답 (클라이언트 ETag가 같으면 304)"""
+        if _etag_matches(request.headers.get("if-none-match", ""), meta["etag"]):
+            self.not_modified += 1
+            return self._not_modified_response(meta)
+        return self._cached_response(meta, body, cache_status)
+
+    async def _revalidate(self, request: Request, key: str, meta: Dict[str, Any], body: bytes, fetch) -> Response:
+        """저장된 ETag로 조건부 요청 - 304면 저장된 본문을 다시 신선하게 표시, 아니면 새 응답으로 교체"""
+        upstream = await fetch({"if-none-match": meta["etag"], "if-modified-since": None})
+        if upstream.status_code != 304:
+            return await self._fill(request, key, upstream)
+        await upstream.aclose()
+        self.revalidations += 1
+        now = time.time()
+        meta = {**meta, "revalidate_at": now + RESPONSE_CACHE_NO_CACHE_FRESH_SECONDS, "expires_at": now + meta["ttl"]}
+        await self._store(key, meta, body, meta["ttl"])
+        return self._respond(request, meta, body, "REVALIDATED")
+
+    async def serve(self, request: Request, fetch: Callable[..., Awaitable[Any]]) -> Response:
+        """
+        캐시에서 응답하거나, 업스트림(fetch)을 호출해 응답을 전달하면서 캐시에 저장
+        fetch: 본문을 읽지 않은 httpx 응답을 반환하는 코루틴 함수 (ServiceProxyFactory.stream)
+            인자로 요청 헤더 덮어쓰기 dict를 받을 수 있음 (값이 None이면 헤더 제거)
+        """
+        key = self._key(request)
+        request_directives = _parse_cache_control(request.headers.get("cache-control", ""))
+        bypass = "no-cache" in request_directives or "no-store" in request_directives
+
+        if bypass:
+            self.bypasses += 1
+        else:
+            cached = await self._lookup(key)
+            if cached is not None:
+                meta, body = cached
+                revalidate_at = meta.get("revalidate_at")
+                if revalidate_at is not None and revalidate_at <= time.time():
+                    return await self._revalidate(request, key, meta, body, fetch)
+                return self._respond(request, meta, body, "HIT")
+
+        self.misses += 1
+        return await self._fill(request, key, await fetch(FILL_REQUEST_HEADER_OVERRIDES))
+
+    async def _fill(self, request: Request, key: str, upstream) -> Response:
+        """업스트림 응답을 전달하면서 (저장 가능하면) 캐시에 저장"""
+        ttl, must_revalidate = self._ttl_for(upstream)
+        if upstream.status_code != 200 or ttl <= 0 or upstream.is_stream_consumed:
+            return create_streaming_response(upstream)
+
+        content_length = upstream.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > RESPONSE_CACHE_MAX_BODY_BYTES:
+            return create_streaming_response(upstream)
+
+        # 본문을 읽으면서 최대 크기를 넘으면 캐시를 포기하고 나머지를 그대로 스트리밍
+        chunks: List[bytes] = []
+        size = 0
+        iterator = upstream.aiter_raw()
+        async for chunk in iterator:
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > RESPONSE_CACHE_MAX_BODY_BYTES:
+                return create_streaming_response(upstream, prefix=chunks, chunks=iterator)
+        await upstream.aclose()
+        body = b"".join(chunks)
+
+        headers: List[List[str]] = [
+            [name.decode("latin-1"), value.decode("latin-1")]
+            for name, value in forwardable_headers(upstream.headers.raw)
+            if name not in EXCLUDED_CACHED_HEADERS
+        ]
+        etag = upstream.headers.get("etag")
+        if not etag:
+            etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            headers.append(["etag", etag])
+        if not upstream.headers.get("cache-control"):
+            # 브라우저가 매번 ETag로 재검증하도록 (게이트웨이가 304로 응답)
+            headers.append(["cache-control", "no-cache"])
+
+        now = time.time()
+        meta = {
+            "status": upstream.status_code,
+            "headers": headers,
+            "etag": etag,
+            "ttl": ttl,
+            "expires_at": now + ttl,
+            "revalidate_at": now + RESPONSE_CACHE_NO_CACHE_FRESH_SECONDS if must_revalidate else None,
+        }
+        await self._store(key, meta, body, ttl)
+        return self._respond(request, meta, body, "MISS")
+
+    async def purge(self, prefix: Optional[str] = None) -> int:
+        """
+        경로 접두사(게이트웨이 경로 기준)에 해당하는 캐시 항목 삭제
+        prefix가 없으면 전체 삭제. 다른 레플리카의 L1은 RESPONSE_CACHE_L1_TTL 이내에 만료된다.
+        """
+        match_prefix = f"{CACHE_KEY_PREFIX}{prefix or ''}"
+        for key in [key for key in self._l1 if key.startswith(match_prefix)]:
+            del self._l1[key]
+
+        deleted = 0
+        redis_client = get_binary_redis_client()
+        batch = []
+        async for key in redis_client.scan_iter(match=f"{match_prefix}*", count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                deleted += await redis_client.delete(*batch)
+                batch = []
+        if batch:
+            deleted += await redis_client.delete(*batch)
+        logger.info(f"🧹 응답 캐시 purge: prefix={prefix or '*'}, deleted={deleted}")
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.l1_hits + self.l2_hits + self.misses
+        return {
+            "prefixes": list(self.prefixes),
+            "l1_size": len(self._l1),
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.l1_hits + self.l2_hits) / lookups, 4) if lookups else 0.0,
+            "not_modified": self.not_modified,
+            "stores": self.stores,
+            "bypasses": self.bypasses,
+            "revalidations": self.revalidations,
+        }
+
+
+_response_cache = ResponseCache()
+
+# 어디서든 이 함수를 호출하여 프로세스 공용 응답 캐시를 가져올 수 있음
+def get_response_cache() -> ResponseCache:
+    return _response_cache
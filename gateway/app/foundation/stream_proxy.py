@@ -0,0 +1,317 @@
+"""
+장시간 연결 프록시 (Server-Sent Events / WebSocket)
+챗봇/보고서 생성처럼 결과가 점진적으로 나오는 응답을 생성되는 대로 클라이언트에 전달한다.
+
+- SSE: Accept: text/event-stream 요청은 병합/캐시 없이 업스트림 바이트를 받는 즉시 전달한다
+  (청크마다 ASGI send를 호출하므로 이벤트 단위로 flush되고, 압축/프록시 버퍼링은 끈다).
+- WebSocket: WEBSOCKET_SERVICES의 서비스로 업그레이드 요청을 중계한다 (양방향 메시지 릴레이).
+- 인증: 두 경로 모두 AuthMiddleware의 JWT 검증을 거치고, 주입된 x-user-id를 업스트림에 전달한다.
+- 유휴 시간 제한: SSE는 이벤트 사이 간격(SSE_IDLE_TIMEOUT), WebSocket은 양방향 무통신 시간(WS_IDLE_TIMEOUT)
+- SSE 최대 유지 시간: 연결 시작부터 SSE_MAX_DURATION이 지나면 이벤트가 계속 오더라도 업스트림을 닫고 종료
+- 배압: 한 방향에 메시지 하나씩만 전달 중이도록 하고 상대 쪽 send가 끝나야 다음을 읽는다
+  (클라이언트가 느리면 업스트림 읽기가 멈추고 TCP 흐름 제어로 업스트림에도 전파됨).
+- 사용자별 동시 연결 수 제한: STREAM_MAX_CONNECTIONS_PER_USER (게이트웨이 레플리카별 계수)
+"""
+import os
+import time
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+try:
+    from websockets.asyncio.client import connect as websocket_connect
+    from websockets.exceptions import ConnectionClosed, InvalidHandshake
+except ImportError:  # 선택 의존성 (없으면 WebSocket 프록시 비활성화)
+    websocket_connect = None
+
+from app.domain.model.service_type import ServiceType, SERVICE_TIMEOUTS
+from app.domain.model.service_factory import ServiceProxyFactory
+from app.foundation.load_balancer import get_load_balancer
+from app.foundation.proxy_response import create_streaming_response, forwardable_headers
+
+load_dotenv()
+
+logger = logging.getLogger("gateway-api")
+
+STREAM_MAX_CONNECTIONS_PER_USER = int(os.getenv("STREAM_MAX_CONNECTIONS_PER_USER", "3"))
+# SSE: 이벤트 사이 최대 간격(초)과 연결 최대 유지 시간(초)
+SSE_IDLE_TIMEOUT = float(os.getenv("SSE_IDLE_TIMEOUT", "60"))
+SSE_MAX_DURATION = float(os.getenv("SSE_MAX_DURATION", "3600"))
+# WebSocket: 양방향 무통신 최대 시간(초), 최대 메시지 크기(바이트), 업스트림 수신 대기열 길이(메시지 수)
+WS_IDLE_TIMEOUT = float(os.getenv("WS_IDLE_TIMEOUT", "120"))
+WS_MAX_MESSAGE_BYTES = int(os.getenv("WS_MAX_MESSAGE_BYTES", str(1024 * 1024)))
+WS_MAX_QUEUE = int(os.getenv("WS_MAX_QUEUE", "16"))
+# WebSocket 업그레이드를 중계할 서비스 (쉼표 구분 ServiceType 값)
+WEBSOCKET_SERVICES = {
+    value.strip() for value in os.getenv("WEBSOCKET_SERVICES", "chatbot").split(",") if value.strip()
+}
+# WebSocket 업스트림으로 전달하는 핸드셰이크 헤더
+WS_FORWARDED_HEADERS = ("x-user-id", "authorization", "cookie", "accept-language", "x-request-id")
+
+# WebSocket 종료 코드
+WS_CLOSE_NORMAL = 1000
+WS_CLOSE_GOING_AWAY = 1001
+WS_CLOSE_POLICY_VIOLATION = 1008
+WS_CLOSE_MESSAGE_TOO_BIG = 1009
+WS_CLOSE_INTERNAL_ERROR = 1011
+WS_CLOSE_TRY_AGAIN_LATER = 1013
+
+
+class ConnectionTracker:
+    """사용자별 장시간 연결(SSE/WebSocket) 수 제한"""
+
+    def __init__(self, max_per_user: int = STREAM_MAX_CONNECTIONS_PER_USER):
+        self.max_per_user = max_per_user
+        self._connections: Dict[str, int] = {}
+        self.opened = {"sse": 0, "websocket": 0}
+        self.rejected = 0
+        self.idle_timeouts = 0
+        self.max_duration_closes = 0
+
+    def acquire(self, user_id: Optional[str], kind: str) -> bool:
+        if user_id is not None:
+            if self._connections.get(user_id, 0) >= self.max_per_user:
+                self.rejected += 1
+                return False
+            self._connections[user_id] = self._connections.get(user_id, 0) + 1
+        self.opened[kind] += 1
+        return True
+
+    def release(self, user_id: Optional[str]):
+        if user_id is None:
+            return
+        remaining = self._connections.get(user_id, 0) - 1
+        if remaining > 0:
+            self._connections[user_id] = remaining
+        else:
+            self._connections.pop(user_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_per_user": self.max_per_user,
+            "active": sum(self._connections.values()),
+            "active_users": len(self._connections),
+            "opened": dict(self.opened),
+            "rejected": self.rejected,
+            "idle_timeouts": self.idle_timeouts,
+            "max_duration_closes": self.max_duration_closes,
+            "websocket_enabled": websocket_connect is not None,
+            "websocket_services": sorted(WEBSOCKET_SERVICES),
+        }
+
+
+def wants_event_stream(request: Request) -> bool:
+    """클라이언트가 SSE 응답을 요청했는지 확인"""
+    return "text/event-stream" in request.headers.get("accept", "").lower()
+
+
+def _too_many_connections() -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"detail": f"동시 스트리밍 연결은 사용자당 최대 {STREAM_MAX_CONNECTIONS_PER_USER}개입니다."},
+        headers={"retry-after": "5"},
+    )
+
+
+async def proxy_event_stream(
+    factory: ServiceProxyFactory, request: Request, method: str, path: str, headers: dict, body: Optional[bytes] = None
+) -> Response:
+    """업스트림 SSE 응답을 이벤트가 도착하는 대로 전달"""
+    tracker = get_connection_tracker()
+    user_id = request.headers.get("x-user-id")
+    if not tracker.acquire(user_id, "sse"):
+        return _too_many_connections()
+
+    released = False
+    # 연결 최대 유지 시간 (httpx 타임아웃은 이벤트 사이 간격에만 적용되므로 relay에서 직접 확인)
+    deadline = time.monotonic() + SSE_MAX_DURATION
+
+    def release():
+        nonlocal released
+        if not released:
+            released = True
+            tracker.release(user_id)
+
+    try:
+        upstream = await factory.stream(
+            method=method,
+            path=path,
+            headers=headers,
+            body=body,
+            params=request.query_params.multi_items() or None,
+            timeout=SSE_MAX_DURATION,
+            idle_timeout=SSE_IDLE_TIMEOUT,
+        )
+    except BaseException:
+        release()
+        raise
+
+    content_type = upstream.headers.get("content-type", "")
+    if upstream.is_stream_consumed or not content_type.startswith("text/event-stream"):
+        # 오류 응답이나 일반 응답은 기존 방식대로 전달
+        release()
+        return create_streaming_response(upstream)
+
+    async def relay():
+        chunks = upstream.aiter_raw()
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=remaining)
+                except StopAsyncIteration:
+                    break
+                yield chunk
+        except httpx.ReadTimeout:
+            tracker.idle_timeouts += 1
+            logger.info(f"⏱️ SSE 유휴 시간 초과로 연결 종료: {request.url.path}")
+        except asyncio.TimeoutError:
+            tracker.max_duration_closes += 1
+            logger.info(f"⏱️ SSE 최대 유지 시간({SSE_MAX_DURATION:.0f}초) 초과로 연결 종료: {request.url.path}")
+        except httpx.HTTPError as e:
+            logger.warning(f"⚠️ SSE 업스트림 스트림 중단: {request.url.path}, {str(e)}")
+        finally:
+            await upstream.aclose()
+            release()
+
+    async def cleanup():
+        # 스트림이 시작되기 전에 클라이언트가 끊긴 경우에도 커넥션과 연결 수 반환
+        await upstream.aclose()
+        release()
+
+    response = StreamingResponse(relay(), status_code=upstream.status_code, background=BackgroundTask(cleanup))
+    response.raw_headers.extend(
+        (name, value) for name, value in forwardable_headers(upstream.headers.raw) if name != b"content-length"
+    )
+    if "cache-control" not in upstream.headers:
+        response.raw_headers.append((b"cache-control", b"no-cache"))
+    # 앞단 nginx 등이 응답을 모아서 보내지 않도록
+    response.raw_headers.append((b"x-accel-buffering", b"no"))
+    return response
+
+
+def _upstream_websocket_url(service: ServiceType, path: str, websocket: WebSocket) -> str:
+    user_id = websocket.headers.get("x-user-id")
+    base_url = get_load_balancer(service).pick(user_id).url
+    if base_url.startswith("https://"):
+        base_url = "wss://" + base_url[len("https://"):]
+    elif base_url.startswith("http://"):
+        base_url = "ws://" + base_url[len("http://"):]
+    query = websocket.scope.get("query_string", b"").decode("latin-1")
+    return f"{base_url}/{path}" + (f"?{query}" if query else "")
+
+
+async def _relay_websocket(websocket: WebSocket, upstream, tracker: "ConnectionTracker"):
+    """양방향 메시지 릴레이 (한쪽이 닫히거나 유휴 시간을 넘기면 종료)"""
+    last_activity = time.monotonic()
+
+    async def client_to_upstream():
+        nonlocal last_activity
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return "client_closed"
+            data = message.get("text")
+            if data is None:
+                data = message.get("bytes")
+            if data is None:
+                continue
+            if len(data) > WS_MAX_MESSAGE_BYTES:
+                return "too_big"
+            last_activity = time.monotonic()
+            await upstream.send(data)
+
+    async def upstream_to_client():
+        nonlocal last_activity
+        try:
+            async for data in upstream:
+                last_activity = time.monotonic()
+                if isinstance(data, str):
+                    await websocket.send_text(data)
+                else:
+                    await websocket.send_bytes(data)
+        except ConnectionClosed:
+            pass
+        return "upstream_closed"
+
+    async def idle_watchdog():
+        while True:
+            remaining = last_activity + WS_IDLE_TIMEOUT - time.monotonic()
+            if remaining <= 0:
+                return "idle"
+            await asyncio.sleep(remaining)
+
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in (client_to_upstream(), upstream_to_client(), idle_watchdog())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    finished = next(iter(done))
+    try:
+        reason = finished.result()
+    except (WebSocketDisconnect, ConnectionClosed):
+        reason = "client_closed"
+
+    if reason == "client_closed":
+        return
+    if reason == "idle":
+        tracker.idle_timeouts += 1
+        await websocket.close(code=WS_CLOSE_GOING_AWAY, reason="idle timeout")
+    elif reason == "too_big":
+        await websocket.close(code=WS_CLOSE_MESSAGE_TOO_BIG)
+    else:
+        await websocket.close(code=upstream.close_code or WS_CLOSE_NORMAL)
+
+
+async def proxy_websocket(websocket: WebSocket, service: ServiceType, path: str):
+    """설정된 서비스로 WebSocket 연결 중계 (핸드셰이크 전에 거부하면 클라이언트는 403을 받음)"""
+    if websocket_connect is None or service.value not in WEBSOCKET_SERVICES:
+        await websocket.close(code=WS_CLOSE_POLICY_VIOLATION)
+        return
+
+    tracker = get_connection_tracker()
+    user_id = websocket.headers.get("x-user-id")
+    if not tracker.acquire(user_id, "websocket"):
+        await websocket.close(code=WS_CLOSE_TRY_AGAIN_LATER)
+        return
+
+    url = _upstream_websocket_url(service, path, websocket)
+    headers = {name: websocket.headers[name] for name in WS_FORWARDED_HEADERS if name in websocket.headers}
+    accepted = False
+    try:
+        async with websocket_connect(
+            url,
+            additional_headers=headers,
+            subprotocols=websocket.scope.get("subprotocols") or None,
+            open_timeout=SERVICE_TIMEOUTS.get(service, 30.0),
+            max_size=WS_MAX_MESSAGE_BYTES,
+            max_queue=WS_MAX_QUEUE,
+        ) as upstream:
+            await websocket.accept(subprotocol=upstream.subprotocol)
+            accepted = True
+            logger.info(f"🔌 WebSocket 중계 시작: service={service.value}, path={path}")
+            await _relay_websocket(websocket, upstream, tracker)
+    except (OSError, asyncio.TimeoutError, InvalidHandshake) as e:
+        logger.warning(f"⚠️ WebSocket 업스트림 연결 실패: service={service.value}, path={path}, {str(e)}")
+        if not accepted:
+            await websocket.close(code=WS_CLOSE_INTERNAL_ERROR)
+    finally:
+        tracker.release(user_id)
+
+
+_connection_tracker = ConnectionTracker()
+
+# 어디서든 이 함수를 호출하여 프로세스 공용 장시간 연결 추적기를 가져올 수 있음
+def get_connection_tracker() -> ConnectionTracker:
+    return _connection_tracker
@@ -0,0 +1,186 @@
+"""
+토큰 블랙리스트 로컬 캐시
+로그아웃으로 무효화된 토큰(jti)을 프로세스 메모리에 보관하여
+요청마다 Redis에 blacklist:{jti} 존재 여부를 묻지 않도록 한다.
+
+- 시작 시 Redis의 blacklist:* 키로 초기 적재(warm-up)
+- auth-service가 로그아웃 시 발행하는 pub/sub 채널로 실시간 갱신
+- 구독이 끊긴 동안에는 기존 방식(요청마다 Redis 확인)으로 폴백
+- 누락된 메시지에 대비해 주기적으로 전체 재동기화
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+from dotenv import load_dotenv
+
+from app.foundation.redis_client import get_redis_client
+
+load_dotenv()
+
+logger = logging.getLogger("gateway-api")
+
+# auth-service와 공유하는 블랙리스트 채널 / 키 접두사
+TOKEN_BLACKLIST_CHANNEL = os.getenv("TOKEN_BLACKLIST_CHANNEL", "auth:token-blacklist")
+BLACKLIST_KEY_PREFIX = "blacklist:"
+# 전체 재동기화 주기(초)
+BLACKLIST_RESYNC_INTERVAL = float(os.getenv("BLACKLIST_RESYNC_INTERVAL", "60"))
+# 구독 재연결 대기(초)
+BLACKLIST_RECONNECT_DELAY = float(os.getenv("BLACKLIST_RECONNECT_DELAY", "1"))
+BLACKLIST_RECONNECT_MAX_DELAY = float(os.getenv("BLACKLIST_RECONNECT_MAX_DELAY", "30"))
+
+
+class TokenRevocationCache:
+    """jti → 만료 시각(epoch) 로컬 무효화 집합"""
+
+    def __init__(self, channel: str = TOKEN_BLACKLIST_CHANNEL):
+        self.channel = channel
+        self._revoked: Dict[str, float] = {}
+        self._live = False
+        self._task: Optional[asyncio.Task] = None
+        self.local_checks = 0
+        self.local_hits = 0
+        self.fallback_checks = 0
+        self.messages = 0
+        self.resyncs = 0
+
+    @property
+    def is_live(self) -> bool:
+        """구독이 살아 있고 초기 적재가 끝나 로컬 집합을 신뢰할 수 있는지 여부"""
+        return self._live
+
+    def add(self, jti: str, expires_at: Optional[float] = None):
+        """무효화된 jti 추가 (만료 시각이 없으면 재동기화 전까지 유지)"""
+        self._revoked[jti] = expires_at if expires_at is not None else float("inf")
+
+    def _is_revoked_locally(self, jti: str) -> bool:
+        expires_at = self._revoked.get(jti)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            # 토큰 자체가 만료되었으므로 더 이상 보관할 필요 없음
+            del self._revoked[jti]
+            return False
+        return True
+
+    async def is_revoked(self, jti: str) -> bool:
+        """
+        토큰 무효화 여부 확인
+        구독이 살아 있으면 로컬 집합만 확인하고, 끊겨 있으면 Redis에 직접 확인한다.
+        """
+        if self._live:
+            self.local_checks += 1
+            revoked = self._is_revoked_locally(jti)
+            if revoked:
+                self.local_hits += 1
+            return revoked
+
+        self.fallback_checks += 1
+        redis_client = get_redis_client()
+        return bool(await redis_client.exists(f"{BLACKLIST_KEY_PREFIX}{jti}"))
+
+    async def _load_snapshot(self, redis_client):
+        """Redis의 blacklist:* 키 전체를 읽어 로컬 집합을 교체"""
+        now = time.time()
+        snapshot: Dict[str, float] = {}
+        keys = [key async for key in redis_client.scan_iter(match=f"{BLACKLIST_KEY_PREFIX}*", count=1000)]
+        if keys:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.pttl(key)
+                ttls = await pipe.execute()
+            for key, ttl in zip(keys, ttls):
+                jti = key[len(BLACKLIST_KEY_PREFIX):]
+                if ttl is None or ttl == -2:
+                    continue  # 그 사이 만료됨
+                snapshot[jti] = float("inf") if ttl == -1 else now + ttl / 1000
+        self._revoked = snapshot
+        self.resyncs += 1
+        logger.info(f"🔄 토큰 블랙리스트 동기화 완료: {len(snapshot)}건")
+
+    def _apply_message(self, data: str):
+        """pub/sub 메시지 반영 ({"jti": ..., "exp": ...})"""
+        try:
+            payload = json.loads(data)
+            jti = payload.get("jti")
+            exp = payload.get("exp")
+        except (ValueError, AttributeError):
+            jti, exp = data, None
+        if jti:
+            self.add(jti, float(exp) if isinstance(exp, (int, float)) else None)
+            self.messages += 1
+
+    async def _run(self):
+        """구독 루프 - 연결이 끊기면 폴백 모드로 전환 후 재연결"""
+        delay = BLACKLIST_RECONNECT_DELAY
+        while True:
+            pubsub = None
+            try:
+                redis_client = get_redis_client()
+                pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+                # 구독을 먼저 시작한 뒤 적재해야 그 사이의 로그아웃을 놓치지 않음
+                await pubsub.subscribe(self.channel)
+                await self._load_snapshot(redis_client)
+                self._live = True
+                delay = BLACKLIST_RECONNECT_DELAY
+                logger.info(f"📡 토큰 블랙리스트 구독 시작: channel={self.channel}")
+
+                next_resync = time.monotonic() + BLACKLIST_RESYNC_INTERVAL
+                while True:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self._apply_message(message["data"])
+                    if time.monotonic() >= next_resync:
+                        await self._load_snapshot(redis_client)
+                        next_resync = time.monotonic() + BLACKLIST_RESYNC_INTERVAL
+            except asyncio.CancelledError:
+                self._live = False
+                raise
+            except Exception as e:
+                self._live = False
+                logger.warning(f"⚠️ 토큰 블랙리스트 구독 중단, 요청별 Redis 확인으로 폴백: {str(e)}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, BLACKLIST_RECONNECT_MAX_DELAY)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+    async def start(self):
+        """백그라운드 구독 태스크 시작"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """백그라운드 구독 태스크 종료"""
+        self._live = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """로컬 캐시 상태 및 적중 카운터"""
+        return {
+            "live": self._live,
+            "size": len(self._revoked),
+            "local_checks": self.local_checks,
+            "local_hits": self.local_hits,
+            "fallback_checks": self.fallback_checks,
+            "messages": self.messages,
+            "resyncs": self.resyncs,
+        }
+
+
+_revocation_cache = TokenRevocationCache()
+
+# 어디서든 이 함수를 호출하여 프로세스 공용 토큰 무효화 캐시를 가져올 수 있음
+def get_revocation_cache() -> TokenRevocationCache:
+    return _revocation_cache
@@ -0,0 +1,178 @@
+"""
+multipart 업로드 스트리밍 전달
+클라이언트가 보낸 multipart/form-data 본문을 파싱/재구성하지 않고 읽은 만큼 업스트림으로 전달한다
+(게이트웨이 메모리 사용량은 업로드 크기와 무관하게 ASGI 청크 몇 개 수준).
+
+- 본문을 읽기 전에 Content-Type(multipart, boundary)과 Content-Length를 확인한다 (415 / 413).
+- 첫 파일 파트의 헤더가 나올 때까지만(최대 UPLOAD_PEEK_BYTES) 먼저 읽어 파일 형식을 확인한다 (415).
+  파일 형식 제한은 UPLOAD_FILE_TYPE_SERVICES의 서비스로 가는 업로드에만 적용한다.
+- 전송 중 누적 크기가 UPLOAD_MAX_BYTES를 넘으면 전송을 중단한다 (Content-Length 없이 chunked로 올라온 경우).
+"""
+import os
+import re
+import logging
+from typing import AsyncIterator, List, Optional, Tuple
+from dotenv import load_dotenv
+from starlette.requests import Request
+
+load_dotenv()
+
+logger = logging.getLogger("gateway-api")
+
+# 업로드 최대 크기(바이트)
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(512 * 1024 * 1024)))
+# 파일 형식 확인을 위해 먼저 읽는 최대 크기(바이트)
+UPLOAD_PEEK_BYTES = int(os.getenv("UPLOAD_PEEK_BYTES", str(64 * 1024)))
+# 파일 형식 제한(아래 허용 목록)을 적용할 서비스 (ServiceType 값, 쉼표 구분)
+UPLOAD_FILE_TYPE_SERVICES = {
+    service.strip() for service in os.getenv("UPLOAD_FILE_TYPE_SERVICES", "climate").split(",") if service.strip()
+}
+# 허용하는 파일 파트 content-type과 확장자 (둘 중 하나만 맞으면 허용, 쉼표 구분)
+UPLOAD_ALLOWED_CONTENT_TYPES = {
+    content_type.strip().lower()
+    for content_type in os.getenv(
+        "UPLOAD_ALLOWED_CONTENT_TYPES",
+        "text/csv,application/csv,text/plain,application/vnd.ms-excel,"
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ).split(",")
+    if content_type.strip()
+}
+UPLOAD_ALLOWED_EXTENSIONS = {
+    extension.strip().lower()
+    for extension in os.getenv("UPLOAD_ALLOWED_EXTENSIONS", ".csv,.xlsx,.xls").split(",")
+    if extension.strip()
+}
+
+_BOUNDARY_PATTERN = re.compile(r'boundary="?([^";]+)"?', re.IGNORECASE)
+_FILENAME_PATTERN = re.compile(rb'filename="([^"]*)"', re.IGNORECASE)
+
+
+class UploadRejected(Exception):
+    """업로드 요청 거부 (status_code와 사용자에게 보여줄 메시지)"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def is_multipart(request: Request) -> bool:
+    return request.headers.get("content-type", "").lower().startswith("multipart/form-data")
+
+
+def _parse_part_headers(raw_headers: bytes) -> Tuple[Optional[str], Optional[str]]:
+    """파트 헤더에서 (파일명, content-type) 추출 - 파일 파트가 아니면 파일명은 None"""
+    filename = None
+    content_type = None
+    for line in raw_headers.split(b"\r\n"):
+        name, _, value = line.partition(b":")
+        name = name.strip().lower()
+        if name == b"content-disposition":
+            match = _FILENAME_PATTERN.search(value)
+            if match:
+                filename = match.group(1).decode("utf-8", errors="replace")
+        elif name == b"content-type":
+            content_type = value.strip().split(b";")[0].decode("latin-1").lower()
+    return filename, content_type
+
+
+class StreamingUpload:
+    """
+    multipart 요청 본문을 그대로 업스트림에 전달하는 비동기 이터러블 (httpx content로 사용)
+    전송 중 최대 크기를 넘으면 error에 UploadRejected를 남기고 전송을 중단한다.
+    """
+
+    def __init__(self, request: Request, max_bytes: int = UPLOAD_MAX_BYTES):
+        self.request = request
+        self.max_bytes = max_bytes
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.size = 0
+        self.error: Optional[UploadRejected] = None
+        self._prefix: List[bytes] = []
+        self._chunks: Optional[AsyncIterator[bytes]] = None
+        self._boundary: Optional[bytes] = None
+
+    def check_headers(self):
+        """본문을 읽기 전에 요청 헤더만으로 확인"""
+        content_type = self.request.headers.get("content-type", "")
+        match = _BOUNDARY_PATTERN.search(content_type)
+        if not content_type.lower().startswith("multipart/form-data") or not match:
+            raise UploadRejected(415, "파일 업로드는 multipart/form-data 형식이어야 합니다.")
+        self._boundary = match.group(1).encode("latin-1")
+
+        content_length = self.request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_bytes:
+            raise UploadRejected(413, f"업로드 최대 크기({self.max_bytes // (1024 * 1024)}MB)를 초과했습니다.")
+
+    def _count(self, chunk: bytes):
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            self.error = UploadRejected(413, f"업로드 최대 크기({self.max_bytes // (1024 * 1024)}MB)를 초과했습니다.")
+            raise self.error
+
+    def _find_file_part(self, buffer: bytes) -> Optional[bool]:
+        """먼저 읽은 본문에서 첫 파일 파트를 찾음. True: 찾음 / False: 파일 없이 끝남 / None: 더 읽어야 함"""
+        delimiter = b"--" + self._boundary
+        position = 0
+        while True:
+            start = buffer.find(delimiter, position)
+            if start < 0:
+                return None
+            after = start + len(delimiter)
+            if buffer[after:after + 2] == b"--":
+                return False  # 마지막 경계
+            headers_end = buffer.find(b"\r\n\r\n", after)
+            if headers_end < 0:
+                return None
+            filename, content_type = _parse_part_headers(buffer[after:headers_end])
+            if filename is not None:
+                self.filename, self.content_type = filename, content_type
+                return True
+            position = headers_end + 4
+
+    def _check_file_type(self):
+        extension = os.path.splitext(self.filename or "")[1].lower()
+        if extension in UPLOAD_ALLOWED_EXTENSIONS or (self.content_type or "") in UPLOAD_ALLOWED_CONTENT_TYPES:
+            return
+        raise UploadRejected(
+            415, f"허용되지 않는 파일 형식입니다: {self.filename} ({self.content_type or '알 수 없음'})"
+        )
+
+    async def prepare(self, require_file: bool = False, check_file_type: bool = True):
+        """
+        첫 파일 파트 헤더까지만 읽어 파일 형식을 확인 (나머지 본문은 업스트림 전송 시 읽음)
+        check_file_type: False면 파일 형식 허용 목록을 적용하지 않음 (크기 제한만 적용)
+        """
+        self.check_headers()
+        self._chunks = self.request.stream().__aiter__()
+        peeked = 0
+        found: Optional[bool] = None
+        while found is None and peeked < UPLOAD_PEEK_BYTES:
+            try:
+                chunk = await self._chunks.__anext__()
+            except StopAsyncIteration:
+                found = self._find_file_part(b"".join(self._prefix)) or False
+                break
+            if not chunk:
+                continue
+            self._count(chunk)
+            self._prefix.append(chunk)
+            peeked += len(chunk)
+            found = self._find_file_part(b"".join(self._prefix))
+
+        if found and check_file_type:
+            self._check_file_type()
+        elif found is False and require_file:
+            raise UploadRejected(400, "파일 업로드가 필요합니다.")
+
+    async def __aiter__(self):
+        for chunk in self._prefix:
+            yield chunk
+        self._prefix = []
+        if self._chunks is None:
+            self._chunks = self.request.stream().__aiter__()
+        async for chunk in self._chunks:
+            if chunk:
+                self._count(chunk)
+                yield chunk
@@ -1,11 +1,12 @@
 # gateway.py
+import hmac
 import json
 import os
 import logging
 import sys
-from fastapi import APIRouter, FastAPI, Request, UploadFile, File, Query, HTTPException, Form, Depends
+from fastapi import APIRouter, FastAPI, Request, File, Query, HTTPException, Form, Depends, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
 from typing import List, Optional, Dict, Any
@@ -13,7 +14,21 @@ from typing import List, Optional, Dict, Any
 from app.domain.model.service_type import ServiceType
 from app.domain.model.service_factory import ServiceProxyFactory
 from app.api.auth_proxy_router import auth_proxy_router
+from app.api.admin_router import admin_router
+from app.api.batch_router import batch_router
 from app.foundation.jwt_auth_middleware import AuthMiddleware
+from app.foundation.rate_limiter import RateLimitMiddleware
+from app.foundation.idempotency import IdempotencyMiddleware
+from app.foundation.metrics import MetricsMiddleware, render_metrics
+from app.foundation.compression import CompressionMiddleware
+from app.foundation.request_deadline import ClientDisconnected, cancel_on_disconnect
+from app.foundation.upload_stream import UPLOAD_FILE_TYPE_SERVICES, StreamingUpload, UploadRejected, is_multipart
+from app.foundation.stream_proxy import proxy_event_stream, proxy_websocket, wants_event_stream
+from app.foundation.http_client_pool import UpstreamClientPool
+from app.foundation.proxy_response import create_streaming_response
+from app.foundation.response_cache import get_response_cache
+from app.foundation.request_coalescer import get_request_coalescer
+from app.foundation.token_revocation_cache import get_revocation_cache
 
 # ✅ 로깅 설정
 logging.basicConfig(
@@ -35,7 +50,13 @@ AUTH_SERVICE_URL = os.getenv("AUTH_SERVICE_URL", "http://auth:8084")
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("🚀 Gateway API 서비스 시작")
+    # 서비스별 업스트림 커넥션 풀 생성
+    await UpstreamClientPool.startup()
+    # 토큰 블랙리스트 로컬 캐시 구독 시작
+    await get_revocation_cache().start()
     yield
+    await get_revocation_cache().stop()
+    await UpstreamClientPool.shutdown()
     logger.info("🛑 Gateway API 서비스 종료")
 
 # ✅ FastAPI 앱 생성 
@@ -57,17 +78,43 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ✅ 사용자별 속도/동시 요청 제한 (AuthMiddleware가 주입한 x-user-id 사용 - 인증 미들웨어보다 먼저 추가해야 안쪽에 배치됨)
+app.add_middleware(RateLimitMiddleware)
+
+# ✅ Idempotency-Key 중복 실행 방지 (인증 미들웨어 안쪽, 속도 제한 바깥쪽 - 재생된 응답은 토큰을 소비하지 않음)
+app.add_middleware(IdempotencyMiddleware)
+
 # ✅ JWT 인증 미들웨어 추가
 app.add_middleware(AuthMiddleware)
 
+# ✅ 응답 압축 (gzip/brotli, 청크 단위 스트리밍 압축)
+app.add_middleware(CompressionMiddleware)
+
+# ✅ 요청 메트릭/Server-Timing (인증 시간까지 재도록 가장 바깥쪽에 배치)
+app.add_middleware(MetricsMiddleware)
+
 # ✅ Google OAuth 프록시 라우터 포함 (동적 라우팅보다 먼저)
 app.include_router(auth_proxy_router, prefix="/auth", tags=["Auth Proxy"])
 
+# ✅ 게이트웨이 관리 라우터 포함 (JWT 대신 X-Admin-Token으로 보호)
+app.include_router(admin_router, prefix="/admin", tags=["Gateway Admin"])
+
+# ✅ 배치 라우터 포함 (동적 라우팅보다 먼저, JWT 적용)
+app.include_router(batch_router, prefix="/api", tags=["Batch"])
+
 # ✅ 메인 라우터 생성
 gateway_router = APIRouter(prefix="/api", tags=["gateway"])
 
-# ✅ 파일이 필요한 서비스 목록 (현재는 없음)
-FILE_REQUIRED_SERVICES = set()
+# ✅ 파일이 필요한 서비스 목록 (경로에 upload가 포함된 요청은 multipart 파일 파트가 있어야 함)
+FILE_REQUIRED_SERVICES = {ServiceType.CLIMATE}
+
+# ✅ 프록시 응답 모드
+# - stream: 업스트림 바이트를 파싱 없이 그대로 전달 (상태 코드/헤더 보존, PDF 등 비JSON 응답 지원)
+# - buffered: 업스트림 JSON을 파싱 후 재직렬화 (기존 방식)
+GATEWAY_PROXY_MODE = os.getenv("GATEWAY_PROXY_MODE", "stream").lower()
+
+# ✅ 클라이언트가 먼저 연결을 끊은 요청의 상태 코드 (메트릭 집계용, 실제로 전달되지는 않음)
+CLIENT_CLOSED_REQUEST = 499
 
 # ✅ 유틸리티 함수: 요청 처리 결과 반환
 def create_response(response):
@@ -79,9 +126,12 @@ def create_response(response):
                 status_code=response.status_code
             )
         else:
+            # 서킷 차단(503) 시 Retry-After 유지
+            retry_after = response.headers.get("retry-after")
             return JSONResponse(
                 content={"detail": f"Service error: {response.text}"},
-                status_code=response.status_code
+                status_code=response.status_code,
+                headers={"retry-after": retry_after} if retry_after else None
             )
     except json.JSONDecodeError:
         return JSONResponse(
@@ -95,6 +145,26 @@ def create_response(response):
             status_code=500
         )
 
+async def send_proxy_request(factory: ServiceProxyFactory, request: Request, watch_disconnect: bool = True, **kwargs):
+    """
+    프록시 모드에 따라 업스트림 요청을 보내고 응답을 생성
+    watch_disconnect: 요청 본문을 업스트림으로 스트리밍하는 경우 False (본문 수신과 연결 종료 감시가 겹치지 않도록)
+    """
+    guard = (lambda awaitable: cancel_on_disconnect(request, awaitable)) if watch_disconnect else (lambda awaitable: awaitable)
+    try:
+        if GATEWAY_PROXY_MODE == "buffered":
+            response = await guard(factory.request(**kwargs))
+            return create_response(response)
+
+        # 쿼리 스트링도 그대로 전달
+        if kwargs.get("params") is None and request.query_params:
+            kwargs["params"] = request.query_params.multi_items()
+        # 클라이언트가 응답을 기다리다 연결을 끊으면 업스트림 호출도 취소
+        response = await guard(factory.stream(**kwargs))
+        return create_streaming_response(response)
+    except ClientDisconnected:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+
 # GET - 일반 동적 라우팅 (JWT 적용)
 @gateway_router.get("/{service}/{path:path}", summary="GET 프록시")
 async def proxy_get(
@@ -108,12 +178,47 @@ async def proxy_get(
         # 헤더 전달 (JWT 및 사용자 ID - 미들웨어에서 이미 X-User-Id 헤더가 추가됨)
         headers = dict(request.headers)
         
-        response = await factory.request(
-            method="GET",
-            path=path,
-            headers=headers
-        )
-        return create_response(response)
+        # SSE는 병합/캐시 없이 이벤트가 도착하는 대로 전달
+        if wants_event_stream(request):
+            return await proxy_event_stream(factory, request, method="GET", path=path, headers=headers)
+        
+        if GATEWAY_PROXY_MODE == "buffered":
+            return await send_proxy_request(
+                factory,
+                request,
+                method="GET",
+                path=path,
+                headers=headers
+            )
+        
+        # 동시에 들어온 동일 GET은 업스트림 호출 하나를 공유
+        coalescer = get_request_coalescer()
+        
+        def fetch(header_overrides: Optional[Dict[str, Optional[str]]] = None):
+            # 응답 캐시의 조건부 요청 등 헤더를 바꿔 보낼 때는 바꾼 헤더 기준으로 병합
+            upstream_headers = dict(headers)
+            for name, value in (header_overrides or {}).items():
+                upstream_headers.pop(name, None)
+                if value is not None:
+                    upstream_headers[name] = value
+            return cancel_on_disconnect(request, coalescer.run(
+                coalescer.key(service.value, path, request.url.query, upstream_headers),
+                lambda: factory.stream(
+                    method="GET",
+                    path=path,
+                    headers=upstream_headers,
+                    params=request.query_params.multi_items() or None
+                )
+            ))
+        
+        # 공유 응답 캐시 대상 경로 (공개 마스터 데이터 등)
+        response_cache = get_response_cache()
+        if response_cache.matches("GET", request.url.path):
+            return await response_cache.serve(request, fetch)
+        
+        return create_streaming_response(await fetch())
+    except ClientDisconnected:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
     except Exception as e:
         logger.error(f"Error in GET proxy: {str(e)}")
         return JSONResponse(
@@ -127,14 +232,11 @@ async def proxy_post(
     service: ServiceType, 
     path: str,
     request: Request,
-    file: Optional[UploadFile] = None,
     sheet_names: Optional[List[str]] = Query(None, alias="sheet_name")
 ):
     try:
         # 로깅
         logger.info(f"🌈 POST 요청 받음: 서비스={service}, 경로={path}")
-        if file:
-            logger.info(f"파일명: {file.filename}, 시트 이름: {sheet_names if sheet_names else '없음'}")
 
         # 서비스 팩토리 생성
         factory = ServiceProxyFactory(service_type=service)
@@ -148,37 +250,58 @@ async def proxy_post(
         # 헤더 전달 (JWT 및 사용자 ID - 미들웨어에서 이미 X-User-Id 헤더가 추가됨)
         headers = dict(request.headers)
         
-        # 파일이 필요한 서비스 처리
-        if service in FILE_REQUIRED_SERVICES:
-            # 파일이 필요한 서비스인 경우
-            
-            # 서비스 URI가 upload인 경우만 파일 체크
-            if "upload" in path and not file:
-                raise HTTPException(status_code=400, detail=f"서비스 {service}에는 파일 업로드가 필요합니다.")
-            
-            # 파일이 제공된 경우 처리
-            if file:
-                file_content = await file.read()
-                files = {'file': (file.filename, file_content, file.content_type)}
-                
-                # 파일 위치 되돌리기 (다른 코드에서 다시 읽을 수 있도록)
-                await file.seek(0)
-            
+        # 서비스 URI가 upload인 경우 파일 필수
+        require_file = service in FILE_REQUIRED_SERVICES and "upload" in path
+
+        if is_multipart(request):
+            # 파일 업로드는 multipart 본문을 메모리에 모으지 않고 읽은 만큼 업스트림으로 전달
+            # (content-type의 boundary를 그대로 유지하므로 업스트림이 원본 그대로 파싱)
+            upload = StreamingUpload(request)
+            await upload.prepare(
+                require_file=require_file,
+                check_file_type=service.value in UPLOAD_FILE_TYPE_SERVICES
+            )
+            logger.info(f"파일명: {upload.filename}, 시트 이름: {sheet_names if sheet_names else '없음'}")
+
             # 시트 이름이 제공된 경우 처리
             if sheet_names:
                 params = {'sheet_name': sheet_names}
-        else:
-            # 일반 서비스 처리 (body JSON 전달)
-            try:
-                body = await request.body()
-                if not body:
-                    # body가 비어있는 경우도 허용
-                    logger.info("요청 본문이 비어 있습니다.")
-            except Exception as e:
-                logger.warning(f"요청 본문 읽기 실패: {str(e)}")
+
+            response = await send_proxy_request(
+                factory,
+                request,
+                watch_disconnect=False,
+                method="POST",
+                path=path,
+                headers=headers,
+                body=upload,
+                params=params
+            )
+            if upload.error is not None:
+                raise upload.error
+            logger.info(f"업로드 전달 완료: {upload.filename}, {upload.size} bytes")
+            return response
+
+        if require_file:
+            raise HTTPException(status_code=400, detail=f"서비스 {service}에는 파일 업로드가 필요합니다.")
+
+        # 일반 서비스 처리 (body JSON 전달)
+        try:
+            body = await request.body()
+            if not body:
+                # body가 비어있는 경우도 허용
+                logger.info("요청 본문이 비어 있습니다.")
+        except Exception as e:
+            logger.warning(f"요청 본문 읽기 실패: {str(e)}")
+
+        # 챗봇 응답 등 점진적으로 생성되는 결과를 SSE로 요청한 경우
+        if wants_event_stream(request):
+            return await proxy_event_stream(factory, request, method="POST", path=path, headers=headers, body=body)
                 
-        # 서비스에 요청 전달
-        response = await factory.request(
+        # 서비스에 요청 전달 및 응답 반환
+        return await send_proxy_request(
+            factory,
+            request,
             method="POST",
             path=path,
             headers=headers,
@@ -188,15 +311,18 @@ async def proxy_post(
             data=data
         )
         
-        # 응답 처리 및 반환
-        return create_response(response)
-        
     except HTTPException as he:
         # HTTP 예외는 그대로 반환
         return JSONResponse(
             content={"detail": he.detail},
             status_code=he.status_code
         )
+    except UploadRejected as ur:
+        logger.warning(f"업로드 거부: {ur.detail}")
+        return JSONResponse(
+            content={"detail": ur.detail},
+            status_code=ur.status_code
+        )
     except Exception as e:
         # 일반 예외는 로깅 후 500 에러 반환
         logger.error(f"POST 요청 처리 중 오류 발생: {str(e)}")
@@ -214,13 +340,14 @@ async def proxy_put(service: ServiceType, path: str, request: Request):
         # 헤더 전달 (JWT 및 사용자 ID - 미들웨어에서 이미 X-User-Id 헤더가 추가됨)
         headers = dict(request.headers)
         
-        response = await factory.request(
+        return await send_proxy_request(
+            factory,
+            request,
             method="PUT",
             path=path,
             headers=headers,
             body=await request.body()
         )
-        return create_response(response)
     except Exception as e:
         logger.error(f"Error in PUT proxy: {str(e)}")
         return JSONResponse(
@@ -237,13 +364,14 @@ async def proxy_delete(service: ServiceType, path: str, request: Request):
         # 헤더 전달 (JWT 및 사용자 ID - 미들웨어에서 이미 X-User-Id 헤더가 추가됨)
         headers = dict(request.headers)
         
-        response = await factory.request(
+        return await send_proxy_request(
+            factory,
+            request,
             method="DELETE",
             path=path,
             headers=headers,
             body=await request.body()
         )
-        return create_response(response)
     except Exception as e:
         logger.error(f"Error in DELETE proxy: {str(e)}")
         return JSONResponse(
@@ -260,13 +388,14 @@ async def proxy_patch(service: ServiceType, path: str, request: Request):
         # 헤더 전달 (JWT 및 사용자 ID - 미들웨어에서 이미 X-User-Id 헤더가 추가됨)
         headers = dict(request.headers)
         
-        response = await factory.request(
+        return await send_proxy_request(
+            factory,
+            request,
             method="PATCH",
             path=path,
             headers=headers,
             body=await request.body()
         )
-        return create_response(response)
     except Exception as e:
         logger.error(f"Error in PATCH proxy: {str(e)}")
         return JSONResponse(
@@ -274,6 +403,11 @@ async def proxy_patch(service: ServiceType, path: str, request: Request):
             status_code=500
         )
 
+# WebSocket - 설정된 서비스(WEBSOCKET_SERVICES)로 업그레이드 요청 중계 (JWT 적용)
+@gateway_router.websocket("/{service}/{path:path}")
+async def proxy_ws(websocket: WebSocket, service: ServiceType, path: str):
+    await proxy_websocket(websocket, service, path)
+
 # ✅ 메인 라우터 등록 (동적 라우팅)
 app.include_router(gateway_router)
 
@@ -290,6 +424,17 @@ async def not_found_handler(request: Request, exc):
 async def root():
     return {"message": "Gateway API", "version": "0.1.0"}
 
+# ✅ Prometheus 메트릭 (GATEWAY_METRICS_TOKEN 설정 시 Bearer 토큰 필요)
+GATEWAY_METRICS_TOKEN = os.getenv("GATEWAY_METRICS_TOKEN")
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    # 토큰 비교 시간으로 일치 길이가 드러나지 않도록 상수 시간 비교 (비 ASCII 헤더도 처리하도록 바이트로)
+    authorization = request.headers.get("authorization", "").encode()
+    if GATEWAY_METRICS_TOKEN and not hmac.compare_digest(authorization, f"Bearer {GATEWAY_METRICS_TOKEN}".encode()):
+        return JSONResponse(content={"detail": "메트릭 접근 토큰이 올바르지 않습니다."}, status_code=403)
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # ✅ 서버 실행
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,167 @@
+"""
+AuthMiddleware 마이크로 벤치마크
+기존 BaseHTTPMiddleware 구현(print 포함)과 순수 ASGI 구현의 처리량(req/s)과 p99 지연을 비교한다.
+
+실행 (gateway 디렉터리에서):
+    JWT_SECRET_KEY=bench-secret python benchmarks/bench_auth_middleware.py --requests 20000 --concurrency 50
+
+네트워크/Redis 없이 ASGI 호출만 측정하며, jti 없는 토큰을 사용해 블랙리스트 조회를 건너뛴다.
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import contextlib
+import statistics
+
+os.environ.setdefault("JWT_SECRET_KEY", "bench-secret")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jose import jwt
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from app.foundation.jwt_auth_middleware import (
+    AuthMiddleware,
+    DEFAULT_EXEMPT_PATHS,
+    DEFAULT_EXEMPT_PREFIXES,
+    JWT_SECRET_KEY,
+    JWT_ALGORITHM,
+)
+
+
+class LegacyAuthMiddleware(BaseHTTPMiddleware):
+    """비교 기준: 기존 BaseHTTPMiddleware 구현 (요청마다 print, 블랙리스트 조회 제외)"""
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.exempt_paths = set(DEFAULT_EXEMPT_PATHS)
+        self.exempt_prefixes = list(DEFAULT_EXEMPT_PREFIXES)
+
+    def _is_exempt_path(self, path: str) -> bool:
+        if path in self.exempt_paths:
+            return True
+        for prefix in self.exempt_prefixes:
+            if path.startswith(prefix):
+                return True
+        return False
+
+    async def dispatch(self, request: Request, call_next):
+        if request.method == "OPTIONS":
+            return await call_next(request)
+        print(f"🔍 Request path: {request.url.path}")
+        print(f"📋 Exempt paths: {self.exempt_paths}")
+        print(f"📂 Exempt prefixes: {self.exempt_prefixes}")
+        if self._is_exempt_path(request.url.path):
+            print(f"✅ Exempt path: {request.url.path}")
+            return await call_next(request)
+        print(f"🔒 Authentication required for: {request.url.path}")
+
+        token = None
+        authorization = request.headers.get("Authorization")
+        if authorization:
+            try:
+                scheme, token_from_header = authorization.split()
+                if scheme.lower() == "bearer":
+                    token = token_from_header
+            except ValueError:
+                pass
+        if not token:
+            token = request.cookies.get("access_token")
+        if not token:
+            return JSONResponse(status_code=401, content={"detail": "인증 정보가 없습니다."})
+
+        decoded_token = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        request.scope["headers"].append((b"x-user-id", str(decoded_token.get("user_id")).encode("utf-8")))
+        return await call_next(request)
+
+
+async def downstream_app(scope, receive, send):
+    """최소 응답만 반환하는 하위 ASGI 앱"""
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+def make_scope(path: str, token: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"gateway"),
+            (b"accept", b"application/json"),
+            (b"cookie", f"access_token={token}; theme=dark".encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("gateway", 8080),
+    }
+
+
+async def run(app, paths, token: str, total: int, concurrency: int):
+    latencies = []
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(paths[i % len(paths)])
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        return None
+
+    async def worker():
+        while True:
+            try:
+                path = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            await app(make_scope(path, token), receive, send)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="AuthMiddleware micro-benchmark")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    token = jwt.encode({"user_id": "00000000-0000-0000-0000-000000000001", "exp": int(time.time()) + 3600}, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+    # 인증 필요 경로와 공개 경로를 섞어서 측정
+    paths = ["/api/report/reports", "/api/disclosure/answers/my", "/api/disclosure/disclosure-data/terms"]
+
+    implementations = {
+        "legacy (BaseHTTPMiddleware)": LegacyAuthMiddleware(downstream_app),
+        "asgi (AuthMiddleware)": AuthMiddleware(downstream_app),
+    }
+
+    print(f"requests={args.requests}, concurrency={args.concurrency}")
+    for name, app in implementations.items():
+        # 기존 구현의 print 출력은 측정 비용에 포함하되 화면에는 남기지 않음
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            await run(app, paths, token, min(1000, args.requests), args.concurrency)  # warm-up
+            result = await run(app, paths, token, args.requests, args.concurrency)
+        print(f"{name:30s} {result['rps']:10.0f} req/s   p50={result['p50_ms']:.3f}ms   p99={result['p99_ms']:.3f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+"""
+IdempotencyMiddleware 테스트
+같은 Idempotency-Key를 다른 본문의 요청에 재사용하면 실행하지 않고 422를 반환한다.
+
+실행: gateway 디렉터리에서 python -m pytest tests
+"""
+import asyncio
+import json
+from typing import Dict, List
+
+import fakeredis
+import pytest
+from starlette.responses import JSONResponse
+
+from app.foundation import idempotency as idempotency_module
+from app.foundation.idempotency import IdempotencyMiddleware, IdempotencyStore
+
+
+@pytest.fixture(autouse=True)
+def fake_redis(monkeypatch):
+    redis_client = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(idempotency_module, "get_binary_redis_client", lambda: redis_client)
+    return redis_client
+
+
+class Upstream:
+    """받은 본문을 기록하고 그대로 돌려주는 ASGI 앱"""
+
+    def __init__(self):
+        self.bodies: List[bytes] = []
+
+    async def __call__(self, scope, receive, send):
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                break
+        self.bodies.append(body)
+        await JSONResponse(status_code=201, content={"saved": json.loads(body)})(scope, receive, send)
+
+
+async def _post(app, body: bytes, key: str = "answers-1") -> Dict:
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/api/disclosure/answers/batch",
+        "query_string": b"",
+        "headers": [(b"idempotency-key", key.encode()), (b"x-user-id", b"user-1")],
+    }
+    # 본문을 두 조각으로 나누어 전달
+    messages = [
+        {"type": "http.request", "body": body[:5], "more_body": True},
+        {"type": "http.request", "body": body[5:], "more_body": False},
+    ]
+    sent: List[Dict] = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    headers = dict(sent[0]["headers"])
+    return {"status": sent[0]["status"], "body": b"".join(m.get("body", b"") for m in sent[1:]), "headers": headers}
+
+
+def test_same_key_and_body_is_replayed():
+    upstream = Upstream()
+    app = IdempotencyMiddleware(upstream, store=IdempotencyStore())
+    body = json.dumps({"answers": [{"requirement_id": "r1", "answer_value": "a"}]}).encode()
+
+    async def scenario():
+        return await _post(app, body), await _post(app, body)
+
+    first, second = asyncio.run(scenario())
+    assert first["status"] == second["status"] == 201
+    assert second["body"] == first["body"]
+    assert second["headers"][b"idempotent-replayed"] == b"true"
+    assert upstream.bodies == [body]
+
+
+def test_same_key_with_different_body_is_rejected():
+    upstream = Upstream()
+    store = IdempotencyStore()
+    app = IdempotencyMiddleware(upstream, store=store)
+    original = json.dumps({"answers": [{"requirement_id": "r1", "answer_value": "a"}]}).encode()
+    changed = json.dumps({"answers": [{"requirement_id": "r1", "answer_value": "b"}]}).encode()
+
+    async def scenario():
+        return await _post(app, original), await _post(app, changed)
+
+    first, second = asyncio.run(scenario())
+    assert first["status"] == 201
+    assert second["status"] == 422
+    assert upstream.bodies == [original]
+    assert store.mismatches == 1
+
+
+def test_large_body_passes_through_without_deduplication(monkeypatch):
+    monkeypatch.setattr(idempotency_module, "IDEMPOTENCY_MAX_REQUEST_BODY_BYTES", 8)
+    upstream = Upstream()
+    store = IdempotencyStore()
+    app = IdempotencyMiddleware(upstream, store=store)
+    body = json.dumps({"answers": ["x" * 32]}).encode()
+
+    async def scenario():
+        return await _post(app, body), await _post(app, body)
+
+    first, second = asyncio.run(scenario())
+    assert first["status"] == second["status"] == 201
+    assert upstream.bodies == [body, body]
+    assert store.skipped == 2
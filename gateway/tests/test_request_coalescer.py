@@ -0,0 +1,83 @@
+"""
+RequestCoalescer 테스트
+조건부 요청(If-None-Match)의 304가 같은 경로의 조건 없는 요청에 공유되지 않아야 한다.
+
+실행: gateway 디렉터리에서 python -m pytest tests
+"""
+import asyncio
+from typing import Dict
+
+import httpx
+
+from app.foundation.request_coalescer import RequestCoalescer
+
+BODY = b'{"terms":[]}'
+
+
+class _UpstreamBody(httpx.AsyncByteStream):
+    """업스트림 스트리밍 본문 (병합기가 공유할 수 있는 읽기 전 상태의 응답)"""
+
+    def __init__(self, body: bytes):
+        self._body = body
+
+    async def __aiter__(self):
+        if self._body:
+            yield self._body
+
+
+def _upstream(headers: Dict[str, str], release: asyncio.Event):
+    """If-None-Match가 맞으면 304, 아니면 200 (release까지 응답을 늦춰 요청이 겹치게 함)"""
+
+    async def fetch() -> httpx.Response:
+        await release.wait()
+        if headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"etag": '"v1"'}, stream=_UpstreamBody(b""))
+        return httpx.Response(200, headers={"etag": '"v1"'}, stream=_UpstreamBody(BODY))
+
+    return fetch
+
+
+def test_conditional_leader_not_shared_with_unconditional_follower():
+    coalescer = RequestCoalescer(vary_headers=("x-user-id",))
+
+    async def scenario():
+        release = asyncio.Event()
+        leader_headers = {"if-none-match": '"v1"'}
+        follower_headers: Dict[str, str] = {}
+        leader = asyncio.ensure_future(coalescer.run(
+            coalescer.key("disclosure", "disclosure-data/terms", "", leader_headers),
+            _upstream(leader_headers, release),
+        ))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(coalescer.run(
+            coalescer.key("disclosure", "disclosure-data/terms", "", follower_headers),
+            _upstream(follower_headers, release),
+        ))
+        await asyncio.sleep(0)
+        release.set()
+        leader_response, follower_response = await asyncio.gather(leader, follower)
+        return leader_response, await follower_response.aread(), follower_response.status_code
+
+    leader_response, follower_body, follower_status = asyncio.run(scenario())
+    assert leader_response.status_code == 304
+    assert follower_status == 200
+    assert follower_body == BODY
+    assert coalescer.hits == 0
+
+
+def test_identical_requests_share_one_upstream_call():
+    coalescer = RequestCoalescer(vary_headers=("x-user-id",))
+
+    async def scenario():
+        release = asyncio.Event()
+        key = coalescer.key("disclosure", "disclosure-data/terms", "", {})
+        first = asyncio.ensure_future(coalescer.run(key, _upstream({}, release)))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(coalescer.run(key, _upstream({}, release)))
+        await asyncio.sleep(0)
+        release.set()
+        responses = await asyncio.gather(first, second)
+        return [await response.aread() for response in responses]
+
+    assert asyncio.run(scenario()) == [BODY, BODY]
+    assert coalescer.leaders == 1 and coalescer.hits == 1
@@ -0,0 +1,67 @@
+"""
+UpstreamGuard 헤지 요청 테스트
+반환하는 응답은 스트리밍 본문을 끝까지 읽을 수 있어야 한다 (진 요청만 닫힘).
+
+실행: gateway 디렉터리에서 python -m pytest tests
+"""
+import asyncio
+
+import httpx
+
+from app.domain.model.service_type import ServiceType
+from app.foundation.resilience import UpstreamGuard
+
+BODY = b"x" * 4096
+
+
+def _streaming_send(delay: float = 0.0):
+    """지연 후 응답 헤더를 주고 본문은 나중에 여러 조각으로 흘려보내는 send()"""
+
+    async def body():
+        for offset in range(0, len(BODY), 512):
+            await asyncio.sleep(0)
+            yield BODY[offset:offset + 512]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(delay)
+        return httpx.Response(200, content=body())
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def send():
+        request = client.build_request("GET", "http://upstream/api/items")
+        return await client.send(request, stream=True)
+
+    return client, send
+
+
+def _hedged_guard() -> UpstreamGuard:
+    guard = UpstreamGuard(ServiceType.DISCLOSURE)
+    guard.hedge_enabled = True
+    return guard
+
+
+async def _read_hedged(guard: UpstreamGuard, delay: float) -> bytes:
+    client, send = _streaming_send(delay)
+    async with client:
+        response = await guard.execute("GET", send)
+        # finally의 done 콜백이 돌 기회를 준 뒤 본문 읽기
+        await asyncio.sleep(0.01)
+        body = await response.aread()
+        await response.aclose()
+        return body
+
+
+def test_primary_before_hedge_delay_keeps_body_readable():
+    guard = _hedged_guard()
+    assert asyncio.run(_read_hedged(guard, delay=0.0)) == BODY
+    assert guard.hedges == 0
+
+
+def test_budget_refused_hedge_keeps_body_readable():
+    guard = _hedged_guard()
+    guard.budget.tokens = 0
+    guard.budget.ratio = 0
+    # HEDGE_MIN_DELAY_MS(기본 50ms)보다 늦게 끝나는 1차 요청
+    assert asyncio.run(_read_hedged(guard, delay=0.1)) == BODY
+    assert guard.hedges == 0
@@ -0,0 +1,132 @@
+"""
+ResponseCache 테스트
+disclosure-service의 마스터 데이터 응답(Cache-Control: no-cache + ETag)이 실제로 저장되고,
+신선 기간이 지나면 조건부 요청으로 재검증되는지 확인한다.
+
+실행: gateway 디렉터리에서 python -m pytest tests
+"""
+import asyncio
+from typing import Dict, List, Optional
+
+import fakeredis
+import httpx
+import pytest
+from starlette.requests import Request
+
+from app.foundation import response_cache as response_cache_module
+from app.foundation.response_cache import ResponseCache
+
+PATH = "/api/disclosure/disclosure-data/terms"
+ETAG = '"v1"'
+BODY = b'[{"term_id":1}]'
+
+
+@pytest.fixture(autouse=True)
+def fake_redis(monkeypatch):
+    redis_client = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(response_cache_module, "get_binary_redis_client", lambda: redis_client)
+    # 프로세스 메모리(L1)를 거치지 않고 Redis 저장 여부까지 확인
+    monkeypatch.setattr(response_cache_module, "RESPONSE_CACHE_L1_MAX_ENTRIES", 0)
+    return redis_client
+
+
+class _UpstreamBody(httpx.AsyncByteStream):
+    """업스트림 스트리밍 본문 (읽기 전 상태의 응답을 만들기 위해)"""
+
+    async def __aiter__(self):
+        yield BODY
+
+
+def _request(headers: Optional[Dict[str, str]] = None) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": PATH,
+        "query_string": b"",
+        "headers": [(name.encode(), value.encode()) for name, value in (headers or {}).items()],
+    })
+
+
+class Upstream:
+    """disclosure-data 라우트처럼 ETag가 같으면 304, 아니면 no-cache + ETag로 200"""
+
+    def __init__(self):
+        self.requests: List[Dict[str, str]] = []
+
+    def fetcher(self, request: Request):
+        """proxy_get의 fetch처럼 클라이언트 헤더를 전달하고 덮어쓰기를 적용"""
+
+        async def fetch(header_overrides: Optional[Dict[str, Optional[str]]] = None) -> httpx.Response:
+            headers = dict(request.headers)
+            for name, value in (header_overrides or {}).items():
+                headers.pop(name, None)
+                if value is not None:
+                    headers[name] = value
+            return self._respond(headers)
+
+        return fetch
+
+    def _respond(self, headers: Dict[str, str]) -> httpx.Response:
+        self.requests.append(headers)
+        cache_headers = {"etag": ETAG, "cache-control": "no-cache"}
+        if headers.get("if-none-match") == ETAG:
+            return httpx.Response(304, headers=cache_headers)
+        return httpx.Response(200, headers={**cache_headers, "content-type": "application/json"}, stream=_UpstreamBody())
+
+
+async def _serve(cache: ResponseCache, upstream: Upstream, headers: Optional[Dict[str, str]] = None):
+    request = _request(headers)
+    return await cache.serve(request, upstream.fetcher(request))
+
+
+def test_no_cache_response_with_etag_is_stored(fake_redis):
+    cache = ResponseCache(prefixes=("/api/disclosure/disclosure-data/",))
+    upstream = Upstream()
+
+    async def scenario():
+        first = await _serve(cache, upstream)
+        second = await _serve(cache, upstream)
+        stored = await fake_redis.exists(cache._key(_request()))
+        return first, second, stored
+
+    first, second, stored = asyncio.run(scenario())
+    assert first.headers["x-gateway-cache"] == "MISS"
+    assert second.headers["x-gateway-cache"] == "HIT"
+    assert second.body == BODY
+    assert stored == 1
+    assert len(upstream.requests) == 1
+
+
+def test_stale_no_cache_entry_is_revalidated_with_etag(monkeypatch):
+    monkeypatch.setattr(response_cache_module, "RESPONSE_CACHE_NO_CACHE_FRESH_SECONDS", 0)
+    cache = ResponseCache(prefixes=("/api/disclosure/disclosure-data/",))
+    upstream = Upstream()
+
+    async def scenario():
+        await _serve(cache, upstream)
+        return await _serve(cache, upstream)
+
+    revalidated = asyncio.run(scenario())
+    assert revalidated.status_code == 200
+    assert revalidated.headers["x-gateway-cache"] == "REVALIDATED"
+    assert revalidated.body == BODY
+    assert upstream.requests[1]["if-none-match"] == ETAG
+    assert cache.revalidations == 1
+
+
+def test_revalidating_client_miss_fills_cache():
+    cache = ResponseCache(prefixes=("/api/disclosure/disclosure-data/",))
+    upstream = Upstream()
+
+    async def scenario():
+        conditional = await _serve(cache, upstream, {"if-none-match": ETAG})
+        unconditional = await _serve(cache, upstream)
+        return conditional, unconditional
+
+    conditional, unconditional = asyncio.run(scenario())
+    # 업스트림에는 조건 없이 요청해 전체 응답을 저장하고, 클라이언트에는 저장한 ETag로 304
+    assert "if-none-match" not in upstream.requests[0]
+    assert conditional.status_code == 304
+    assert unconditional.headers["x-gateway-cache"] == "HIT"
+    assert unconditional.body == BODY
+    assert len(upstream.requests) == 1
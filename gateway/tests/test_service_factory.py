@@ -0,0 +1,94 @@
+"""
+ServiceProxyFactory 테스트
+- 클라이언트 업로드 거부(UploadRejected)는 레플리카/서킷 브레이커/동시 요청 제한기의 실패로 집계하지 않는다.
+- 스트리밍 응답은 본문이 닫힐 때까지 동시 요청 슬롯을 유지한다.
+
+실행: gateway 디렉터리에서 python -m pytest tests
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.domain.model import service_factory as service_factory_module
+from app.domain.model.service_factory import ServiceProxyFactory
+from app.domain.model.service_type import ServiceType
+from app.foundation.adaptive_concurrency import AdaptiveConcurrencyLimiter
+from app.foundation.load_balancer import UpstreamBalancer
+from app.foundation.resilience import UpstreamGuard
+from app.foundation.upload_stream import UploadRejected
+
+
+async def _oversized_upload():
+    """첫 청크 뒤에 최대 크기를 넘어 전송이 중단되는 업로드 본문"""
+    yield b"x" * 1024
+    raise UploadRejected(413, "업로드 최대 크기를 초과했습니다.")
+
+
+async def _event_stream():
+    for index in range(3):
+        await asyncio.sleep(0)
+        yield f"data: {index}\n\n".encode()
+
+
+async def _read_body(request: httpx.Request) -> httpx.Response:
+    await request.aread()
+    if request.url.path == "/api/chat/stream":
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=_event_stream())
+    return httpx.Response(200)
+
+
+@pytest.fixture
+def factory(monkeypatch):
+    guard = UpstreamGuard(ServiceType.CLIMATE)
+    limiter = AdaptiveConcurrencyLimiter(ServiceType.CLIMATE)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_read_body))
+    monkeypatch.setattr(service_factory_module, "get_upstream_guard", lambda service_type: guard)
+    monkeypatch.setattr(service_factory_module, "get_concurrency_limiter", lambda service_type: limiter)
+    monkeypatch.setattr(service_factory_module, "get_upstream_client", lambda service_type: client)
+    proxy = ServiceProxyFactory(ServiceType.CLIMATE)
+    proxy.balancer = UpstreamBalancer(ServiceType.CLIMATE, ["http://replica-a", "http://replica-b"])
+    return proxy, guard, limiter
+
+
+def test_rejected_upload_is_not_an_upstream_failure(factory):
+    proxy, guard, limiter = factory
+
+    async def scenario():
+        for _ in range(5):
+            await proxy.stream(method="POST", path="api/upload", headers={}, body=_oversized_upload())
+
+    asyncio.run(scenario())
+    for endpoint in proxy.balancer.endpoints:
+        assert endpoint.failures == 0 and endpoint.in_flight == 0
+        assert endpoint.is_available(float("inf")) and endpoint.ejections == 0
+    assert guard.breaker.stats()["error_rate"] == 0.0
+    assert limiter.drops == 0 and limiter.in_flight == 0
+
+
+def test_streaming_response_holds_concurrency_slot_until_closed(factory):
+    proxy, _, limiter = factory
+
+    async def scenario():
+        response = await proxy.stream(method="GET", path="api/chat/stream", headers={})
+        during = limiter.in_flight
+        body = b"".join([chunk async for chunk in response.aiter_raw()])
+        await response.aclose()
+        return during, body
+
+    during, body = asyncio.run(scenario())
+    assert during == 1
+    assert body == b"data: 0\n\ndata: 1\n\ndata: 2\n\n"
+    assert limiter.in_flight == 0 and limiter.drops == 0
+
+
+def test_abandoned_stream_releases_slot_on_close(factory):
+    proxy, _, limiter = factory
+
+    async def scenario():
+        response = await proxy.stream(method="GET", path="api/chat/stream", headers={})
+        await response.aclose()
+        await response.aclose()
+
+    asyncio.run(scenario())
+    assert limiter.in_flight == 0
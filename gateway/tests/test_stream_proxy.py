@@ -0,0 +1,64 @@
+"""
+SSE 프록시 테스트
+이벤트가 유휴 시간 안에 계속 오더라도 SSE_MAX_DURATION이 지나면 업스트림을 닫고 종료한다.
+
+실행: gateway 디렉터리에서 python -m pytest tests
+"""
+import asyncio
+import itertools
+
+import httpx
+from starlette.requests import Request
+
+from app.foundation import stream_proxy as stream_proxy_module
+from app.foundation.stream_proxy import ConnectionTracker, proxy_event_stream
+
+
+class _EndlessEvents(httpx.AsyncByteStream):
+    """끝나지 않는 SSE 본문 (닫혔는지 기록)"""
+
+    def __init__(self):
+        self.closed = False
+
+    async def __aiter__(self):
+        for index in itertools.count():
+            await asyncio.sleep(0.01)
+            yield f"data: {index}\n\n".encode()
+
+    async def aclose(self):
+        self.closed = True
+
+
+class _Factory:
+    def __init__(self, stream: httpx.AsyncByteStream):
+        self._stream = stream
+
+    async def stream(self, **kwargs) -> httpx.Response:
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, stream=self._stream)
+
+
+def _request() -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/api/chatbot/stream",
+        "query_string": b"",
+        "headers": [(b"accept", b"text/event-stream"), (b"x-user-id", b"user-1")],
+    })
+
+
+def test_sse_relay_stops_at_max_duration(monkeypatch):
+    monkeypatch.setattr(stream_proxy_module, "SSE_MAX_DURATION", 0.1)
+    tracker = ConnectionTracker()
+    monkeypatch.setattr(stream_proxy_module, "get_connection_tracker", lambda: tracker)
+    upstream = _EndlessEvents()
+
+    async def scenario():
+        response = await proxy_event_stream(_Factory(upstream), _request(), method="GET", path="stream", headers={})
+        return [chunk async for chunk in response.body_iterator]
+
+    chunks = asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+    assert chunks and chunks[0] == b"data: 0\n\n"
+    assert upstream.closed
+    assert tracker.max_duration_closes == 1
+    assert tracker.stats()["active"] == 0
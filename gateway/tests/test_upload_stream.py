@@ -0,0 +1,57 @@
+"""
+StreamingUpload 테스트
+파일 형식 허용 목록은 check_file_type=True일 때(UPLOAD_FILE_TYPE_SERVICES)만 적용된다.
+
+실행: gateway 디렉터리에서 python -m pytest tests
+"""
+import asyncio
+
+import pytest
+from starlette.requests import Request
+
+from app.foundation.upload_stream import StreamingUpload, UploadRejected
+
+BOUNDARY = "test-boundary"
+
+
+def _multipart_request(filename: str, content_type: str) -> Request:
+    body = (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+        "file-content\r\n"
+        f"--{BOUNDARY}--\r\n"
+    ).encode()
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return Request({
+        "type": "http",
+        "method": "POST",
+        "path": "/api/disclosure/attachments",
+        "query_string": b"",
+        "headers": [
+            (b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode()),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    }, receive)
+
+
+def _prepare(filename: str, content_type: str, check_file_type: bool) -> StreamingUpload:
+    upload = StreamingUpload(_multipart_request(filename, content_type))
+    asyncio.run(upload.prepare(check_file_type=check_file_type))
+    return upload
+
+
+def test_file_type_allowlist_rejects_other_types_when_enabled():
+    with pytest.raises(UploadRejected) as rejected:
+        _prepare("evidence.png", "image/png", check_file_type=True)
+    assert rejected.value.status_code == 415
+    assert _prepare("emissions.xlsx", "application/octet-stream", check_file_type=True).filename == "emissions.xlsx"
+
+
+def test_file_type_allowlist_skipped_for_other_services():
+    upload = _prepare("evidence.png", "image/png", check_file_type=False)
+    assert upload.filename == "evidence.png"
+    assert upload.content_type == "image/png"
@@ -8,6 +8,8 @@ from app.domain.controller.auth_controller import AuthController
 from app.domain.model.auth_schema import Token, HealthResponse, AuthCallbackResponse
 from app.foundation.database import get_db
 from app.foundation.dependencies import get_auth_controller
+from app.foundation.user_cache import get_user_profile_cache
+from app.foundation.google_certs import get_google_cert_cache
 
 # APIRouter 인스턴스 생성
 router = APIRouter(
@@ -92,7 +94,17 @@ async def get_current_user(
             detail="인증 토큰이 없습니다."
         )
     
-    return controller.get_current_user(db, token)
+    return await controller.get_current_user(db, token)
+
+@router.get("/stats/user-cache")
+async def user_cache_stats():
+    """사용자 프로필 캐시 적중/미스 통계"""
+    return get_user_profile_cache().stats()
+
+@router.get("/stats/google-certs")
+async def google_cert_stats():
+    """Google 인증서 캐시 통계"""
+    return get_google_cert_cache().stats()
 
 @router.post("/logout")
 async def logout(
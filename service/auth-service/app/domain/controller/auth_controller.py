@@ -168,7 +168,7 @@ class AuthController:
                 detail="토큰 검증 중 서버 오류가 발생했습니다."
             )
     
-    def get_current_user(self, db: Session, token: str) -> Dict[str, Any]:
+    async def get_current_user(self, db: Session, token: str) -> Dict[str, Any]:
         """현재 사용자 정보 조회"""
         try:
             # 토큰 검증
@@ -188,7 +188,7 @@ class AuthController:
                 )
             
             # 사용자 정보 조회
-            user = self.auth_service.get_user_by_id(db, user_id)
+            user = await self.auth_service.get_user_by_id_cached(db, user_id)
             
             if not user:
                 raise HTTPException(
@@ -1,27 +1,33 @@
 # 인증 관련 서비스 - 비즈니스 로직 계층
-import httpx
+import json
 import logging
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from typing import Optional, Dict, Any
 import os
 from datetime import datetime
 from dotenv import load_dotenv
-from google.oauth2 import id_token
-from google.auth.transport import requests
 
 from app.domain.repository.auth_repository import UserRepository
 from app.domain.model.auth_schema import UserCreate, Token, UserResponse, GoogleUserInfo
 from app.foundation.jwt_utils import create_access_token, verify_jwt_with_blacklist
 from app.foundation.redis_client import get_redis_client
+from app.foundation.http_client import get_http_client
+from app.foundation.google_certs import get_google_cert_cache
+from app.foundation.user_cache import UserProfileCache, get_user_profile_cache
 
 load_dotenv()
 
+# 게이트웨이와 공유하는 토큰 블랙리스트 pub/sub 채널
+TOKEN_BLACKLIST_CHANNEL = os.getenv("TOKEN_BLACKLIST_CHANNEL", "auth:token-blacklist")
+
 class AuthService:
     """인증 관련 비즈니스 로직을 담당하는 서비스"""
     
-    def __init__(self, user_repository: UserRepository = None, redis_client=None):
+    def __init__(self, user_repository: UserRepository = None, redis_client=None, user_cache: UserProfileCache = None):
         self.user_repository = user_repository or UserRepository()
         self.redis_client = redis_client or get_redis_client()
+        self.user_cache = user_cache or get_user_profile_cache()
         self.logger = logging.getLogger(__name__)
     
     def generate_google_oauth_url(self) -> str:
@@ -99,35 +105,31 @@ class AuthService:
             "grant_type": "authorization_code",
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://oauth2.googleapis.com/token",
-                data=token_data,
-                headers={"Content-Type": "application/x-www-form-urlencoded"}
-            )
-            
-            if response.status_code != 200:
-                self.logger.error(f"Google 토큰 교환 실패: {response.status_code} - {response.text}")
-                return None
-            
-            tokens = response.json()
-            if not tokens.get("id_token"):
-                self.logger.error("Google 응답에서 id_token을 찾을 수 없습니다.")
-                return None
-            
-            return tokens
+        # 공유 클라이언트의 커넥션 풀 재사용 (요청마다 TLS 핸드셰이크 방지)
+        response = await get_http_client().post(
+            "https://oauth2.googleapis.com/token",
+            data=token_data,
+            headers={"Content-Type": "application/x-www-form-urlencoded"}
+        )
+        
+        if response.status_code != 200:
+            self.logger.error(f"Google 토큰 교환 실패: {response.status_code} - {response.text}")
+            return None
+        
+        tokens = response.json()
+        if not tokens.get("id_token"):
+            self.logger.error("Google 응답에서 id_token을 찾을 수 없습니다.")
+            return None
+        
+        return tokens
     
     async def _verify_and_extract_user_info(self, id_token_str: str) -> Optional[GoogleUserInfo]:
         """Google ID 토큰 검증 및 사용자 정보 추출"""
         try:
             GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
             
-            # Google의 공개 키를 사용하여 ID 토큰 검증
-            idinfo = id_token.verify_oauth2_token(
-                id_token_str, 
-                requests.Request(), 
-                GOOGLE_CLIENT_ID
-            )
+            # 캐시된 Google 공개 키로 ID 토큰을 로컬 검증 (인증서는 만료 시에만 비동기로 갱신)
+            idinfo = await get_google_cert_cache().verify_token(id_token_str, GOOGLE_CLIENT_ID)
             
             # 발급자(issuer) 검증
             if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
@@ -174,23 +176,31 @@ class AuthService:
             else:
                 self.logger.info(f"기존 사용자 로그인 - User ID: {existing_user.user_id}")
             
-            # 마지막 로그인 시간 업데이트
-            updated_user = self.user_repository.update_user_last_login(db, existing_user.user_id)
-            
-            # 사용자 정보 응답 모델 생성
-            return UserResponse(
-                user_id=updated_user.user_id,
-                email=updated_user.email,
-                username=updated_user.username,
-                created_at=updated_user.created_at,
-                updated_at=updated_user.updated_at,
-                last_login_at=updated_user.last_login_at
-            )
+            # 마지막 로그인 시간 업데이트 (사용자 프로필 캐시도 새 값으로 갱신)
+            return await self.update_user_last_login(db, existing_user.user_id)
             
         except Exception as e:
             self.logger.error(f"사용자 로그인/회원가입 처리 실패: {e}")
             return None
     
+    async def update_user_last_login(self, db: Session, user_id) -> Optional[UserResponse]:
+        """마지막 로그인 시간 업데이트 후 사용자 프로필 캐시를 새 값으로 갱신"""
+        updated_user = self.user_repository.update_user_last_login(db, user_id)
+        if not updated_user:
+            await self.user_cache.invalidate(str(user_id))
+            return None
+        
+        user = UserResponse(
+            user_id=updated_user.user_id,
+            email=updated_user.email,
+            username=updated_user.username,
+            created_at=updated_user.created_at,
+            updated_at=updated_user.updated_at,
+            last_login_at=updated_user.last_login_at
+        )
+        await self.user_cache.put(user)
+        return user
+    
     def create_jwt_token(self, user: UserResponse) -> Token:
         """사용자 정보를 바탕으로 JWT 토큰 생성"""
         token_data = {
@@ -246,6 +256,16 @@ class AuthService:
             
             self.logger.info(f"토큰 블랙리스트 등록 완료: jti={jti}, ttl={ttl}초")
             
+            # 게이트웨이 로컬 블랙리스트 캐시에 즉시 반영되도록 무효화 이벤트 발행
+            try:
+                await self.redis_client.publish(
+                    TOKEN_BLACKLIST_CHANNEL,
+                    json.dumps({"jti": jti, "exp": exp})
+                )
+            except Exception as e:
+                # 게이트웨이는 주기적 재동기화로 결국 반영하므로 로그아웃 자체는 성공 처리
+                self.logger.error(f"토큰 블랙리스트 이벤트 발행 실패: jti={jti}, error={e}")
+            
             return {
                 "message": "로그아웃이 성공적으로 처리되었습니다.",
                 "success": True
@@ -281,6 +301,18 @@ class AuthService:
             self.logger.error(f"사용자 조회 실패: {e}")
             return None
     
+    async def get_user_by_id_cached(self, db: Session, user_id: str) -> Optional[UserResponse]:
+        """사용자 ID로 사용자 정보 조회 (캐시 우선, 미스일 때만 DB 조회)"""
+        user = await self.user_cache.get(user_id)
+        if user is not None:
+            return user
+        
+        # 동기 DB 조회가 이벤트 루프를 막지 않도록 스레드풀에서 실행
+        user = await run_in_threadpool(self.get_user_by_id, db, user_id)
+        if user is not None:
+            await self.user_cache.put(user)
+        return user
+    
     # 기존 호환성을 위한 메서드들
     async def get_google_user_info(self, id_token: str) -> Optional[GoogleUserInfo]:
         """Google ID Token을 검증하고 사용자 정보 추출 (기존 호환성)"""
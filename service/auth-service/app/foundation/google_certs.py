@@ -0,0 +1,138 @@
+"""
+Google ID 토큰 서명 인증서 캐시 및 로컬 검증
+id_token.verify_oauth2_token은 검증할 때마다 동기 HTTP로 Google 인증서를 받아와
+이벤트 루프를 막으므로, 인증서를 메모리에 캐시하고 토큰은 캐시된 인증서로 로컬 검증한다.
+
+- 인증서 응답의 Cache-Control max-age만큼 캐시 (없으면 GOOGLE_CERTS_DEFAULT_TTL초)
+- 만료 GOOGLE_CERTS_REFRESH_MARGIN초 전부터는(max-age가 짧으면 절반이 지난 뒤부터) 현재 인증서로 응답하면서 백그라운드에서 갱신
+- 만료 후 동시에 들어온 요청은 한 번만 받아옴 (asyncio.Lock), 받아오기 실패 시 이전 인증서로 계속 검증
+- 토큰의 kid가 캐시에 없으면(키 교체 직후) 한 번 강제 갱신 후 재검증
+  (임의 kid로 인증서 요청을 반복 유발하지 못하도록 GOOGLE_CERTS_MIN_REFRESH_INTERVAL초에 한 번만)
+"""
+import os
+import re
+import time
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+from google.auth import jwt as google_jwt
+
+from app.foundation.http_client import get_http_client
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_CERTS_URL = os.getenv("GOOGLE_CERTS_URL", "https://www.googleapis.com/oauth2/v1/certs")
+GOOGLE_CERTS_DEFAULT_TTL = float(os.getenv("GOOGLE_CERTS_DEFAULT_TTL", "3600"))
+GOOGLE_CERTS_REFRESH_MARGIN = float(os.getenv("GOOGLE_CERTS_REFRESH_MARGIN", "300"))
+GOOGLE_CERTS_MIN_REFRESH_INTERVAL = float(os.getenv("GOOGLE_CERTS_MIN_REFRESH_INTERVAL", "30"))
+GOOGLE_TOKEN_CLOCK_SKEW = int(os.getenv("GOOGLE_TOKEN_CLOCK_SKEW", "0"))
+
+_MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)", re.IGNORECASE)
+
+
+def _parse_max_age(cache_control: Optional[str]) -> Optional[float]:
+    match = _MAX_AGE_PATTERN.search(cache_control or "")
+    return float(match.group(1)) if match else None
+
+
+class GoogleCertCache:
+    """Google 서명 인증서(kid → PEM) 캐시"""
+
+    def __init__(self, certs_url: str = GOOGLE_CERTS_URL):
+        self.certs_url = certs_url
+        self._certs: Dict[str, str] = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._refresh_at = 0.0
+        self._generation = 0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.fetches = 0
+        self.background_refreshes = 0
+        self.fetch_errors = 0
+
+    async def _fetch(self):
+        response = await get_http_client().get(self.certs_url)
+        response.raise_for_status()
+        certs = response.json()
+        max_age = _parse_max_age(response.headers.get("cache-control"))
+        ttl = max_age if max_age is not None else GOOGLE_CERTS_DEFAULT_TTL
+        self._certs = certs
+        self._fetched_at = time.monotonic()
+        self._expires_at = self._fetched_at + ttl
+        self._refresh_at = self._fetched_at + max(ttl - GOOGLE_CERTS_REFRESH_MARGIN, ttl / 2)
+        self._generation += 1
+        self.fetches += 1
+        logger.info(f"🔑 Google 인증서 갱신: keys={len(certs)}, ttl={int(ttl)}초")
+
+    async def _refresh(self, generation: int):
+        """다른 요청이 이미 갱신했으면(generation 변경) 다시 받지 않음"""
+        async with self._lock:
+            if self._generation != generation:
+                return
+            try:
+                await self._fetch()
+            except Exception as e:
+                self.fetch_errors += 1
+                if not self._certs:
+                    raise
+                logger.warning(f"Google 인증서 갱신 실패, 이전 인증서로 계속 검증: {e}")
+
+    def _schedule_refresh(self):
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self.background_refreshes += 1
+        self._refresh_task = asyncio.create_task(self._refresh(self._generation))
+
+    async def get_certs(self, force: bool = False) -> Dict[str, str]:
+        now = time.monotonic()
+        if self._certs and not force and now < self._expires_at:
+            if now >= self._refresh_at:
+                self._schedule_refresh()
+            self.hits += 1
+            return self._certs
+        await self._refresh(self._generation)
+        return self._certs
+
+    async def verify_token(self, token: str, audience: Optional[str]) -> Dict[str, Any]:
+        """
+        Google ID 토큰 서명/만료/audience 검증 후 클레임 반환 (검증 실패 시 ValueError)
+        네트워크 호출은 인증서 캐시가 비었거나 만료됐을 때만 발생한다.
+        """
+        certs = await self.get_certs()
+        key_id = google_jwt.decode_header(token).get("kid")
+        if key_id and key_id not in certs and time.monotonic() - self._fetched_at >= GOOGLE_CERTS_MIN_REFRESH_INTERVAL:
+            # Google 키 교체 직후 - 새 인증서를 받아 한 번만 재시도
+            certs = await self.get_certs(force=True)
+        return google_jwt.decode(
+            token, certs=certs, audience=audience, clock_skew_in_seconds=GOOGLE_TOKEN_CLOCK_SKEW
+        )
+
+    async def close(self):
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "keys": len(self._certs),
+            "expires_in_seconds": max(round(self._expires_at - time.monotonic(), 1), 0.0),
+            "hits": self.hits,
+            "fetches": self.fetches,
+            "background_refreshes": self.background_refreshes,
+            "fetch_errors": self.fetch_errors,
+        }
+
+
+_google_cert_cache: Optional[GoogleCertCache] = None
+
+# 어디서든 이 함수를 호출하여 Google 인증서 캐시를 가져올 수 있음
+def get_google_cert_cache() -> GoogleCertCache:
+    global _google_cert_cache
+    if _google_cert_cache is None:
+        _google_cert_cache = GoogleCertCache()
+    return _google_cert_cache
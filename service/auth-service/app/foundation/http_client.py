@@ -0,0 +1,49 @@
+"""
+외부(Google) 호출용 공유 HTTP 클라이언트
+요청마다 httpx.AsyncClient를 새로 만들면 매번 TCP/TLS 핸드셰이크가 발생하므로
+장수명 클라이언트 하나를 커넥션 풀로 재사용한다. 애플리케이션 lifespan에서 종료한다.
+"""
+import os
+import logging
+from typing import Optional
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+HTTP_CLIENT_TIMEOUT = float(os.getenv("HTTP_CLIENT_TIMEOUT", "10"))
+HTTP_CLIENT_MAX_CONNECTIONS = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", "50"))
+HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS", "10"))
+
+
+class HttpClient:
+    _client: Optional[httpx.AsyncClient] = None
+
+    @classmethod
+    def get_client(cls) -> httpx.AsyncClient:
+        if cls._client is None or cls._client.is_closed:
+            cls._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(HTTP_CLIENT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=HTTP_CLIENT_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+                ),
+            )
+        return cls._client
+
+    @classmethod
+    async def close(cls):
+        client, cls._client = cls._client, None
+        if client is not None:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"HTTP 클라이언트 종료 실패: {e}")
+
+
+# 어디서든 이 함수를 호출하여 공유 HTTP 클라이언트를 가져올 수 있음
+def get_http_client() -> httpx.AsyncClient:
+    return HttpClient.get_client()
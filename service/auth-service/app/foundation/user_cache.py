@@ -0,0 +1,127 @@
+"""
+사용자 프로필(UserResponse) 읽기 캐시
+/auth/me처럼 페이지 이동마다 호출되는 조회가 매번 Postgres를 거치지 않도록
+프로세스 내 L1(짧은 TTL) → Redis L2 → DB 순서로 조회한다 (read-through).
+
+- L1: user_id → (만료 시각, UserResponse), USER_CACHE_L1_TTL초 / 최대 USER_CACHE_L1_MAX_ENTRIES개
+- L2: Redis "user:profile:{user_id}"에 UserResponse JSON, USER_CACHE_TTL초
+- 로그인/회원가입, 마지막 로그인 시간 갱신 시 새 값으로 덮어씀 (put)
+- Redis 오류는 캐시 미스로 취급하고 DB 조회로 진행 (인증 요청은 실패시키지 않음)
+- 적중/미스 횟수는 /auth/stats/user-cache로 노출
+"""
+import os
+import time
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from app.domain.model.auth_schema import UserResponse
+from app.foundation.redis_client import get_redis_client
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "300"))
+USER_CACHE_L1_TTL = float(os.getenv("USER_CACHE_L1_TTL", "5"))
+USER_CACHE_L1_MAX_ENTRIES = int(os.getenv("USER_CACHE_L1_MAX_ENTRIES", "10000"))
+USER_CACHE_KEY_PREFIX = "user:profile:"
+
+
+class UserProfileCache:
+    """L1(프로세스 내) + L2(Redis) 사용자 프로필 캐시"""
+
+    def __init__(self, redis_client=None):
+        self.redis_client = redis_client or get_redis_client()
+        self._local: Dict[str, Tuple[float, UserResponse]] = {}
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.redis_errors = 0
+
+    @staticmethod
+    def _key(user_id: str) -> str:
+        return f"{USER_CACHE_KEY_PREFIX}{user_id}"
+
+    def _put_local(self, user_id: str, user: UserResponse):
+        if len(self._local) >= USER_CACHE_L1_MAX_ENTRIES and user_id not in self._local:
+            # 만료된 항목부터 정리하고, 그래도 가득 차면 가장 오래된 항목 제거
+            now = time.monotonic()
+            for key in [key for key, (expires_at, _) in self._local.items() if expires_at <= now]:
+                del self._local[key]
+            if len(self._local) >= USER_CACHE_L1_MAX_ENTRIES:
+                del self._local[next(iter(self._local))]
+        self._local[user_id] = (time.monotonic() + USER_CACHE_L1_TTL, user)
+
+    async def get(self, user_id: str) -> Optional[UserResponse]:
+        """캐시된 사용자 프로필 (없으면 None, 미스로 집계)"""
+        entry = self._local.get(user_id)
+        if entry is not None:
+            expires_at, user = entry
+            if expires_at > time.monotonic():
+                self.l1_hits += 1
+                return user
+            self._local.pop(user_id, None)
+
+        try:
+            cached = await self.redis_client.get(self._key(user_id))
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"사용자 캐시 조회 실패 (DB 조회로 진행): user_id={user_id}, error={e}")
+            cached = None
+
+        if cached:
+            try:
+                user = UserResponse.model_validate_json(cached)
+            except ValueError:
+                user = None
+            if user is not None:
+                self.l2_hits += 1
+                self._put_local(user_id, user)
+                return user
+
+        self.misses += 1
+        return None
+
+    async def put(self, user: UserResponse):
+        """사용자 프로필 저장 (L1 + L2)"""
+        user_id = str(user.user_id)
+        self._put_local(user_id, user)
+        try:
+            await self.redis_client.set(self._key(user_id), user.model_dump_json(), ex=USER_CACHE_TTL)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"사용자 캐시 저장 실패: user_id={user_id}, error={e}")
+
+    async def invalidate(self, user_id: str):
+        """사용자 프로필 캐시 삭제 (L1 + L2)"""
+        self._local.pop(str(user_id), None)
+        try:
+            await self.redis_client.delete(self._key(str(user_id)))
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"사용자 캐시 삭제 실패: user_id={user_id}, error={e}")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.l1_hits + self.l2_hits + self.misses
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.l1_hits + self.l2_hits) / lookups, 4) if lookups else 0.0,
+            "redis_errors": self.redis_errors,
+            "l1_entries": len(self._local),
+            "ttl_seconds": USER_CACHE_TTL,
+            "l1_ttl_seconds": USER_CACHE_L1_TTL,
+        }
+
+
+_user_profile_cache: Optional[UserProfileCache] = None
+
+# 어디서든 이 함수를 호출하여 사용자 프로필 캐시를 가져올 수 있음
+def get_user_profile_cache() -> UserProfileCache:
+    global _user_profile_cache
+    if _user_profile_cache is None:
+        _user_profile_cache = UserProfileCache()
+    return _user_profile_cache
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.api.auth_router import router
 import uvicorn
@@ -5,6 +6,9 @@ from dotenv import load_dotenv
 import logging
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.foundation.http_client import HttpClient
+from app.foundation.google_certs import get_google_cert_cache
+
 # 환경 변수 로드
 load_dotenv()
 
@@ -15,11 +19,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger("auth_service")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """FastAPI 애플리케이션 생명주기 관리"""
+    # 첫 로그인이 인증서 다운로드를 기다리지 않도록 미리 받아둠 (실패해도 첫 검증 때 다시 시도)
+    try:
+        await get_google_cert_cache().get_certs()
+    except Exception as e:
+        logger.warning(f"Google 인증서 사전 로딩 실패: {e}")
+
+    yield
+
+    await get_google_cert_cache().close()
+    await HttpClient.close()
+
 # FastAPI 애플리케이션 인스턴스 생성
 app = FastAPI(
     title="Auth Service",
     description="Sky-C 프로젝트의 사용자 인증 및 계정 관리 서비스",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS 미들웨어 설정
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+import asyncio
+import threading
+from fastapi import APIRouter, HTTPException, Depends, Request, status
 from app.domain.controller.chat_controller import ChatController
 from app.domain.service.chat_service import ChatService
 from app.domain.model.chat_schema import ChatRequest, ChatResponse
+from app.foundation.request_deadline import DEADLINE_HEADER, DeadlineExceeded, parse_deadline
 
 # 라우터 설정
 router = APIRouter()
@@ -11,6 +14,14 @@ def get_chat_controller() -> ChatController:
     """ChatController 인스턴스를 반환합니다."""
     return ChatController()
 
+async def _watch_disconnect(http_request: Request, cancel_event: threading.Event):
+    """클라이언트(게이트웨이) 연결이 끊기면 cancel_event를 설정해 토큰 생성을 중단시킵니다."""
+    while not cancel_event.is_set():
+        if await http_request.is_disconnected():
+            cancel_event.set()
+            return
+        await asyncio.sleep(0.5)
+
 # 엔드포인트 정의
 @router.get("/hello")
 async def hello_world():
@@ -22,16 +33,29 @@ async def hello_world():
 @router.post("/", response_model=ChatResponse, status_code=status.HTTP_200_OK)
 async def chat_with_bot(
     request: ChatRequest,
+    http_request: Request,
     controller: ChatController = Depends(get_chat_controller)
 ) -> ChatResponse:
     """
     챗봇과 대화합니다.
+    X-Request-Deadline 헤더가 있으면 마감 시각이 지나거나 연결이 끊길 때 생성을 중단합니다.
     """
+    deadline = parse_deadline(http_request.headers.get(DEADLINE_HEADER))
+    cancel_event = threading.Event()
+    watcher = asyncio.create_task(_watch_disconnect(http_request, cancel_event))
     try:
-        response = await controller.get_chatbot_response(request)
+        response = await controller.get_chatbot_response(request, deadline, cancel_event)
         return response
+    except DeadlineExceeded as e:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"An error occurred: {e}"
-        )
\ No newline at end of file
+        )
+    finally:
+        cancel_event.set()
+        watcher.cancel()
\ No newline at end of file
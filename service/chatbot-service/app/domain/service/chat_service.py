@@ -1,14 +1,38 @@
 import os
 import re # URL 제거를 위해 re 모듈 추가
+import time
+import threading
+from typing import Optional
 from dotenv import load_dotenv
-from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline, GenerationConfig
+from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline, GenerationConfig, StoppingCriteria, StoppingCriteriaList
 import torch
 from starlette.concurrency import run_in_threadpool # 비동기 처리를 위해 필요
 
+from app.foundation.request_deadline import DeadlineExceeded, remaining_seconds
+
 
 # .env 파일 로드
 load_dotenv()
 
+class DeadlineStoppingCriteria(StoppingCriteria):
+    """
+    마감 시각이 지나거나 클라이언트 연결이 끊기면 토큰 생성을 중단하는 정지 조건.
+    토큰 하나를 생성할 때마다 확인하므로 중단까지 최대 토큰 한 개 생성 시간이 걸린다.
+    """
+
+    def __init__(self, deadline: Optional[float] = None, cancel_event: Optional[threading.Event] = None):
+        self.deadline = deadline
+        self.cancel_event = cancel_event
+        self.stopped = False
+
+    def __call__(self, input_ids, scores, **kwargs):
+        expired = self.deadline is not None and time.time() >= self.deadline
+        cancelled = self.cancel_event is not None and self.cancel_event.is_set()
+        if expired or cancelled:
+            self.stopped = True
+        return torch.full((input_ids.shape[0],), self.stopped, dtype=torch.bool, device=input_ids.device)
+
+
 class ChatService:
     def __init__(self):
         self.model_name = "junyeongc/tcfd-slm-finetuned-polyglot-ko-1.3b-250612"
@@ -50,10 +74,11 @@ class ChatService:
             print(f"Error loading model: {e}")
             raise RuntimeError(f"Failed to load Hugging Face model: {e}")
 
-    def _generate_text(self, prompt: str):
+    def _generate_text(self, prompt: str, stopping_criteria: Optional[DeadlineStoppingCriteria] = None):
         """
         pipeline을 사용하여 텍스트를 생성하는 동기 함수.
         run_in_threadpool로 감싸서 비동기적으로 호출됩니다.
+        stopping_criteria가 주어지면 마감 시각/연결 종료 시 생성을 중단합니다.
         """
         bad_words_list = ["http", "https", ".com", ".org", "www", "html", "php", "co.kr", "작성자", "출처"] # '작성자', '출처' 추가
         bad_words_ids = [self.tokenizer.encode(word, add_special_tokens=False) for word in bad_words_list]
@@ -75,18 +100,34 @@ class ChatService:
         return self.pipe(
             prompt,
             generation_config=gen_config,
+            stopping_criteria=StoppingCriteriaList([stopping_criteria]) if stopping_criteria else None,
         )
 
-    async def get_response_from_model(self, user_message: str) -> str:
+    async def get_response_from_model(
+        self,
+        user_message: str,
+        deadline: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> str:
         """
         사용자 메시지를 받아 Hugging Face 모델로부터 응답을 생성하고 후처리합니다.
+        deadline(epoch 초)이 지나거나 cancel_event가 설정되면 생성을 중단하고 DeadlineExceeded를 발생시킵니다.
         """
         if not self.pipe:
             raise RuntimeError("Model is not loaded. Cannot generate response.")
 
+        remaining = remaining_seconds(deadline)
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded("요청 마감 시각이 지나 응답 생성을 시작하지 않았습니다.")
+
         prompt = f"사용자: {user_message}\n챗봇:"
 
-        generated_text = await run_in_threadpool(self._generate_text, prompt)
+        stopping_criteria = None
+        if deadline is not None or cancel_event is not None:
+            stopping_criteria = DeadlineStoppingCriteria(deadline, cancel_event)
+        generated_text = await run_in_threadpool(self._generate_text, prompt, stopping_criteria)
+        if stopping_criteria is not None and stopping_criteria.stopped:
+            raise DeadlineExceeded("요청 마감 시각 초과 또는 연결 종료로 응답 생성을 중단했습니다.")
 
         if generated_text and len(generated_text) > 0:
             response_text = generated_text[0]['generated_text']
@@ -0,0 +1,28 @@
+"""
+게이트웨이가 전달한 요청 마감 시각(X-Request-Deadline, Unix epoch 밀리초) 처리
+"""
+import time
+from typing import Optional
+
+DEADLINE_HEADER = "x-request-deadline"
+
+
+class DeadlineExceeded(Exception):
+    """요청 마감 시각이 지나 처리를 중단함"""
+
+
+def parse_deadline(value: Optional[str]) -> Optional[float]:
+    """X-Request-Deadline 헤더 값(epoch ms)을 epoch 초로 변환 (없거나 잘못된 값이면 None)"""
+    if not value:
+        return None
+    try:
+        return int(value) / 1000
+    except ValueError:
+        return None
+
+
+def remaining_seconds(deadline: Optional[float]) -> Optional[float]:
+    """마감까지 남은 시간(초), 마감 시각이 없으면 None"""
+    if deadline is None:
+        return None
+    return deadline - time.time()
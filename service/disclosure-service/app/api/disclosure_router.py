@@ -1,13 +1,21 @@
-from fastapi import APIRouter, Depends, Query
+import os
+import hmac
+from fastapi import APIRouter, Depends, Query, Request, Response, Header, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.foundation.database import get_db
+from app.foundation.master_data_store import get_master_data_store
+from app.foundation.answer_write_buffer import get_answer_write_buffer
+from app.foundation.rendered_response import MASTER_DATA_CACHE_CONTROL
 from app.domain.controller.disclosure_controller import DisclosureController
 from app.domain.model.disclosure_schema import (
     DisclosureResponse,
     StructuredDisclosureResponse,
     RequirementResponse,
+    RequirementBulkRequest,
+    RequirementBulkResponse,
     TermResponse,
     ConceptResponse,
     AdoptionStatusResponse
@@ -23,6 +31,38 @@ def get_disclosure_controller(db: Session = Depends(get_db)) -> DisclosureContro
     return DisclosureController(db)
 
 
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 약한 비교 (W/ 접두사 무시)"""
+    candidates = {value.strip() for value in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def check_master_data_etag(request: Request, response: Response):
+    """
+    마스터 데이터 스냅샷 버전을 ETag로 설정하고, 클라이언트가 같은 버전을 갖고 있으면 304로 응답
+    (스냅샷이 없어 DB를 조회하는 동안에는 ETag를 붙이지 않음)
+    """
+    snapshot = get_master_data_store().snapshot
+    if snapshot is None:
+        return
+    headers = {"ETag": snapshot.etag, "Cache-Control": MASTER_DATA_CACHE_CONTROL}
+    if _etag_matches(request.headers.get("if-none-match", ""), snapshot.etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+
+def _split_csv(value: Optional[str]) -> List[str]:
+    """쉼표 구분 쿼리 파라미터 → 목록"""
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
+def _rendered_response(request: Request, name: str) -> Optional[Response]:
+    """현재 스냅샷에 미리 렌더링한 응답이 있으면 반환 (없으면 None → 컨트롤러에서 처리)"""
+    snapshot = get_master_data_store().snapshot
+    rendered = snapshot.rendered.get(name) if snapshot else None
+    return rendered.to_response(request) if rendered else None
+
+
 @router.get("/health")
 async def health_check(
     controller: DisclosureController = Depends(get_disclosure_controller)
@@ -37,10 +77,12 @@ async def health_check(
 
 
 # 기후공시 개념 관련 엔드포인트
-@router.get("/disclosure-data/concepts", 
+@router.get("/disclosure-data/concepts",
+           dependencies=[Depends(check_master_data_etag)], 
            response_model=List[ConceptResponse], 
            summary="기후공시 개념 목록 조회")
 async def get_concepts(
+    request: Request,
     controller: DisclosureController = Depends(get_disclosure_controller)
 ):
     """
@@ -49,10 +91,14 @@ async def get_concepts(
     Returns:
         List[ConceptResponse]: 기후공시 개념 목록
     """
+    rendered = _rendered_response(request, "concepts")
+    if rendered is not None:
+        return rendered
     return await controller.get_concepts()
 
 
-@router.get("/disclosure-data/concepts/{concept_id}", 
+@router.get("/disclosure-data/concepts/{concept_id}",
+           dependencies=[Depends(check_master_data_etag)], 
            response_model=ConceptResponse, 
            summary="기후공시 개념 상세 조회")
 async def get_concept_by_id(
@@ -72,10 +118,12 @@ async def get_concept_by_id(
 
 
 # ISSB 도입 현황 관련 엔드포인트
-@router.get("/disclosure-data/adoption-status", 
+@router.get("/disclosure-data/adoption-status",
+           dependencies=[Depends(check_master_data_etag)], 
            response_model=List[AdoptionStatusResponse], 
            summary="국가별 ISSB 도입 현황 목록 조회")
 async def get_adoption_status(
+    request: Request,
     controller: DisclosureController = Depends(get_disclosure_controller)
 ):
     """
@@ -84,10 +132,14 @@ async def get_adoption_status(
     Returns:
         List[AdoptionStatusResponse]: 국가별 ISSB 도입 현황 목록
     """
+    rendered = _rendered_response(request, "adoption_status")
+    if rendered is not None:
+        return rendered
     return await controller.get_adoption_status()
 
 
-@router.get("/disclosure-data/adoption-status/{adoption_id}", 
+@router.get("/disclosure-data/adoption-status/{adoption_id}",
+           dependencies=[Depends(check_master_data_etag)], 
            response_model=AdoptionStatusResponse, 
            summary="ISSB 도입 현황 상세 조회")
 async def get_adoption_status_by_id(
@@ -106,10 +158,12 @@ async def get_adoption_status_by_id(
     return await controller.get_adoption_status_by_id(adoption_id)
 
 
-@router.get("/disclosure-data/disclosures", 
+@router.get("/disclosure-data/disclosures",
+           dependencies=[Depends(check_master_data_etag)], 
            response_model=StructuredDisclosureResponse, 
            summary="ISSB S2 공시 정보 계층적 구조 조회")
 async def get_disclosures(
+    request: Request,
     controller: DisclosureController = Depends(get_disclosure_controller)
 ):
     """
@@ -134,10 +188,14 @@ async def get_disclosures(
             }
         }
     """
+    rendered = _rendered_response(request, "disclosures")
+    if rendered is not None:
+        return rendered
     return await controller.get_disclosures()
 
 
-@router.get("/disclosure-data/disclosures/list", 
+@router.get("/disclosure-data/disclosures/list",
+           dependencies=[Depends(check_master_data_etag)], 
            response_model=List[DisclosureResponse], 
            summary="ISSB S2 공시 정보 목록 조회 (필터링 지원)")
 async def get_disclosures_list(
@@ -158,7 +216,8 @@ async def get_disclosures_list(
     return await controller.get_disclosures_list(section, category)
 
 
-@router.get("/disclosure-data/disclosures/{disclosure_id}", 
+@router.get("/disclosure-data/disclosures/{disclosure_id}",
+           dependencies=[Depends(check_master_data_etag)], 
            response_model=DisclosureResponse, 
            summary="ISSB S2 공시 정보 상세 조회")
 async def get_disclosure_by_id(
@@ -178,6 +237,7 @@ async def get_disclosure_by_id(
 
 
 @router.get("/disclosure-data/disclosures/{disclosure_id}/requirements",
+           dependencies=[Depends(check_master_data_etag)],
            response_model=List[RequirementResponse],
            summary="특정 공시 지표에 대한 요구사항 목록 조회")
 async def get_requirements_for_disclosure(
@@ -196,7 +256,47 @@ async def get_requirements_for_disclosure(
     return await controller.get_requirements_for_disclosure(disclosure_id)
 
 
+@router.get("/disclosure-data/requirements",
+           dependencies=[Depends(check_master_data_etag)],
+           response_model=RequirementBulkResponse,
+           summary="요구사항 일괄 조회")
+async def get_requirements_bulk(
+    ids: str = Query(..., description="쉼표로 구분한 요구사항 ID (예: s2-g1-1,s2-s1-1)"),
+    fields: Optional[str] = Query(None, description="응답에 포함할 필드 (쉼표 구분, 예: data_required_type,input_schema)"),
+    controller: DisclosureController = Depends(get_disclosure_controller)
+):
+    """
+    여러 요구사항을 한 번에 조회합니다.
+    ID가 많아 URL이 길어지면 POST /disclosure-data/requirements를 사용하세요.
+    
+    Args:
+        ids: 요구사항 ID 목록 (쉼표 구분)
+        fields: 응답 필드 선택 (생략 시 전체, requirement_id는 항상 포함)
+        
+    Returns:
+        RequirementBulkResponse: 요구사항 ID → 요구사항, 찾을 수 없는 ID 목록
+    """
+    return await controller.get_requirements_bulk(_split_csv(ids), _split_csv(fields) or None)
+
+
+@router.post("/disclosure-data/requirements",
+            response_model=RequirementBulkResponse,
+            summary="요구사항 일괄 조회 (POST)")
+async def post_requirements_bulk(
+    request_body: RequirementBulkRequest,
+    controller: DisclosureController = Depends(get_disclosure_controller)
+):
+    """
+    여러 요구사항을 한 번에 조회합니다. (GET과 같은 결과, ID 목록을 본문으로 전달)
+    
+    Returns:
+        RequirementBulkResponse: 요구사항 ID → 요구사항, 찾을 수 없는 ID 목록
+    """
+    return await controller.get_requirements_bulk(request_body.ids, request_body.fields)
+
+
 @router.get("/disclosure-data/requirements/{requirement_id}",
+           dependencies=[Depends(check_master_data_etag)],
            response_model=RequirementResponse,
            summary="요구사항 상세 조회")
 async def get_requirement_by_id(
@@ -217,10 +317,12 @@ async def get_requirement_by_id(
 
 
 # ISSB S2 용어 관련 엔드포인트
-@router.get("/disclosure-data/terms", 
+@router.get("/disclosure-data/terms",
+           dependencies=[Depends(check_master_data_etag)], 
            response_model=List[TermResponse], 
            summary="ISSB S2 용어 목록 조회")
 async def get_terms(
+    request: Request,
     keyword: Optional[str] = Query(None, description="검색 키워드"),
     controller: DisclosureController = Depends(get_disclosure_controller)
 ):
@@ -233,10 +335,15 @@ async def get_terms(
     Returns:
         List[TermResponse]: ISSB S2 용어 목록
     """
+    if not keyword:
+        rendered = _rendered_response(request, "terms")
+        if rendered is not None:
+            return rendered
     return await controller.get_terms(keyword)
 
 
-@router.get("/disclosure-data/terms/{term_id}", 
+@router.get("/disclosure-data/terms/{term_id}",
+           dependencies=[Depends(check_master_data_etag)], 
            response_model=TermResponse, 
            summary="ISSB S2 용어 상세 조회")
 async def get_term_by_id(
@@ -252,4 +359,59 @@ async def get_term_by_id(
     Returns:
         TermResponse: ISSB S2 용어 상세 정보
     """
-    return await controller.get_term_by_id(term_id) 
\ No newline at end of file
+    return await controller.get_term_by_id(term_id) 
+
+
+# 마스터 데이터 스냅샷 관리 엔드포인트
+# (disclosure-data/ 경로는 게이트웨이에서 공개 API이므로 별도 경로 사용)
+# 접근 토큰 (미설정 시 관리 엔드포인트 비활성화)
+MASTER_DATA_ADMIN_TOKEN = os.getenv("MASTER_DATA_ADMIN_TOKEN")
+
+
+def _check_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """X-Admin-Token 헤더 검증 (MASTER_DATA_ADMIN_TOKEN이 없으면 항상 거부)"""
+    if not MASTER_DATA_ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="관리 엔드포인트가 비활성화되어 있습니다.")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, MASTER_DATA_ADMIN_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="관리자 토큰이 올바르지 않습니다.")
+
+
+@router.get("/admin/master-data",
+           summary="마스터 데이터 스냅샷 상태 조회",
+           dependencies=[Depends(_check_admin_token)])
+async def get_master_data_status():
+    """
+    현재 마스터 데이터 스냅샷의 버전(ETag), 적재 시각, 테이블별 건수를 반환합니다.
+    """
+    return get_master_data_store().stats()
+
+
+@router.post("/admin/master-data/reload",
+            summary="마스터 데이터 스냅샷 다시 적재",
+            dependencies=[Depends(_check_admin_token)])
+async def reload_master_data(db: Session = Depends(get_db)):
+    """
+    DB에서 마스터 데이터를 다시 읽어 스냅샷을 교체합니다.
+    초기 데이터를 다시 적재(reseed)한 뒤 호출하세요. 교체 전까지는 이전 스냅샷으로 응답합니다.
+    """
+    try:
+        await run_in_threadpool(get_master_data_store().reload, db)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"마스터 데이터 적재 중 오류 발생: {str(e)}"
+        )
+    return get_master_data_store().stats()
+
+
+@router.get("/admin/answer-write-buffer",
+           summary="답변 쓰기 지연 버퍼 상태 조회",
+           dependencies=[Depends(_check_admin_token)])
+async def get_answer_write_buffer_status():
+    """
+    답변 쓰기 지연 모드의 대기 사용자 수와 반영 건수/실패 횟수를 반환합니다.
+    """
+    write_buffer = get_answer_write_buffer()
+    if write_buffer is None:
+        return {"enabled": False}
+    return await write_buffer.stats()
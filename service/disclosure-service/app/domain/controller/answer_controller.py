@@ -41,7 +41,10 @@ class AnswerController:
                     detail="답변 데이터가 비어있습니다."
                 )
             
-            result = self.answer_service.upsert_answers_batch(user_id, payload)
+            if self.answer_service.write_behind_enabled:
+                result = await self.answer_service.buffer_answers_batch(user_id, payload)
+            else:
+                result = self.answer_service.upsert_answers_batch(user_id, payload)
             
             logger.info(f"답변 배치 처리 완료: user_id={user_id}, 성공={result.processed_count}")
             return result
@@ -66,7 +69,7 @@ class AnswerController:
             List[AnswerResponse]: 사용자 답변 목록
         """
         try:
-            answers = self.answer_service.get_answers_by_user_id(user_id)
+            answers = await self.answer_service.get_answers_by_user_id(user_id)
             
             logger.info(f"답변 목록 조회 완료: user_id={user_id}, 답변 수={len(answers)}")
             return answers
@@ -97,7 +100,7 @@ class AnswerController:
             HTTPException: 답변이 없거나 조회 중 오류 발생 시
         """
         try:
-            answer = self.answer_service.get_answer_by_requirement(user_id, requirement_id)
+            answer = await self.answer_service.get_answer_by_requirement(user_id, requirement_id)
             
             if not answer:
                 raise HTTPException(
@@ -136,7 +139,7 @@ class AnswerController:
             HTTPException: 답변이 없거나 삭제 중 오류 발생 시
         """
         try:
-            success = self.answer_service.delete_answer(user_id, requirement_id)
+            success = await self.answer_service.delete_answer(user_id, requirement_id)
             
             if not success:
                 raise HTTPException(
@@ -1,4 +1,5 @@
 # IFRS S2 지표 및 지속가능성 공시 관련 컨트롤러 
+import os
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
@@ -9,12 +10,17 @@ from app.domain.model.disclosure_schema import (
     DisclosureResponse,
     StructuredDisclosureResponse,
     RequirementResponse,
+    RequirementBulkResponse,
     TermResponse,
     ConceptResponse,
     AdoptionStatusResponse
 )
 
 
+# 요구사항 일괄 조회 한 번에 허용하는 최대 ID 수
+REQUIREMENTS_BULK_MAX_IDS = int(os.getenv("REQUIREMENTS_BULK_MAX_IDS", "500"))
+
+
 class DisclosureController:
     """공시 데이터 관련 비즈니스 로직을 처리하는 컨트롤러"""
     
@@ -195,6 +201,51 @@ class DisclosureController:
                 detail=f"요구사항 조회 중 오류 발생: {str(e)}"
             )
     
+    async def get_requirements_bulk(
+        self,
+        requirement_ids: List[str],
+        fields: Optional[List[str]] = None
+    ) -> RequirementBulkResponse:
+        """여러 요구사항을 한 번에 조회합니다. (찾을 수 없는 ID는 missing으로 반환)"""
+        # 중복 제거 (요청 순서 유지)
+        unique_ids = list(dict.fromkeys(rid.strip() for rid in requirement_ids if rid and rid.strip()))
+        if not unique_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="조회할 요구사항 ID가 없습니다."
+            )
+        if len(unique_ids) > REQUIREMENTS_BULK_MAX_IDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"요구사항은 한 번에 최대 {REQUIREMENTS_BULK_MAX_IDS}개까지 조회할 수 있습니다."
+            )
+
+        include = None
+        if fields:
+            unknown_fields = [field for field in fields if field not in RequirementResponse.model_fields]
+            if unknown_fields:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"알 수 없는 필드입니다: {', '.join(unknown_fields)}"
+                )
+            include = set(fields) | {"requirement_id"}
+
+        try:
+            found = self.disclosure_service.get_requirements_by_ids(unique_ids)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"요구사항 조회 중 오류 발생: {str(e)}"
+            )
+
+        return RequirementBulkResponse(
+            requirements={
+                rid: found[rid].model_dump(mode="json", include=include)
+                for rid in unique_ids if rid in found
+            },
+            missing=[rid for rid in unique_ids if rid not in found]
+        )
+    
     # 용어 관련 메서드
     async def get_terms(self, keyword: Optional[str] = None) -> List[TermResponse]:
         """ISSB S2 용어 목록을 조회합니다."""
@@ -50,6 +50,18 @@ class RequirementResponse(BaseModel):
         from_attributes = True
 
 
+class RequirementBulkRequest(BaseModel):
+    """요구사항 일괄 조회 요청 스키마 (POST, ID가 많을 때)"""
+    ids: List[str] = Field(..., description="조회할 요구사항 ID 목록")
+    fields: Optional[List[str]] = Field(None, description="응답에 포함할 필드 (생략 시 전체, requirement_id는 항상 포함)")
+
+
+class RequirementBulkResponse(BaseModel):
+    """요구사항 일괄 조회 응답 스키마"""
+    requirements: Dict[str, Dict[str, Any]] = Field(..., description="요구사항 ID → 요구사항 (fields로 선택한 필드만)")
+    missing: List[str] = Field(default_factory=list, description="찾을 수 없는 요구사항 ID 목록")
+
+
 class TermResponse(BaseModel):
     """ISSB S2 용어 정의 응답 스키마"""
     term_id: int
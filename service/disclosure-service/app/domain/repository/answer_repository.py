@@ -1,16 +1,20 @@
 # Answer 도메인 Repository
+import os
 import logging
 from typing import Optional, Dict, Any, List
 from uuid import UUID
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy import and_
+from sqlalchemy import and_, literal_column
 
 from app.domain.model.answer_entity import Answer
 from app.domain.model.answer_schema import AnswerResponse
 
 logger = logging.getLogger("disclosure-service")
 
+# 다건 UPSERT 한 문장에 담는 최대 행 수
+ANSWER_UPSERT_CHUNK_SIZE = int(os.getenv("ANSWER_UPSERT_CHUNK_SIZE", "500"))
+
 class AnswerRepository:
     """Answer 도메인 데이터 액세스 계층"""
     
@@ -75,6 +79,56 @@ class AnswerRepository:
             logger.error(f"답변 UPSERT 실패: user_id={user_id}, requirement_id={requirement_id}, error={str(e)}")
             raise e
     
+    def upsert_answers_bulk(
+        self,
+        user_id: UUID,
+        rows: List[Dict[str, Any]]
+    ) -> Dict[str, bool]:
+        """
+        여러 답변을 한 문장의 다건 INSERT ... ON CONFLICT DO UPDATE로 UPSERT 처리합니다.
+        생성/수정 여부는 RETURNING (xmax = 0)으로 받으므로 사전 조회가 필요 없습니다.
+        
+        Args:
+            user_id: 사용자 UUID
+            rows: requirement_id와 답변 컬럼 값을 담은 딕셔너리 목록
+                  (모든 행의 키가 같아야 하며, requirement_id는 중복되면 안 됨)
+            
+        Returns:
+            Dict[str, bool]: 요구사항 ID → 새로 생성되었는지 여부
+        """
+        results: Dict[str, bool] = {}
+        try:
+            for start in range(0, len(rows), ANSWER_UPSERT_CHUNK_SIZE):
+                chunk = rows[start:start + ANSWER_UPSERT_CHUNK_SIZE]
+                stmt = insert(Answer).values([{"user_id": user_id, **row} for row in chunk])
+                
+                # 중복 시 업데이트할 컬럼 정의 (answered_at 제외)
+                update_columns = {
+                    key: stmt.excluded[key]
+                    for key in chunk[0].keys()
+                    if key not in ['user_id', 'requirement_id', 'answered_at']
+                }
+                update_columns['last_edited_at'] = stmt.excluded.last_edited_at
+                
+                upsert_stmt = stmt.on_conflict_do_update(
+                    index_elements=['user_id', 'requirement_id'],
+                    set_=update_columns
+                ).returning(
+                    Answer.requirement_id,
+                    # 방금 INSERT된 행은 xmax가 0, 충돌로 UPDATE된 행은 0이 아님
+                    literal_column("(xmax = 0)").label("inserted")
+                )
+                
+                for requirement_id, inserted in self.db.execute(upsert_stmt):
+                    results[requirement_id] = bool(inserted)
+            
+            logger.info(f"답변 다건 UPSERT 성공: user_id={user_id}, 행 수={len(rows)}")
+            return results
+            
+        except Exception as e:
+            logger.error(f"답변 다건 UPSERT 실패: user_id={user_id}, 행 수={len(rows)}, error={str(e)}")
+            raise e
+    
     def get_answer_by_user_and_requirement(
         self, 
         user_id: UUID, 
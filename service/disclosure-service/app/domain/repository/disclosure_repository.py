@@ -48,6 +48,20 @@ class DisclosureRepository:
             IssbS2Requirement.requirement_id == requirement_id
         ).first()
 
+    def get_requirements_by_ids(self, requirement_ids: List[str]) -> List[IssbS2Requirement]:
+        """여러 ID의 요구사항을 한 번의 IN 쿼리로 조회합니다."""
+        if not requirement_ids:
+            return []
+        return self.db.query(IssbS2Requirement).filter(
+            IssbS2Requirement.requirement_id.in_(requirement_ids)
+        ).all()
+
+    def get_all_requirements(self) -> List[IssbS2Requirement]:
+        """모든 요구사항을 공시 ID, 요구사항 순서대로 조회합니다."""
+        return self.db.query(IssbS2Requirement).order_by(
+            IssbS2Requirement.disclosure_id, IssbS2Requirement.requirement_order
+        ).all()
+
     def get_requirements_by_disclosure_id(self, disclosure_id: str) -> List[IssbS2Requirement]:
         """공시 ID로 관련 요구사항들을 조회합니다."""
         return self.db.query(IssbS2Requirement).filter(
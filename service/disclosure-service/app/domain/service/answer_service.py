@@ -1,13 +1,16 @@
 # Answer 도메인 Service
 import logging
 import json
-from typing import Dict, Any, List, Optional
-from uuid import UUID
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+from uuid import UUID, NAMESPACE_URL, uuid5
+from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 
 from app.domain.repository.answer_repository import AnswerRepository
 from app.domain.repository.disclosure_repository import DisclosureRepository
+from app.foundation.master_data_store import get_master_data_store
+from app.foundation.answer_write_buffer import get_answer_write_buffer
+from app.foundation.database import SessionLocal
 from app.domain.model.answer_schema import (
     AnswerBatchUpdatePayload, 
     AnswerBatchResponse,
@@ -23,6 +26,12 @@ class AnswerService:
         self.db = db
         self.answer_repository = answer_repository
         self.disclosure_repository = disclosure_repository
+        self.write_buffer = get_answer_write_buffer()
+    
+    @property
+    def write_behind_enabled(self) -> bool:
+        """쓰기 지연 모드 사용 여부 (flusher가 동작 중일 때만)"""
+        return self.write_buffer is not None and self.write_buffer.running
     
     def _map_answer_data_to_columns(self, answer_data: Any, data_required_type: str) -> Dict[str, Any]:
         """
@@ -98,17 +107,34 @@ class AnswerService:
         
         return column_data
     
+    def _get_requirement_types(self, requirement_ids: List[str]) -> Dict[str, str]:
+        """요구사항 ID → data_required_type (마스터 데이터 스냅샷, 없으면 한 번의 IN 쿼리)"""
+        snapshot = get_master_data_store().snapshot
+        if snapshot:
+            return {
+                requirement_id: snapshot.requirements_by_id[requirement_id].data_required_type
+                for requirement_id in requirement_ids
+                if requirement_id in snapshot.requirements_by_id
+            }
+        requirements = self.disclosure_repository.get_requirements_by_ids(requirement_ids)
+        return {r.requirement_id: r.data_required_type for r in requirements}
+    
     def upsert_answers_batch(
         self, 
         user_id: UUID, 
-        payload: AnswerBatchUpdatePayload
+        payload: AnswerBatchUpdatePayload,
+        raise_on_error: bool = False
     ) -> AnswerBatchResponse:
         """
         여러 답변을 배치로 UPSERT 처리합니다.
+        요구사항 타입은 한 번에 조회하고, 컬럼 매핑은 메모리에서 한 뒤
+        다건 INSERT ... ON CONFLICT DO UPDATE 한 문장으로 저장합니다.
         
         Args:
             user_id: 사용자 UUID
             payload: 배치 답변 업데이트 요청 데이터
+            raise_on_error: True이면 DB 오류 시 롤백 후 예외를 그대로 전달
+                (요구사항별 실패와 구분해야 하는 쓰기 지연 flusher용)
             
         Returns:
             AnswerBatchResponse: 처리 결과
@@ -122,63 +148,62 @@ class AnswerService:
         logger.info(f"답변 배치 처리 시작: user_id={user_id}, 답변 수={len(payload.answers)}")
         
         try:
+            # 1. 요구사항의 데이터 타입 일괄 조회
+            requirement_ids = list(dict.fromkeys(answer.requirement_id for answer in payload.answers))
+            requirement_types = self._get_requirement_types(requirement_ids)
+            
+            # 2. 답변 데이터를 컬럼에 매핑 (같은 요구사항이 여러 번 오면 마지막 값 사용)
+            rows: Dict[str, Dict[str, Any]] = {}
+            valid_count = 0
             for answer_payload in payload.answers:
+                requirement_id = answer_payload.requirement_id
+                data_required_type = requirement_types.get(requirement_id)
+                if data_required_type is None:
+                    logger.error(f"요구사항을 찾을 수 없음: {requirement_id}")
+                    failed_count += 1
+                    failed_requirements.append(requirement_id)
+                    continue
+                
                 try:
-                    requirement_id = answer_payload.requirement_id
-                    answer_data = answer_payload.answer_data
-                    
-                    # 요구사항의 데이터 타입 조회 (DisclosureRepository 사용)
-                    requirement = self.disclosure_repository.get_requirement_by_id(requirement_id)
-                    if not requirement:
-                        logger.error(f"요구사항을 찾을 수 없음: {requirement_id}")
-                        failed_count += 1
-                        failed_requirements.append(requirement_id)
-                        continue
-                    
-                    data_required_type = requirement.data_required_type
-                    logger.debug(f"요구사항 {requirement_id}의 데이터 타입: {data_required_type}")
-                    
-                    # 기존 답변 존재 여부 확인 (생성/수정 카운트를 위해)
-                    existing_answer = self.answer_repository.get_answer_by_user_and_requirement(
-                        user_id, requirement_id
-                    )
-                    is_update = existing_answer is not None
-                    
-                    # 답변 데이터를 적절한 컬럼에 매핑
-                    column_data = self._map_answer_data_to_columns(answer_data, data_required_type)
-                    
-                    # UPSERT 수행
-                    answer = self.answer_repository.upsert_answer(
-                        user_id=user_id,
-                        requirement_id=requirement_id,
-                        data_to_update=column_data
-                    )
-                    
-                    if answer:
-                        processed_count += 1
-                        if is_update:
-                            updated_count += 1
-                        else:
-                            created_count += 1
-                        logger.debug(f"답변 처리 성공: {requirement_id} ({'업데이트' if is_update else '생성'})")
-                    else:
+                    column_data = self._map_answer_data_to_columns(answer_payload.answer_data, data_required_type)
+                except Exception as e:
+                    failed_count += 1
+                    failed_requirements.append(requirement_id)
+                    logger.error(f"답변 처리 중 예외 발생: {requirement_id}, error={str(e)}")
+                    continue
+                
+                rows.pop(requirement_id, None)  # 마지막 값의 순서로 다시 넣음
+                rows[requirement_id] = {"requirement_id": requirement_id, **column_data}
+                valid_count += 1
+            
+            # 3. 다건 UPSERT (생성/수정 여부는 RETURNING으로 받음)
+            if rows:
+                inserted_by_requirement = self.answer_repository.upsert_answers_bulk(user_id, list(rows.values()))
+                
+                for requirement_id in rows:
+                    if requirement_id not in inserted_by_requirement:
                         failed_count += 1
                         failed_requirements.append(requirement_id)
                         logger.error(f"답변 처리 실패: {requirement_id}")
-                        
-                except Exception as e:
-                    failed_count += 1
-                    failed_requirements.append(answer_payload.requirement_id)
-                    logger.error(f"답변 처리 중 예외 발생: {answer_payload.requirement_id}, error={str(e)}")
+                
+                created_count = sum(1 for inserted in inserted_by_requirement.values() if inserted)
+                # 같은 요구사항이 중복으로 온 경우 첫 번째는 생성, 나머지는 수정으로 집계 (기존과 동일)
+                processed_count = valid_count - (len(rows) - len(inserted_by_requirement))
+                updated_count = processed_count - created_count
             
             # 트랜잭션 커밋
             self.db.commit()
-            logger.info(f"답변 배치 처리 완료 및 커밋: user_id={user_id}, 성공={processed_count}, 실패={failed_count}")
+            logger.info(
+                f"답변 배치 처리 완료 및 커밋: user_id={user_id}, 성공={processed_count} "
+                f"(생성={created_count}, 수정={updated_count}), 실패={failed_count}"
+            )
             
         except Exception as e:
             # 트랜잭션 롤백
             self.db.rollback()
             logger.error(f"답변 배치 처리 중 심각한 오류 발생, 롤백: user_id={user_id}, error={str(e)}")
+            if raise_on_error:
+                raise
             # 전체 실패로 처리
             failed_count = len(payload.answers)
             failed_requirements = [answer.requirement_id for answer in payload.answers]
@@ -199,9 +224,95 @@ class AnswerService:
             failed_requirements=failed_requirements
         )
     
-    def get_answers_by_user_id(self, user_id: UUID) -> List[AnswerResponse]:
+    async def buffer_answers_batch(
+        self, 
+        user_id: UUID, 
+        payload: AnswerBatchUpdatePayload
+    ) -> AnswerBatchResponse:
+        """
+        쓰기 지연 모드: 답변을 Redis 대기 해시에 넣고 바로 응답합니다.
+        DB 반영은 백그라운드 flusher가 모아서 처리하므로 생성/수정 건수는 0으로 응답합니다.
+        Redis에 저장하지 못하면 바로 DB에 저장합니다.
+        
+        Args:
+            user_id: 사용자 UUID
+            payload: 배치 답변 업데이트 요청 데이터
+            
+        Returns:
+            AnswerBatchResponse: 처리 결과
+        """
+        # 없는 요구사항은 대기열에 넣지 않고 바로 실패 처리 (반영 시 재시도되지 않도록)
+        requirement_ids = list(dict.fromkeys(answer.requirement_id for answer in payload.answers))
+        requirement_types = self._get_requirement_types(requirement_ids)
+        accepted = [answer for answer in payload.answers if answer.requirement_id in requirement_types]
+        failed_requirements = [answer.requirement_id for answer in payload.answers if answer.requirement_id not in requirement_types]
+        for requirement_id in failed_requirements:
+            logger.error(f"요구사항을 찾을 수 없음: {requirement_id}")
+        
+        try:
+            await self.write_buffer.buffer(user_id, accepted)
+        except Exception as e:
+            logger.error(f"답변 대기열 저장 실패, DB에 바로 저장: user_id={user_id}, error={str(e)}")
+            return self.upsert_answers_batch(user_id, payload)
+        
+        processed_count = len(accepted)
+        failed_count = len(failed_requirements)
+        logger.info(f"답변 대기열 저장 완료: user_id={user_id}, 성공={processed_count}, 실패={failed_count}")
+        
+        return AnswerBatchResponse(
+            success=failed_count == 0,
+            message=f"답변이 저장 대기열에 반영되었습니다. (성공: {processed_count}, 실패: {failed_count})",
+            processed_count=processed_count,
+            created_count=0,
+            updated_count=0,
+            failed_count=failed_count,
+            failed_requirements=failed_requirements
+        )
+    
+    def _merge_pending_answers(
+        self,
+        user_id: UUID,
+        answers: List[AnswerResponse],
+        pending: Dict[str, Tuple[Any, float]]
+    ) -> List[AnswerResponse]:
+        """DB 답변 위에 아직 반영되지 않은 답변을 덮어씀 (DB 반영 후와 같은 컬럼 매핑)"""
+        if not pending:
+            return answers
+        merged = {answer.requirement_id: answer for answer in answers}
+        requirement_types = self._get_requirement_types(list(pending))
+        for requirement_id, (answer_data, buffered_at) in pending.items():
+            data_required_type = requirement_types.get(requirement_id)
+            if data_required_type is None:
+                continue
+            column_data = self._map_answer_data_to_columns(answer_data, data_required_type)
+            column_data.pop("last_edited_at", None)
+            edited_at = datetime.fromtimestamp(buffered_at, tz=timezone.utc)
+            existing = merged.get(requirement_id)
+            merged[requirement_id] = AnswerResponse(
+                # 아직 DB에 없는 답변은 사용자/요구사항으로 정해지는 임시 ID
+                answer_id=existing.answer_id if existing else uuid5(NAMESPACE_URL, f"answer:{user_id}:{requirement_id}"),
+                user_id=user_id,
+                requirement_id=requirement_id,
+                answered_at=existing.answered_at if existing else edited_at,
+                last_edited_at=edited_at,
+                **column_data
+            )
+        return list(merged.values())
+    
+    async def _get_pending_answers(self, user_id: UUID, requirement_id: Optional[str] = None) -> Dict[str, Tuple[Any, float]]:
+        """반영 대기 중인 답변 (쓰기 지연 모드가 아니거나 Redis 오류면 빈 dict)"""
+        if self.write_buffer is None:
+            return {}
+        try:
+            return await self.write_buffer.get_pending(user_id, requirement_id)
+        except Exception as e:
+            logger.error(f"반영 대기 답변 조회 실패, DB 값만 반환: user_id={user_id}, error={str(e)}")
+            return {}
+    
+    async def get_answers_by_user_id(self, user_id: UUID) -> List[AnswerResponse]:
         """
         사용자의 모든 답변을 조회합니다.
+        쓰기 지연 모드에서는 아직 DB에 반영되지 않은 답변을 덮어써서 반환합니다.
         
         Args:
             user_id: 사용자 UUID
@@ -211,19 +322,22 @@ class AnswerService:
         """
         try:
             # Repository가 이미 변환된 DTO를 주므로, 그대로 반환
-            return self.answer_repository.get_answers_by_user_id(user_id)
+            answers = self.answer_repository.get_answers_by_user_id(user_id)
+            pending = await self._get_pending_answers(user_id)
+            return self._merge_pending_answers(user_id, answers, pending)
             
         except Exception as e:
             logger.error(f"사용자 답변 목록 조회 실패: user_id={user_id}, error={str(e)}")
             return []
     
-    def get_answer_by_requirement(
+    async def get_answer_by_requirement(
         self, 
         user_id: UUID, 
         requirement_id: str
     ) -> Optional[AnswerResponse]:
         """
         특정 요구사항에 대한 사용자 답변을 조회합니다.
+        쓰기 지연 모드에서는 아직 DB에 반영되지 않은 값이 우선합니다.
         
         Args:
             user_id: 사용자 UUID
@@ -234,15 +348,19 @@ class AnswerService:
         """
         try:
             # Repository가 이미 변환된 DTO를 주므로, 그대로 반환
-            return self.answer_repository.get_answer_by_user_and_requirement(user_id, requirement_id)
+            answer = self.answer_repository.get_answer_by_user_and_requirement(user_id, requirement_id)
+            pending = await self._get_pending_answers(user_id, requirement_id)
+            merged = self._merge_pending_answers(user_id, [answer] if answer else [], pending)
+            return merged[0] if merged else None
             
         except Exception as e:
             logger.error(f"답변 조회 실패: user_id={user_id}, requirement_id={requirement_id}, error={str(e)}")
             return None
     
-    def delete_answer(self, user_id: UUID, requirement_id: str) -> bool:
+    async def delete_answer(self, user_id: UUID, requirement_id: str) -> bool:
         """
         특정 답변을 삭제합니다.
+        쓰기 지연 모드에서는 반영 대기 중인 값도 함께 제거합니다.
         
         Args:
             user_id: 사용자 UUID
@@ -251,6 +369,16 @@ class AnswerService:
         Returns:
             bool: 삭제 성공 여부
         """
+        if self.write_buffer is None:
+            return self._delete_answer_row(user_id, requirement_id)
+        
+        # 진행 중인 반영의 UPSERT가 삭제 뒤에 커밋되지 않도록 사용자 잠금 안에서 삭제
+        async with self.write_buffer.user_lock(user_id):
+            discarded = await self.write_buffer.discard(user_id, requirement_id)
+            return self._delete_answer_row(user_id, requirement_id) or discarded
+    
+    def _delete_answer_row(self, user_id: UUID, requirement_id: str) -> bool:
+        """DB의 답변 행 삭제 및 커밋"""
         try:
             result = self.answer_repository.delete_answer(user_id, requirement_id)
             if result:
@@ -261,4 +389,14 @@ class AnswerService:
         except Exception as e:
             self.db.rollback()
             logger.error(f"답변 삭제 실패 및 롤백: user_id={user_id}, requirement_id={requirement_id}, error={str(e)}")
-            return False 
\ No newline at end of file
+            return False
+
+
+def persist_buffered_answers(user_id: UUID, payload: AnswerBatchUpdatePayload) -> AnswerBatchResponse:
+    """쓰기 지연 버퍼의 답변을 DB에 반영 (flusher가 스레드풀에서 호출, 요청 세션과 별도의 세션 사용)"""
+    db = SessionLocal()
+    try:
+        service = AnswerService(db, AnswerRepository(db), DisclosureRepository(db))
+        return service.upsert_answers_batch(user_id, payload, raise_on_error=True)
+    finally:
+        db.close()
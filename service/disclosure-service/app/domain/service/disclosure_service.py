@@ -4,6 +4,7 @@ from uuid import UUID
 from collections import defaultdict
 
 from app.domain.repository.disclosure_repository import DisclosureRepository
+from app.foundation.master_data_store import MasterDataSnapshot, get_master_data_store
 from app.domain.model.disclosure_schema import (
     DisclosureResponse,
     DisclosureItem,
@@ -20,14 +21,21 @@ from app.domain.model.disclosure_schema import (
 
 
 class DisclosureService:
-    """공시 데이터 관련 비즈니스 로직 서비스"""
+    """
+    공시 데이터 관련 비즈니스 로직 서비스
+    마스터 데이터 스냅샷이 있으면 스냅샷에서, 없으면(적재 실패 등) DB에서 조회합니다.
+    """
     
-    def __init__(self, repo: DisclosureRepository):
+    def __init__(self, repo: DisclosureRepository, snapshot: Optional[MasterDataSnapshot] = None):
         self.repo = repo
+        # 요청 하나가 처리되는 동안 같은 스냅샷을 보도록 생성 시점에 고정
+        self.snapshot = snapshot or get_master_data_store().snapshot
 
     # ISSB S2 Disclosure 관련 서비스 메서드
     def get_disclosure_by_id(self, disclosure_id: str) -> Optional[DisclosureResponse]:
         """ID로 공시 정보를 조회합니다."""
+        if self.snapshot:
+            return self.snapshot.disclosures_by_id.get(disclosure_id)
         disclosure = self.repo.get_disclosure_by_id(disclosure_id)
         if disclosure:
             return DisclosureResponse.from_orm(disclosure)
@@ -35,21 +43,30 @@ class DisclosureService:
 
     def get_all_disclosures(self) -> List[DisclosureResponse]:
         """모든 공시 정보를 조회합니다."""
+        if self.snapshot:
+            return list(self.snapshot.disclosures)
         disclosures = self.repo.get_all_disclosures()
         return [DisclosureResponse.from_orm(d) for d in disclosures]
 
     def get_disclosures_by_section(self, section: str) -> List[DisclosureResponse]:
         """섹션별 공시 정보를 조회합니다."""
+        if self.snapshot:
+            return list(self.snapshot.disclosures_by_section.get(section, ()))
         disclosures = self.repo.get_disclosures_by_section(section)
         return [DisclosureResponse.from_orm(d) for d in disclosures]
 
     def get_disclosures_by_category(self, category: str) -> List[DisclosureResponse]:
         """카테고리별 공시 정보를 조회합니다."""
+        if self.snapshot:
+            return list(self.snapshot.disclosures_by_category.get(category, ()))
         disclosures = self.repo.get_disclosures_by_category(category)
         return [DisclosureResponse.from_orm(d) for d in disclosures]
 
     def get_structured_disclosures(self) -> StructuredDisclosureResponse:
         """모든 공시 정보를 계층적 구조로 조회합니다."""
+        if self.snapshot:
+            return self.snapshot.structured_disclosures
+        
         # 모든 공시 정보를 가져옵니다
         disclosures = self.repo.get_all_disclosures()
         
@@ -75,19 +92,36 @@ class DisclosureService:
     # ISSB S2 Requirement 관련 서비스 메서드
     def get_requirement_by_id(self, requirement_id: str) -> Optional[RequirementResponse]:
         """ID로 요구사항을 조회합니다."""
+        if self.snapshot:
+            return self.snapshot.requirements_by_id.get(requirement_id)
         requirement = self.repo.get_requirement_by_id(requirement_id)
         if requirement:
             return RequirementResponse.from_orm(requirement)
         return None
 
+    def get_requirements_by_ids(self, requirement_ids: List[str]) -> Dict[str, RequirementResponse]:
+        """여러 ID의 요구사항을 조회합니다. (찾은 요구사항만 ID → 요구사항으로 반환)"""
+        if self.snapshot:
+            return {
+                requirement_id: self.snapshot.requirements_by_id[requirement_id]
+                for requirement_id in requirement_ids
+                if requirement_id in self.snapshot.requirements_by_id
+            }
+        requirements = self.repo.get_requirements_by_ids(requirement_ids)
+        return {r.requirement_id: RequirementResponse.from_orm(r) for r in requirements}
+
     def get_requirements_by_disclosure_id(self, disclosure_id: str) -> List[RequirementResponse]:
         """공시 ID로 관련 요구사항들을 조회합니다."""
+        if self.snapshot:
+            return list(self.snapshot.requirements_by_disclosure.get(disclosure_id, ()))
         requirements = self.repo.get_requirements_by_disclosure_id(disclosure_id)
         return [RequirementResponse.from_orm(r) for r in requirements]
 
     # ISSB S2 Term 관련 서비스 메서드
     def get_term_by_id(self, term_id: int) -> Optional[TermResponse]:
         """ID로 용어를 조회합니다."""
+        if self.snapshot:
+            return self.snapshot.terms_by_id.get(term_id)
         term = self.repo.get_term_by_id(term_id)
         if term:
             return TermResponse.from_orm(term)
@@ -95,17 +129,23 @@ class DisclosureService:
 
     def get_all_terms(self) -> List[TermResponse]:
         """모든 용어를 조회합니다."""
+        if self.snapshot:
+            return list(self.snapshot.terms)
         terms = self.repo.get_all_terms()
         return [TermResponse.from_orm(t) for t in terms]
 
     def search_terms(self, keyword: str) -> List[TermResponse]:
         """키워드로 용어를 검색합니다."""
+        if self.snapshot:
+            return self.snapshot.search_terms(keyword)
         terms = self.repo.search_terms(keyword)
         return [TermResponse.from_orm(t) for t in terms]
 
     # Climate Disclosure Concept 관련 서비스 메서드
     def get_concept_by_id(self, concept_id: int) -> Optional[ConceptResponse]:
         """ID로 기후공시 개념을 조회합니다."""
+        if self.snapshot:
+            return self.snapshot.concepts_by_id.get(concept_id)
         concept = self.repo.get_concept_by_id(concept_id)
         if concept:
             return ConceptResponse.from_orm(concept)
@@ -113,17 +153,23 @@ class DisclosureService:
 
     def get_climate_disclosure_concepts(self) -> List[ConceptResponse]:
         """모든 기후공시 개념을 조회하여 Pydantic 스키마로 반환합니다."""
+        if self.snapshot:
+            return list(self.snapshot.concepts)
         concepts = self.repo.get_all_concepts()
         return [ConceptResponse.from_orm(concept) for concept in concepts]
 
     def get_concepts_by_category(self, category: str) -> List[ConceptResponse]:
         """카테고리별 기후공시 개념을 조회합니다."""
+        if self.snapshot:
+            return list(self.snapshot.concepts_by_category.get(category, ()))
         concepts = self.repo.get_concepts_by_category(category)
         return [ConceptResponse.from_orm(c) for c in concepts]
 
     # ISSB Adoption Status 관련 서비스 메서드
     def get_adoption_status_by_id(self, adoption_id: int) -> Optional[AdoptionStatusResponse]:
         """ID로 ISSB 도입 현황을 조회합니다."""
+        if self.snapshot:
+            return self.snapshot.adoption_status_by_id.get(adoption_id)
         status = self.repo.get_adoption_status_by_id(adoption_id)
         if status:
             return AdoptionStatusResponse.from_orm(status)
@@ -131,11 +177,15 @@ class DisclosureService:
 
     def get_issb_adoption_status(self) -> List[AdoptionStatusResponse]:
         """모든 국가별 ISSB 도입 현황을 조회하여 Pydantic 스키마로 반환합니다."""
+        if self.snapshot:
+            return list(self.snapshot.adoption_status)
         adoption_status_list = self.repo.get_all_adoption_status()
         return [AdoptionStatusResponse.from_orm(status) for status in adoption_status_list]
 
     def get_adoption_status_by_country(self, country: str) -> Optional[AdoptionStatusResponse]:
         """국가명으로 ISSB 도입 현황을 조회합니다."""
+        if self.snapshot:
+            return self.snapshot.adoption_status_by_country.get(country)
         status = self.repo.get_adoption_status_by_country(country)
         if status:
             return AdoptionStatusResponse.from_orm(status)
@@ -0,0 +1,410 @@
+"""
+답변 자동 저장 쓰기 지연(write-behind) 버퍼
+자동 저장은 입력할 때마다 같은 요구사항 답변을 여러 번 덮어쓰므로,
+ANSWER_WRITE_BEHIND_ENABLED=true이면 답변을 사용자별 Redis 해시에 먼저 넣고 바로 응답한 뒤
+백그라운드 flusher가 모아서 한 번의 배치 UPSERT로 Postgres에 반영한다.
+
+- 대기 해시 "answers:pending:{user_id}": requirement_id → {"d": answer_data, "t": 저장 시각} (마지막 값만 남음)
+- 대기 사용자 ZSET "answers:pending-users": user_id → 첫 대기 시각
+- 반영 조건: 사용자별 대기 답변이 ANSWER_FLUSH_MAX_PENDING개 이상(즉시) 또는 첫 대기 후 ANSWER_FLUSH_MAX_DELAY초 경과
+- 반영할 때는 대기 해시를 "answers:flushing:{user_id}"로 원자적으로 옮긴 뒤 DB에 쓰고,
+  성공하면 삭제, 실패하면 대기 해시로 되돌림 (그 사이 들어온 더 새로운 값이 우선)
+- 반영 중 프로세스가 죽어 ANSWER_FLUSH_STALE_SECONDS초 넘게 남은 반영 해시는 대기 해시로 되돌려 다시 반영
+- 반영과 답변 삭제는 사용자별 잠금 "answers:lock:{user_id}"로 서로 배제한다
+  (반영 중인 UPSERT가 삭제 뒤에 커밋되어 삭제한 답변이 되살아나지 않도록)
+  잠금은 잡고 있는 동안 ANSWER_FLUSH_STALE_SECONDS / 3초마다 연장하므로 DB 반영이 오래 걸려도 풀리지 않는다
+- DB 오류(롤백)만 재시도하고, 없는 요구사항처럼 다시 해도 실패하는 답변은 버린다
+- 종료(lifespan) 시 남은 대기 답변을 모두 반영하고, 반영하지 못한 값은 Redis에 남아 다음 기동 때 반영된다
+  (Redis 재시작에도 남도록 Redis는 AOF(appendonly)로 운영)
+- 조회는 DB 값 위에 아직 반영되지 않은 값(반영 중 → 대기 순)을 덮어써서 read-your-writes를 유지한다
+- 여러 인스턴스가 같은 Redis를 써도 사용자별 반영은 한 번에 하나만 진행된다
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from dotenv import load_dotenv
+from fastapi.concurrency import run_in_threadpool
+
+from app.domain.model.answer_schema import AnswerBatchUpdatePayload, AnswerBatchResponse, AnswerUpdatePayload
+from app.foundation.redis_client import get_redis_client
+
+load_dotenv()
+
+logger = logging.getLogger("disclosure-service")
+
+ANSWER_WRITE_BEHIND_ENABLED = os.getenv("ANSWER_WRITE_BEHIND_ENABLED", "false").lower() in ("true", "1", "yes")
+ANSWER_FLUSH_MAX_PENDING = int(os.getenv("ANSWER_FLUSH_MAX_PENDING", "50"))
+ANSWER_FLUSH_MAX_DELAY = float(os.getenv("ANSWER_FLUSH_MAX_DELAY", "5"))
+ANSWER_FLUSH_POLL_INTERVAL = float(os.getenv("ANSWER_FLUSH_POLL_INTERVAL", "1"))
+ANSWER_FLUSH_STALE_SECONDS = float(os.getenv("ANSWER_FLUSH_STALE_SECONDS", "60"))
+ANSWER_FLUSH_SHUTDOWN_TIMEOUT = float(os.getenv("ANSWER_FLUSH_SHUTDOWN_TIMEOUT", "20"))
+# 답변 삭제가 진행 중인 반영을 기다리는 최대 시간(초)
+ANSWER_LOCK_WAIT_SECONDS = float(os.getenv("ANSWER_LOCK_WAIT_SECONDS", "10"))
+
+PENDING_KEY_PREFIX = "answers:pending:"
+FLUSHING_KEY_PREFIX = "answers:flushing:"
+PENDING_USERS_KEY = "answers:pending-users"
+FLUSHING_USERS_KEY = "answers:flushing-users"
+LOCK_KEY_PREFIX = "answers:lock:"
+
+# KEYS: 대기 해시, 대기 사용자 ZSET / ARGV: 현재 시각, user_id, requirement_id1, 값1, ...
+_BUFFER_SCRIPT = """
+for i = 3, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('ZADD', KEYS[2], 'NX', ARGV[1], ARGV[2])
+return redis.call('HLEN', KEYS[1])
+"""
+
+# 대기 해시 → 반영 해시 (이미 반영 중이면 0)
+# KEYS: 대기 해시, 반영 해시, 대기 사용자 ZSET, 반영 사용자 ZSET / ARGV: 현재 시각, user_id
+_CLAIM_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    return 0
+end
+redis.call('ZREM', KEYS[3], ARGV[2])
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('RENAME', KEYS[1], KEYS[2])
+redis.call('ZADD', KEYS[4], ARGV[1], ARGV[2])
+return 1
+"""
+
+# 반영 해시 → 대기 해시 (대기 해시에 더 새로운 값이 있으면 유지)
+# KEYS/ARGV: _CLAIM_SCRIPT와 같음
+_RESTORE_SCRIPT = """
+local entries = redis.call('HGETALL', KEYS[2])
+for i = 1, #entries, 2 do
+    redis.call('HSETNX', KEYS[1], entries[i], entries[i + 1])
+end
+if #entries > 0 then
+    redis.call('ZADD', KEYS[3], 'NX', ARGV[1], ARGV[2])
+end
+redis.call('DEL', KEYS[2])
+redis.call('ZREM', KEYS[4], ARGV[2])
+return #entries / 2
+"""
+
+# 잠금을 잡은 쪽만 해제 / KEYS: 잠금 키 / ARGV: 토큰
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# 잠금을 잡은 쪽만 만료 시간 연장 / KEYS: 잠금 키 / ARGV: 토큰, 만료 시간(ms)
+_RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# 대기 답변을 DB에 반영하는 함수 (스레드풀에서 호출, DB 오류면 예외)
+PersistFunc = Callable[[UUID, AnswerBatchUpdatePayload], AnswerBatchResponse]
+
+
+class AnswerWriteBuffer:
+    """Redis 기반 답변 쓰기 지연 버퍼와 백그라운드 flusher"""
+
+    def __init__(self, redis_client=None):
+        self.redis_client = redis_client or get_redis_client()
+        self._buffer_script = self.redis_client.register_script(_BUFFER_SCRIPT)
+        self._claim_script = self.redis_client.register_script(_CLAIM_SCRIPT)
+        self._restore_script = self.redis_client.register_script(_RESTORE_SCRIPT)
+        self._release_script = self.redis_client.register_script(_RELEASE_SCRIPT)
+        self._renew_script = self.redis_client.register_script(_RENEW_SCRIPT)
+        self._persist: Optional[PersistFunc] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._urgent: set = set()
+        self.buffered_answers = 0
+        self.flushes = 0
+        self.flushed_answers = 0
+        self.flush_failures = 0
+        self.dropped_answers = 0
+        self.recovered = 0
+        self.lock_losses = 0
+
+    @staticmethod
+    def _keys(user_id: str) -> List[str]:
+        return [
+            f"{PENDING_KEY_PREFIX}{user_id}",
+            f"{FLUSHING_KEY_PREFIX}{user_id}",
+            PENDING_USERS_KEY,
+            FLUSHING_USERS_KEY,
+        ]
+
+    @staticmethod
+    def _decode(raw: Dict[str, str]) -> Dict[str, Tuple[Any, float]]:
+        entries = {}
+        for requirement_id, value in raw.items():
+            try:
+                entry = json.loads(value)
+                entries[requirement_id] = (entry["d"], float(entry["t"]))
+            except (ValueError, KeyError, TypeError):
+                logger.error(f"잘못된 대기 답변 무시: requirement_id={requirement_id}")
+        return entries
+
+    async def _acquire(self, user_id: str, wait: float = 0.0) -> Optional[str]:
+        """사용자 잠금 획득 (wait초 동안 재시도), 잠금 토큰 또는 None
+        잠금을 잡은 프로세스가 죽어도 ANSWER_FLUSH_STALE_SECONDS초 뒤 풀린다 (살아 있는 동안은 _held가 연장)"""
+        token = uuid4().hex
+        deadline = time.monotonic() + wait
+        while True:
+            if await self.redis_client.set(
+                f"{LOCK_KEY_PREFIX}{user_id}", token, nx=True, px=int(ANSWER_FLUSH_STALE_SECONDS * 1000)
+            ):
+                return token
+            if time.monotonic() >= deadline:
+                return None
+            await asyncio.sleep(0.05)
+
+    async def _release(self, user_id: str, token: str):
+        await self._release_script(keys=[f"{LOCK_KEY_PREFIX}{user_id}"], args=[token])
+
+    async def _renew(self, user_id: str, token: str):
+        """잠금을 잡고 있는 동안 만료 시간을 주기적으로 연장 (잠금을 잃으면 중단)"""
+        interval = ANSWER_FLUSH_STALE_SECONDS / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                renewed = await self._renew_script(
+                    keys=[f"{LOCK_KEY_PREFIX}{user_id}"], args=[token, int(ANSWER_FLUSH_STALE_SECONDS * 1000)]
+                )
+            except Exception as e:
+                logger.warning(f"답변 잠금 연장 실패, 다음 주기에 재시도: user_id={user_id}, error={str(e)}")
+                continue
+            if not renewed:
+                self.lock_losses += 1
+                logger.error(f"답변 잠금을 잃음 (만료됨): user_id={user_id}")
+                return
+
+    @asynccontextmanager
+    async def _held(self, user_id: str, token: str) -> AsyncIterator[None]:
+        """획득한 잠금을 블록이 끝날 때까지 연장하고 마지막에 해제"""
+        renewal = asyncio.create_task(self._renew(user_id, token))
+        try:
+            yield
+        finally:
+            renewal.cancel()
+            await self._release(user_id, token)
+
+    @asynccontextmanager
+    async def user_lock(self, user_id: UUID, wait: float = ANSWER_LOCK_WAIT_SECONDS) -> AsyncIterator[None]:
+        """사용자별 반영/삭제 상호 배제 (wait초 안에 잡지 못하면 TimeoutError)"""
+        token = await self._acquire(str(user_id), wait)
+        if token is None:
+            raise TimeoutError(f"답변 잠금 대기 시간 초과: user_id={user_id}")
+        async with self._held(str(user_id), token):
+            yield
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def buffer(self, user_id: UUID, answers: List[AnswerUpdatePayload]) -> int:
+        """답변을 대기 해시에 저장 (같은 요구사항은 마지막 값), 저장한 요구사항 수 반환"""
+        now = time.time()
+        latest = {answer.requirement_id: answer.answer_data for answer in answers}
+        if not latest:
+            return 0
+        args: List[Any] = [now, str(user_id)]
+        for requirement_id, answer_data in latest.items():
+            args += [requirement_id, json.dumps({"d": answer_data, "t": now}, ensure_ascii=False, default=str)]
+        keys = self._keys(str(user_id))
+        pending_count = await self._buffer_script(keys=[keys[0], keys[2]], args=args)
+        self.buffered_answers += len(latest)
+        if int(pending_count) >= ANSWER_FLUSH_MAX_PENDING:
+            self._urgent.add(str(user_id))
+            self._wakeup.set()
+        return len(latest)
+
+    async def get_pending(self, user_id: UUID, requirement_id: Optional[str] = None) -> Dict[str, Tuple[Any, float]]:
+        """아직 DB에 반영되지 않은 답변 (requirement_id → (answer_data, 저장 시각)), 대기 값이 반영 중 값보다 우선"""
+        pending_key, flushing_key = self._keys(str(user_id))[:2]
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            if requirement_id is None:
+                pipe.hgetall(flushing_key)
+                pipe.hgetall(pending_key)
+                flushing_raw, pending_raw = await pipe.execute()
+            else:
+                pipe.hget(flushing_key, requirement_id)
+                pipe.hget(pending_key, requirement_id)
+                flushing_value, pending_value = await pipe.execute()
+                flushing_raw = {requirement_id: flushing_value} if flushing_value is not None else {}
+                pending_raw = {requirement_id: pending_value} if pending_value is not None else {}
+        return {**self._decode(flushing_raw), **self._decode(pending_raw)}
+
+    async def discard(self, user_id: UUID, requirement_id: str) -> bool:
+        """대기/반영 중인 답변 제거 (답변 삭제 시), 제거한 값이 있으면 True"""
+        pending_key, flushing_key = self._keys(str(user_id))[:2]
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.hdel(pending_key, requirement_id)
+            pipe.hdel(flushing_key, requirement_id)
+            removed = await pipe.execute()
+        return any(removed)
+
+    async def flush_user(self, user_id: str) -> int:
+        """사용자의 대기 답변을 DB에 반영, 반영한 답변 수 반환 (다른 곳에서 반영/삭제 중이면 다음 주기로 미룸)"""
+        token = await self._acquire(user_id)
+        if token is None:
+            return 0
+        async with self._held(user_id, token):
+            return await self._flush_claimed(user_id)
+
+    async def _flush_claimed(self, user_id: str) -> int:
+        keys = self._keys(user_id)
+        claimed = await self._claim_script(keys=keys, args=[time.time(), user_id])
+        if not claimed:
+            return 0
+
+        entries = self._decode(await self.redis_client.hgetall(keys[1]))
+        payload = AnswerBatchUpdatePayload(answers=[
+            AnswerUpdatePayload(requirement_id=requirement_id, answer_data=answer_data)
+            for requirement_id, (answer_data, _) in entries.items()
+        ])
+        try:
+            result = await run_in_threadpool(self._persist, UUID(user_id), payload) if payload.answers else None
+        except Exception as e:
+            # DB 오류 - 대기 해시로 되돌려 다음 주기에 재시도
+            self.flush_failures += 1
+            await self._restore_script(keys=keys, args=[time.time(), user_id])
+            logger.warning(f"대기 답변 반영 실패, 재시도 예정: user_id={user_id}, 답변 수={len(entries)}, error={str(e)}")
+            return 0
+
+        if result is not None and result.failed_requirements:
+            # 없는 요구사항 등 재시도해도 실패하는 값은 버림
+            self.dropped_answers += len(result.failed_requirements)
+            logger.error(f"반영하지 못한 대기 답변 제외: user_id={user_id}, requirements={result.failed_requirements}")
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.delete(keys[1])
+            pipe.zrem(FLUSHING_USERS_KEY, user_id)
+            await pipe.execute()
+
+        processed = result.processed_count if result is not None else 0
+        self.flushes += 1
+        self.flushed_answers += processed
+        logger.info(f"대기 답변 반영 완료: user_id={user_id}, 답변 수={processed}")
+        return processed
+
+    async def _recover_stale(self):
+        """반영 중 상태로 오래 남은(반영하던 프로세스가 종료된) 답변을 대기 해시로 되돌림"""
+        now = time.time()
+        stale_users = await self.redis_client.zrangebyscore(FLUSHING_USERS_KEY, "-inf", now - ANSWER_FLUSH_STALE_SECONDS)
+        for user_id in stale_users:
+            # 잠금이 남아 있으면 아직 반영 중 (느린 반영) - 건드리지 않음
+            token = await self._acquire(user_id)
+            if token is None:
+                continue
+            async with self._held(user_id, token):
+                restored = await self._restore_script(keys=self._keys(user_id), args=[now, user_id])
+            self.recovered += int(restored)
+            logger.warning(f"중단된 답변 반영 복구: user_id={user_id}, 답변 수={restored}")
+
+    async def _flush_users(self, user_ids: List[str]):
+        for user_id in user_ids:
+            try:
+                await self.flush_user(user_id)
+            except Exception as e:
+                logger.error(f"대기 답변 반영 실패: user_id={user_id}, error={str(e)}")
+
+    async def _flush_due(self):
+        """크기 조건(즉시) 또는 시간 조건을 만족한 사용자 반영"""
+        urgent, self._urgent = self._urgent, set()
+        due = await self.redis_client.zrangebyscore(PENDING_USERS_KEY, "-inf", time.time() - ANSWER_FLUSH_MAX_DELAY)
+        await self._flush_users(list(dict.fromkeys([*urgent, *due])))
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=ANSWER_FLUSH_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._stopping:
+                break
+            try:
+                await self._recover_stale()
+                await self._flush_due()
+            except Exception as e:
+                logger.error(f"답변 flusher 오류: {str(e)}")
+
+    async def flush_all(self) -> int:
+        """시간 조건과 관계없이 대기 중인 모든 사용자 반영, 반영한 답변 수 반환"""
+        await self._recover_stale()
+        total = 0
+        for user_id in await self.redis_client.zrange(PENDING_USERS_KEY, 0, -1):
+            try:
+                total += await self.flush_user(user_id)
+            except Exception as e:
+                logger.error(f"대기 답변 반영 실패: user_id={user_id}, error={str(e)}")
+        return total
+
+    async def start(self, persist: PersistFunc):
+        """flusher 시작 (이전 실행에서 남은 대기/반영 중 답변은 먼저 복구 후 반영)"""
+        self._persist = persist
+        self._stopping = False
+        try:
+            await self._recover_stale()
+        except Exception as e:
+            logger.error(f"중단된 답변 반영 복구 실패: {str(e)}")
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"📝 답변 쓰기 지연 모드 시작: max_pending={ANSWER_FLUSH_MAX_PENDING}, max_delay={ANSWER_FLUSH_MAX_DELAY}초"
+        )
+
+    async def stop(self):
+        """flusher를 멈추고 남은 대기 답변을 모두 반영 (제한 시간 안에 못 끝내면 Redis에 남겨 다음 기동 때 반영)"""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        try:
+            flushed = await asyncio.wait_for(self.flush_all(), timeout=ANSWER_FLUSH_SHUTDOWN_TIMEOUT)
+            logger.info(f"📝 종료 전 대기 답변 반영 완료: {flushed}건")
+        except Exception as e:
+            logger.error(f"종료 전 대기 답변 반영 실패 (Redis에 남아 다음 기동 때 반영): {str(e)}")
+
+    async def stats(self) -> Dict[str, Any]:
+        try:
+            pending_users = await self.redis_client.zcard(PENDING_USERS_KEY)
+            flushing_users = await self.redis_client.zcard(FLUSHING_USERS_KEY)
+        except Exception:
+            pending_users = flushing_users = None
+        return {
+            "enabled": ANSWER_WRITE_BEHIND_ENABLED,
+            "running": self.running,
+            "pending_users": pending_users,
+            "flushing_users": flushing_users,
+            "buffered_answers": self.buffered_answers,
+            "flushes": self.flushes,
+            "flushed_answers": self.flushed_answers,
+            "flush_failures": self.flush_failures,
+            "dropped_answers": self.dropped_answers,
+            "recovered": self.recovered,
+            "lock_losses": self.lock_losses,
+        }
+
+
+_answer_write_buffer: Optional[AnswerWriteBuffer] = None
+
+# 어디서든 이 함수를 호출하여 답변 쓰기 지연 버퍼를 가져올 수 있음 (비활성화면 None)
+def get_answer_write_buffer() -> Optional[AnswerWriteBuffer]:
+    global _answer_write_buffer
+    if not ANSWER_WRITE_BEHIND_ENABLED:
+        return None
+    if _answer_write_buffer is None:
+        _answer_write_buffer = AnswerWriteBuffer()
+    return _answer_write_buffer
@@ -0,0 +1,220 @@
+"""
+마스터 데이터(공시/요구사항/용어/개념/도입 현황) 인메모리 스냅샷
+다섯 테이블은 initial_data_loader가 다시 적재할 때만 바뀌므로, 시작 시(lifespan) 한 번 읽어
+응답 스키마 객체와 조회용 인덱스를 미리 만들어 두고 disclosure-data 조회는 DB 없이 처리한다.
+
+- 스냅샷은 만든 뒤 바꾸지 않는다 (목록은 tuple, 인덱스는 읽기 전용 매핑).
+- 다시 읽을 때는 새 스냅샷을 다 만든 뒤 참조 하나만 교체하므로, 요청은 항상 이전 또는 새 스냅샷 하나를 온전히 본다.
+- version은 데이터 내용 해시이며 disclosure-data 응답의 ETag로 사용한다 (내용이 같으면 다시 읽어도 유지됨).
+- 스냅샷을 만들지 못했으면 None이며, 서비스는 기존처럼 DB를 조회한다.
+- 버전에만 의존하는 목록 응답은 스냅샷을 만들 때 JSON/압축 바이트로 미리 렌더링한다 (rendered).
+"""
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.domain.repository.disclosure_repository import DisclosureRepository
+from app.foundation.rendered_response import RenderedResponse
+from app.domain.model.disclosure_schema import (
+    DisclosureResponse,
+    DisclosureItem,
+    RequirementResponse,
+    TermResponse,
+    ConceptResponse,
+    AdoptionStatusResponse,
+)
+
+logger = logging.getLogger("disclosure_service")
+
+
+def _index_by(items: Iterable[Any], attr: str) -> Mapping[Any, Any]:
+    return MappingProxyType({getattr(item, attr): item for item in items})
+
+
+def _group_by(items: Iterable[Any], attr: str) -> Mapping[Any, Tuple[Any, ...]]:
+    groups: Dict[Any, List[Any]] = defaultdict(list)
+    for item in items:
+        groups[getattr(item, attr)].append(item)
+    return MappingProxyType({key: tuple(values) for key, values in groups.items()})
+
+
+def _content_hash(tables: Dict[str, Tuple[Any, ...]], keys: Dict[str, str]) -> str:
+    """테이블별로 기본 키 순 정렬 후 해시 (DB 조회 순서와 무관하게 같은 내용이면 같은 값)"""
+    canonical = {
+        name: sorted((item.model_dump(mode="json") for item in items), key=lambda row: str(row[keys[name]]))
+        for name, items in tables.items()
+    }
+    payload = json.dumps(canonical, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=12).hexdigest()
+
+
+@dataclass(frozen=True)
+class MasterDataSnapshot:
+    """마스터 데이터 한 시점의 읽기 전용 사본과 인덱스"""
+    version: str
+    loaded_at: float
+    disclosures: Tuple[DisclosureResponse, ...]
+    disclosures_by_id: Mapping[str, DisclosureResponse]
+    disclosures_by_section: Mapping[str, Tuple[DisclosureResponse, ...]]
+    disclosures_by_category: Mapping[str, Tuple[DisclosureResponse, ...]]
+    structured_disclosures: Mapping[str, Mapping[str, Tuple[DisclosureItem, ...]]]
+    requirements_by_id: Mapping[str, RequirementResponse]
+    requirements_by_disclosure: Mapping[str, Tuple[RequirementResponse, ...]]
+    terms: Tuple[TermResponse, ...]
+    terms_by_id: Mapping[int, TermResponse]
+    concepts: Tuple[ConceptResponse, ...]
+    concepts_by_id: Mapping[int, ConceptResponse]
+    concepts_by_category: Mapping[str, Tuple[ConceptResponse, ...]]
+    adoption_status: Tuple[AdoptionStatusResponse, ...]
+    adoption_status_by_id: Mapping[int, AdoptionStatusResponse]
+    adoption_status_by_country: Mapping[str, AdoptionStatusResponse]
+    # 미리 렌더링한 응답 (disclosures / terms / concepts / adoption_status, 비어 있는 목록은 제외)
+    rendered: Mapping[str, RenderedResponse]
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.version}"'
+
+    def search_terms(self, keyword: str) -> List[TermResponse]:
+        """용어/정의에 키워드가 포함된 용어 (DB의 contains와 같은 대소문자 구분 부분 일치)"""
+        return [term for term in self.terms if keyword in term.term_ko or keyword in term.definition_ko]
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "disclosures": len(self.disclosures),
+            "requirements": len(self.requirements_by_id),
+            "terms": len(self.terms),
+            "concepts": len(self.concepts),
+            "adoption_status": len(self.adoption_status),
+        }
+
+    @classmethod
+    def build(cls, repo: DisclosureRepository) -> "MasterDataSnapshot":
+        disclosures = tuple(DisclosureResponse.model_validate(d) for d in repo.get_all_disclosures())
+        requirements = tuple(RequirementResponse.model_validate(r) for r in repo.get_all_requirements())
+        terms = tuple(TermResponse.model_validate(t) for t in repo.get_all_terms())
+        concepts = tuple(ConceptResponse.model_validate(c) for c in repo.get_all_concepts())
+        adoption_status = tuple(AdoptionStatusResponse.model_validate(a) for a in repo.get_all_adoption_status())
+
+        # section → category → 공시 항목 (DisclosureService.get_structured_disclosures와 같은 구조)
+        structured: Dict[str, Dict[str, List[DisclosureItem]]] = defaultdict(lambda: defaultdict(list))
+        for disclosure in disclosures:
+            structured[disclosure.section][disclosure.category].append(DisclosureItem(
+                disclosure_id=disclosure.disclosure_id,
+                topic=disclosure.topic,
+                disclosure_ko=disclosure.disclosure_ko
+            ))
+
+        version = _content_hash(
+            {
+                "disclosures": disclosures,
+                "requirements": requirements,
+                "terms": terms,
+                "concepts": concepts,
+                "adoption_status": adoption_status,
+            },
+            {
+                "disclosures": "disclosure_id",
+                "requirements": "requirement_id",
+                "terms": "term_id",
+                "concepts": "concept_id",
+                "adoption_status": "adoption_id",
+            },
+        )
+
+        etag = f'"{version}"'
+        rendered_content = {
+            "disclosures": {
+                section: {
+                    category: [item.model_dump(mode="json") for item in items]
+                    for category, items in categories.items()
+                }
+                for section, categories in structured.items()
+            },
+            "terms": [term.model_dump(mode="json") for term in terms],
+            "concepts": [concept.model_dump(mode="json") for concept in concepts],
+            "adoption_status": [status.model_dump(mode="json") for status in adoption_status],
+        }
+
+        return cls(
+            version=version,
+            loaded_at=time.time(),
+            disclosures=disclosures,
+            disclosures_by_id=_index_by(disclosures, "disclosure_id"),
+            disclosures_by_section=_group_by(disclosures, "section"),
+            disclosures_by_category=_group_by(disclosures, "category"),
+            structured_disclosures=MappingProxyType({
+                section: MappingProxyType({category: tuple(items) for category, items in categories.items()})
+                for section, categories in structured.items()
+            }),
+            requirements_by_id=_index_by(requirements, "requirement_id"),
+            # get_all_requirements가 requirement_order 순이므로 그룹 안에서도 순서 유지
+            requirements_by_disclosure=_group_by(requirements, "disclosure_id"),
+            terms=terms,
+            terms_by_id=_index_by(terms, "term_id"),
+            concepts=concepts,
+            concepts_by_id=_index_by(concepts, "concept_id"),
+            concepts_by_category=_group_by(concepts, "category"),
+            adoption_status=adoption_status,
+            adoption_status_by_id=_index_by(adoption_status, "adoption_id"),
+            adoption_status_by_country=_index_by(adoption_status, "country"),
+            rendered=MappingProxyType({
+                name: RenderedResponse(content, etag) for name, content in rendered_content.items() if content
+            }),
+        )
+
+
+class MasterDataStore:
+    """현재 마스터 데이터 스냅샷 보관 및 교체"""
+
+    def __init__(self):
+        self._snapshot: Optional[MasterDataSnapshot] = None
+        self._reload_lock = threading.Lock()
+        self.reloads = 0
+
+    @property
+    def snapshot(self) -> Optional[MasterDataSnapshot]:
+        return self._snapshot
+
+    def reload(self, db: Session) -> MasterDataSnapshot:
+        """DB에서 새 스냅샷을 만들어 교체 (동시에 여러 번 호출되면 순서대로 처리)"""
+        with self._reload_lock:
+            started = time.perf_counter()
+            snapshot = MasterDataSnapshot.build(DisclosureRepository(db))
+            previous, self._snapshot = self._snapshot, snapshot
+            self.reloads += 1
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        changed = previous is None or previous.version != snapshot.version
+        logger.info(
+            f"📦 마스터 데이터 스냅샷 {'교체' if changed else '재적재 (변경 없음)'}: "
+            f"version={snapshot.version}, counts={snapshot.counts()}, {elapsed_ms:.0f}ms"
+        )
+        return snapshot
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {"loaded": False, "reloads": self.reloads}
+        return {
+            "loaded": True,
+            "version": snapshot.version,
+            "loaded_at": snapshot.loaded_at,
+            "counts": snapshot.counts(),
+            "rendered_bytes": {name: rendered.sizes() for name, rendered in snapshot.rendered.items()},
+            "reloads": self.reloads,
+        }
+
+
+_master_data_store = MasterDataStore()
+
+# 어디서든 이 함수를 호출하여 마스터 데이터 스냅샷 저장소를 가져올 수 있음
+def get_master_data_store() -> MasterDataStore:
+    return _master_data_store
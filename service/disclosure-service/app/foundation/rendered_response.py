@@ -0,0 +1,92 @@
+"""
+미리 직렬화한 JSON 응답 (데이터 버전마다 한 번 렌더링)
+내용이 마스터 데이터 버전에만 의존하는 응답(공시 계층 구조, 용어/개념/도입 현황 목록)은
+스냅샷을 만들 때 JSON 바이트와 gzip/brotli 압축본을 미리 만들어 두고,
+요청 시에는 Accept-Encoding에 맞는 바이트를 골라 그대로 보낸다 (Pydantic 검증/JSON 인코딩/압축 생략).
+
+- brotli 패키지가 설치되어 있지 않으면 gzip 압축본만 만든다.
+- 압축본의 ETag는 약한 ETag(W/)로 보낸다 (같은 내용의 다른 표현).
+"""
+import os
+import gzip
+import json
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+load_dotenv()
+
+RENDERED_GZIP_LEVEL = int(os.getenv("RENDERED_GZIP_LEVEL", "9"))
+# 버전마다 한 번만 압축하므로 최고 품질을 기본값으로 사용
+RENDERED_BROTLI_QUALITY = int(os.getenv("RENDERED_BROTLI_QUALITY", "11"))
+# 이 크기 미만이면 압축본을 만들지 않음
+RENDERED_MIN_COMPRESS_SIZE = int(os.getenv("RENDERED_MIN_COMPRESS_SIZE", "512"))
+# ETag로 재검증하도록 (변경이 없으면 304)
+MASTER_DATA_CACHE_CONTROL = os.getenv("MASTER_DATA_CACHE_CONTROL", "no-cache")
+
+
+def _accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """Accept-Encoding(q 값 포함) → {인코딩: q}"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip()] = quality
+    return accepted
+
+
+class RenderedResponse:
+    """JSON 본문과 인코딩별 압축본"""
+
+    def __init__(self, content: Any, etag: str):
+        # FastAPI JSONResponse와 같은 형식으로 직렬화
+        self.body = json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+        self.etag = etag
+        self.encoded: Dict[str, bytes] = {}
+        if len(self.body) >= RENDERED_MIN_COMPRESS_SIZE:
+            if brotli is not None:
+                self.encoded["br"] = brotli.compress(self.body, quality=RENDERED_BROTLI_QUALITY)
+            self.encoded["gzip"] = gzip.compress(self.body, compresslevel=RENDERED_GZIP_LEVEL, mtime=0)
+
+    def _choose_encoding(self, accept_encoding: str) -> Optional[str]:
+        if not self.encoded or not accept_encoding:
+            return None
+        accepted = _accepted_encodings(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        best, best_quality = None, 0.0
+        # br 우선, 압축본이 원본보다 작을 때만 사용
+        for encoding in ("br", "gzip"):
+            body = self.encoded.get(encoding)
+            quality = accepted.get(encoding, wildcard)
+            if body is not None and len(body) < len(self.body) and quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def to_response(self, request: Request) -> Response:
+        """요청의 Accept-Encoding에 맞는 바이트로 응답 (Content-Length는 Response가 설정)"""
+        headers = {"Cache-Control": MASTER_DATA_CACHE_CONTROL, "ETag": self.etag}
+        if self.encoded:
+            headers["Vary"] = "Accept-Encoding"
+        encoding = self._choose_encoding(request.headers.get("accept-encoding", ""))
+        if encoding is None:
+            return Response(content=self.body, media_type="application/json", headers=headers)
+        headers["Content-Encoding"] = encoding
+        headers["ETag"] = f"W/{self.etag}"
+        return Response(content=self.encoded[encoding], media_type="application/json", headers=headers)
+
+    def sizes(self) -> Dict[str, int]:
+        return {"identity": len(self.body), **{encoding: len(body) for encoding, body in self.encoded.items()}}
@@ -11,6 +11,9 @@ from app.api.answer_router import router as answer_router
 from app.foundation.database import get_db, check_database_connection
 from app.foundation.initial_data_loader import load_initial_data, check_data_integrity
 from app.foundation.user_context_middleware import UserContextMiddleware
+from app.foundation.master_data_store import get_master_data_store
+from app.foundation.answer_write_buffer import get_answer_write_buffer
+from app.domain.service.answer_service import persist_buffered_answers
 
 # 환경 변수 로드
 load_dotenv()
@@ -59,6 +62,12 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"❌ 초기 데이터 적재 실패: {str(e)}")
             logger.warning("⚠️ 데이터 적재 실패했지만 서비스는 계속 진행됩니다.")
+        
+        # 마스터 데이터 인메모리 스냅샷 생성 (실패하면 조회 API는 DB를 직접 조회)
+        try:
+            get_master_data_store().reload(db_session)
+        except Exception as e:
+            logger.error(f"❌ 마스터 데이터 스냅샷 생성 실패, DB 직접 조회로 동작합니다: {str(e)}")
         finally:
             db_session.close()
             
@@ -68,8 +77,20 @@ async def lifespan(app: FastAPI):
         raise
     # --- 데이터 적재 로직 추가 종료 ---
     
+    # 답변 쓰기 지연 모드 (ANSWER_WRITE_BEHIND_ENABLED=true일 때만, 시작 실패 시 DB에 바로 저장)
+    write_buffer = get_answer_write_buffer()
+    if write_buffer is not None:
+        try:
+            await write_buffer.start(persist_buffered_answers)
+        except Exception as e:
+            logger.error(f"❌ 답변 쓰기 지연 모드 시작 실패, DB에 바로 저장합니다: {str(e)}")
+    
     yield
     
+    # 남은 대기 답변을 DB에 반영한 뒤 종료
+    if write_buffer is not None:
+        await write_buffer.stop()
+    
     logger.info("🛑 Disclosure API 서비스 종료")
 
 
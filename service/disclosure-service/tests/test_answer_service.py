@@ -0,0 +1,151 @@
+"""
+AnswerService.upsert_answers_batch 테스트 (저장소는 가짜 객체)
+생성/수정 건수, 중복 requirement_id(마지막 값), 없는 요구사항, DB 오류 시 롤백을 확인한다.
+
+실행: disclosure-service 디렉터리에서 python -m pytest tests
+"""
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Set
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.domain.model.answer_schema import AnswerBatchUpdatePayload, AnswerUpdatePayload
+from app.domain.service import answer_service as answer_service_module
+from app.domain.service.answer_service import AnswerService
+
+USER_ID = uuid4()
+REQUIREMENT_TYPES = {"met-1": "text", "met-2": "number", "met-3": "boolean"}
+
+
+@pytest.fixture(autouse=True)
+def no_snapshot(monkeypatch):
+    # 마스터 데이터 스냅샷 대신 disclosure_repository로 요구사항 타입 조회
+    monkeypatch.setattr(answer_service_module, "get_master_data_store", lambda: SimpleNamespace(snapshot=None))
+    monkeypatch.setattr(answer_service_module, "get_answer_write_buffer", lambda: None)
+
+
+class FakeSession:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakeDisclosureRepository:
+    def __init__(self):
+        self.lookups: List[List[str]] = []
+
+    def get_requirements_by_ids(self, requirement_ids: List[str]):
+        self.lookups.append(list(requirement_ids))
+        return [
+            SimpleNamespace(requirement_id=requirement_id, data_required_type=REQUIREMENT_TYPES[requirement_id])
+            for requirement_id in requirement_ids
+            if requirement_id in REQUIREMENT_TYPES
+        ]
+
+
+class FakeAnswerRepository:
+    """이미 답변이 있는 요구사항은 수정(inserted=False), 없으면 생성으로 응답"""
+
+    def __init__(self, existing: Set[str] = frozenset(), missing: Set[str] = frozenset(), error: Optional[Exception] = None):
+        self.existing = set(existing)
+        self.missing = set(missing)
+        self.error = error
+        self.calls: List[List[Dict[str, Any]]] = []
+
+    def upsert_answers_bulk(self, user_id: UUID, rows: List[Dict[str, Any]]) -> Dict[str, bool]:
+        self.calls.append(rows)
+        if self.error is not None:
+            raise self.error
+        return {
+            row["requirement_id"]: row["requirement_id"] not in self.existing
+            for row in rows
+            if row["requirement_id"] not in self.missing
+        }
+
+
+def _payload(*answers) -> AnswerBatchUpdatePayload:
+    return AnswerBatchUpdatePayload(answers=[
+        AnswerUpdatePayload(requirement_id=requirement_id, answer_data=answer_data)
+        for requirement_id, answer_data in answers
+    ])
+
+
+def _service(answer_repository: FakeAnswerRepository):
+    session = FakeSession()
+    disclosure_repository = FakeDisclosureRepository()
+    return AnswerService(session, answer_repository, disclosure_repository), session, disclosure_repository
+
+
+def test_counts_created_and_updated_answers():
+    repository = FakeAnswerRepository(existing={"met-2"})
+    service, session, disclosure_repository = _service(repository)
+
+    result = service.upsert_answers_batch(USER_ID, _payload(("met-1", "Yes"), ("met-2", "12.5"), ("met-3", "true")))
+
+    assert (result.processed_count, result.created_count, result.updated_count, result.failed_count) == (3, 2, 1, 0)
+    assert result.success
+    assert len(repository.calls) == 1 and len(disclosure_repository.lookups) == 1
+    rows = {row["requirement_id"]: row for row in repository.calls[0]}
+    assert rows["met-1"]["answer_value_text"] == "Yes"
+    assert rows["met-2"]["answer_value_number"] == 12.5
+    assert rows["met-3"]["answer_value_boolean"] is True
+    assert session.commits == 1
+
+
+def test_duplicate_requirement_ids_keep_last_value():
+    repository = FakeAnswerRepository()
+    service, _, disclosure_repository = _service(repository)
+
+    result = service.upsert_answers_batch(USER_ID, _payload(("met-1", "first"), ("met-2", "1"), ("met-1", "last")))
+
+    # 한 문장 안에서 같은 행을 두 번 UPSERT할 수 없으므로 요구사항당 한 행 (마지막 값)
+    assert [row["requirement_id"] for row in repository.calls[0]] == ["met-2", "met-1"]
+    assert repository.calls[0][1]["answer_value_text"] == "last"
+    assert disclosure_repository.lookups == [["met-1", "met-2"]]
+    # 중복된 첫 번째는 생성, 나머지는 수정으로 집계
+    assert (result.processed_count, result.created_count, result.updated_count, result.failed_count) == (3, 2, 1, 0)
+
+
+def test_unknown_and_unreturned_requirements_are_failed():
+    repository = FakeAnswerRepository(missing={"met-2"})
+    service, session, _ = _service(repository)
+
+    result = service.upsert_answers_batch(USER_ID, _payload(("met-1", "a"), ("unknown", "b"), ("met-2", "3")))
+
+    assert [row["requirement_id"] for row in repository.calls[0]] == ["met-1", "met-2"]
+    assert (result.processed_count, result.created_count, result.updated_count) == (1, 1, 0)
+    assert result.failed_count == 2
+    assert result.failed_requirements == ["unknown", "met-2"]
+    assert not result.success
+    assert session.commits == 1
+
+
+def test_only_unknown_requirements_skip_upsert():
+    repository = FakeAnswerRepository()
+    service, _, _ = _service(repository)
+
+    result = service.upsert_answers_batch(USER_ID, _payload(("unknown", "a")))
+
+    assert repository.calls == []
+    assert (result.processed_count, result.failed_count, result.failed_requirements) == (0, 1, ["unknown"])
+
+
+def test_database_error_rolls_back_whole_batch():
+    repository = FakeAnswerRepository(error=RuntimeError("connection reset"))
+    service, session, _ = _service(repository)
+    payload = _payload(("met-1", "a"), ("met-2", "1"))
+
+    result = service.upsert_answers_batch(USER_ID, payload)
+    assert session.rollbacks == 1 and session.commits == 0
+    assert (result.processed_count, result.failed_count, result.failed_requirements) == (0, 2, ["met-1", "met-2"])
+
+    with pytest.raises(RuntimeError):
+        service.upsert_answers_batch(USER_ID, payload, raise_on_error=True)
+    assert session.rollbacks == 2
@@ -0,0 +1,188 @@
+"""
+AnswerWriteBuffer 테스트 (fakeredis)
+- 대기 → 반영: 같은 요구사항은 마지막 값만 반영
+- 반영 실패 시 대기 해시로 복구 (그 사이 들어온 더 새로운 값이 우선), 재시도해도 실패하는 값은 버림
+- 반영 중 삭제는 반영이 끝날 때까지 기다림
+- 반영이 ANSWER_FLUSH_STALE_SECONDS보다 오래 걸려도 잠금이 유지됨
+
+실행: disclosure-service 디렉터리에서 python -m pytest tests
+"""
+import asyncio
+import threading
+import time
+from typing import List, Optional, Sequence
+from uuid import UUID, uuid4
+
+import fakeredis
+import pytest
+
+from app.domain.model.answer_schema import AnswerBatchResponse, AnswerBatchUpdatePayload, AnswerUpdatePayload
+from app.foundation import answer_write_buffer as write_buffer_module
+from app.foundation.answer_write_buffer import (
+    FLUSHING_KEY_PREFIX,
+    LOCK_KEY_PREFIX,
+    PENDING_USERS_KEY,
+    AnswerWriteBuffer,
+)
+
+USER_ID = uuid4()
+
+
+def _answers(**values) -> List[AnswerUpdatePayload]:
+    return [AnswerUpdatePayload(requirement_id=requirement_id, answer_data=value) for requirement_id, value in values.items()]
+
+
+def _result(payload: AnswerBatchUpdatePayload, failed: Sequence[str] = ()) -> AnswerBatchResponse:
+    processed = len(payload.answers) - len(failed)
+    return AnswerBatchResponse(
+        success=not failed, message="", processed_count=processed,
+        created_count=processed, updated_count=0, failed_count=len(failed), failed_requirements=list(failed),
+    )
+
+
+class RecordingPersist:
+    """스레드풀에서 호출되는 persist (호출 기록, 선택적으로 gate가 열릴 때까지 대기)"""
+
+    def __init__(
+        self,
+        gate: Optional[threading.Event] = None,
+        error: Optional[Exception] = None,
+        failed: Sequence[str] = (),
+        delay: float = 0.0,
+    ):
+        self.gate = gate
+        self.error = error
+        self.failed = list(failed)
+        self.delay = delay
+        self.started = threading.Event()
+        self.calls: List[dict] = []
+
+    def __call__(self, user_id: UUID, payload: AnswerBatchUpdatePayload) -> AnswerBatchResponse:
+        self.started.set()
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        time.sleep(self.delay)
+        self.calls.append({answer.requirement_id: answer.answer_data for answer in payload.answers})
+        if self.error is not None:
+            raise self.error
+        return _result(payload, self.failed)
+
+
+def _buffer(persist: RecordingPersist) -> AnswerWriteBuffer:
+    buffer = AnswerWriteBuffer(fakeredis.FakeAsyncRedis(decode_responses=True))
+    buffer._persist = persist
+    return buffer
+
+
+async def _wait_started(persist: RecordingPersist):
+    while not persist.started.is_set():
+        await asyncio.sleep(0.01)
+
+
+def test_flush_persists_latest_value_per_requirement():
+    persist = RecordingPersist()
+
+    async def scenario():
+        buffer = _buffer(persist)
+        await buffer.buffer(USER_ID, _answers(**{"met-1": "a", "met-2": "b"}))
+        await buffer.buffer(USER_ID, _answers(**{"met-1": "c"}))
+        pending = await buffer.get_pending(USER_ID)
+        flushed = await buffer.flush_user(str(USER_ID))
+        return buffer, pending, flushed, await buffer.get_pending(USER_ID), await buffer.redis_client.zcard(PENDING_USERS_KEY)
+
+    buffer, pending, flushed, remaining, pending_users = asyncio.run(scenario())
+    assert {requirement_id: value for requirement_id, (value, _) in pending.items()} == {"met-1": "c", "met-2": "b"}
+    assert persist.calls == [{"met-1": "c", "met-2": "b"}]
+    assert flushed == 2
+    assert remaining == {} and pending_users == 0
+
+
+def test_failed_flush_restores_without_overwriting_newer_values():
+    gate = threading.Event()
+    persist = RecordingPersist(gate=gate, error=RuntimeError("db down"))
+
+    async def scenario():
+        buffer = _buffer(persist)
+        await buffer.buffer(USER_ID, _answers(**{"met-1": "old", "met-2": "kept"}))
+        flush = asyncio.ensure_future(buffer.flush_user(str(USER_ID)))
+        await _wait_started(persist)
+        # 반영 중에 같은 요구사항의 더 새로운 값이 들어옴
+        await buffer.buffer(USER_ID, _answers(**{"met-1": "new"}))
+        gate.set()
+        await flush
+        return buffer, await buffer.get_pending(USER_ID), await buffer.redis_client.exists(f"{FLUSHING_KEY_PREFIX}{USER_ID}")
+
+    buffer, pending, flushing_left = asyncio.run(scenario())
+    assert {requirement_id: value for requirement_id, (value, _) in pending.items()} == {"met-1": "new", "met-2": "kept"}
+    assert flushing_left == 0
+    assert buffer.flush_failures == 1
+
+
+def test_permanently_failing_answers_are_dropped():
+    persist = RecordingPersist(failed=["unknown-1"])
+
+    async def scenario():
+        buffer = _buffer(persist)
+        await buffer.buffer(USER_ID, _answers(**{"met-1": "a", "unknown-1": "b"}))
+        await buffer.flush_user(str(USER_ID))
+        # 다음 주기에 다시 시도하지 않음
+        await buffer.flush_user(str(USER_ID))
+        return buffer, await buffer.get_pending(USER_ID)
+
+    buffer, pending = asyncio.run(scenario())
+    assert len(persist.calls) == 1
+    assert pending == {}
+    assert buffer.dropped_answers == 1
+
+
+def test_delete_waits_for_in_flight_flush():
+    gate = threading.Event()
+    persist = RecordingPersist(gate=gate)
+    order: List[str] = []
+
+    async def delete(buffer: AnswerWriteBuffer):
+        async with buffer.user_lock(USER_ID, wait=5):
+            await buffer.discard(USER_ID, "met-1")
+            order.append("delete")
+
+    async def scenario():
+        buffer = _buffer(persist)
+        await buffer.buffer(USER_ID, _answers(**{"met-1": "a"}))
+        flush = asyncio.ensure_future(buffer.flush_user(str(USER_ID)))
+        await _wait_started(persist)
+        deleting = asyncio.ensure_future(delete(buffer))
+        await asyncio.sleep(0.2)
+        blocked = not deleting.done()
+        gate.set()
+        await flush
+        order.append("flush")
+        await deleting
+        return blocked, await buffer.redis_client.exists(f"{LOCK_KEY_PREFIX}{USER_ID}")
+
+    blocked, lock_left = asyncio.run(scenario())
+    assert blocked
+    assert order == ["flush", "delete"]
+    assert lock_left == 0
+
+
+def test_lock_is_renewed_while_persist_outlives_stale_seconds(monkeypatch):
+    monkeypatch.setattr(write_buffer_module, "ANSWER_FLUSH_STALE_SECONDS", 0.3)
+    persist = RecordingPersist(delay=1.0)
+
+    async def scenario():
+        buffer = _buffer(persist)
+        await buffer.buffer(USER_ID, _answers(**{"met-1": "a"}))
+        flush = asyncio.ensure_future(buffer.flush_user(str(USER_ID)))
+        await _wait_started(persist)
+        await asyncio.sleep(0.6)
+        # 잠금이 만료됐다면 복구가 반영 중인 답변을 대기 해시로 되돌려 다시 반영하게 됨
+        await buffer._recover_stale()
+        lock_held = await buffer.redis_client.exists(f"{LOCK_KEY_PREFIX}{USER_ID}")
+        await flush
+        return buffer, lock_held, await buffer.get_pending(USER_ID)
+
+    buffer, lock_held, pending = asyncio.run(scenario())
+    assert lock_held == 1
+    assert buffer.recovered == 0 and buffer.lock_losses == 0
+    assert pending == {}
+    assert persist.calls == [{"met-1": "a"}]
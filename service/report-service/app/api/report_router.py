@@ -1,4 +1,4 @@
-from fastapi import APIRouter, status, Depends, Body, HTTPException, Response
+from fastapi import APIRouter, status, Depends, Body, HTTPException, Request, Response
 import logging
 from sqlalchemy.orm import Session
 from uuid import UUID
@@ -7,6 +7,7 @@ from typing import List, Dict, Any
 from app.domain.controller.report_controller import ReportController
 from app.foundation.dependencies import get_current_user_id, get_report_controller, get_slm_client, get_db
 from app.platform.slm_client import SLMClient
+from app.foundation.request_deadline import DEADLINE_HEADER, DeadlineExceeded, parse_deadline
 from app.domain.model.report_schema import SavedReportCreate, SavedReportUpdate, SavedReportBrief, SavedReportDetail, SavedReportInDB
 
 # 로깅 설정
@@ -30,16 +31,23 @@ async def health_check():
 
 @router.post("/reports", status_code=status.HTTP_200_OK, summary="ESG 보고서 초안 생성")
 async def create_report(
+    request: Request,
     user_id: str = Depends(get_current_user_id),
     db: Session = Depends(get_db),
     controller: ReportController = Depends(get_report_controller)
 ):
     """
     사용자의 답변 데이터를 기반으로 AI를 사용하여 ESG 보고서 초안을 생성합니다.
+    게이트웨이가 전달한 X-Request-Deadline이 지나면 생성을 중단하고 504를 반환합니다.
     """
     print("✅ 1. 라우터 진입: /reports 요청 수신")
     logger.info(f"Router: /reports 엔드포인트 호출됨, user_id={user_id}")
-    result = await controller.create_report(user_id=user_id, db=db)
+    deadline = parse_deadline(request.headers.get(DEADLINE_HEADER))
+    try:
+        result = await controller.create_report(user_id=user_id, db=db, deadline=deadline)
+    except DeadlineExceeded as e:
+        logger.warning(f"Router: 보고서 생성 마감 시각 초과, user_id={user_id}: {e}")
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e))
     return {"message": "Report generation successful.", "data": result}
 
 
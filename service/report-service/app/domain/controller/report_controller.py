@@ -13,7 +13,7 @@ class ReportController:
         self.report_service = report_service
         logger.info("ReportController 초기화 완료")
 
-    async def create_report(self, user_id: str, db: Session) -> List[Dict[str, Any]]:
+    async def create_report(self, user_id: str, db: Session, deadline: Optional[float] = None) -> List[Dict[str, Any]]:
         """
         보고서 생성을 위한 서비스 호출을 담당합니다.
         DB 세션을 서비스 계층으로 전달합니다.
@@ -21,7 +21,7 @@ class ReportController:
         print(f"✅ 4. 컨트롤러 실행: create_report 호출됨, user_id={user_id}")
         logger.info(f"Controller: create_report 호출됨, user_id={user_id}")
         try:
-            report_data = await self.report_service.generate_report(user_id=user_id, db=db)
+            report_data = await self.report_service.generate_report(user_id=user_id, db=db, deadline=deadline)
             if report_data is None:
                 logger.warning(f"Controller: 서비스가 보고서 데이터를 반환하지 않음, user_id={user_id}")
                 return []
@@ -1,4 +1,5 @@
 import json
+import asyncio
 import logging
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
@@ -13,9 +14,13 @@ from app.domain.model.report_entity import ReportTemplate, Report
 from app.domain.model.report_schema import SavedReportCreate, SavedReportUpdate
 from app.domain.generators.text_generator import TextGenerator
 from app.domain.generators.table_generator import TableGenerator
+from app.foundation.request_deadline import DeadlineExceeded, remaining_seconds
 
 logger = logging.getLogger(__name__)
 
+# 테이블 생성에 필요한 요구사항 필드 (긴 안내 문구 등은 받지 않음)
+REQUIREMENT_FIELDS_FOR_TABLES = ["data_required_type", "input_schema"]
+
 class ReportService:
     """보고서 생성을 담당하는 서비스 클래스"""
     
@@ -134,7 +139,27 @@ class ReportService:
 
     # --- Report Generation Methods ---
 
-    async def generate_report(self, user_id: str, db: Session) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _check_deadline(deadline: Optional[float], stage: str) -> Optional[float]:
+        """마감 시각이 지났으면 DeadlineExceeded를 발생시키고, 아니면 남은 시간(초)을 반환"""
+        remaining = remaining_seconds(deadline)
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded(f"요청 마감 시각이 지나 보고서 생성을 중단했습니다. (단계: {stage})")
+        return remaining
+
+    async def _within_deadline(self, awaitable, deadline: Optional[float], stage: str):
+        """남은 시간 안에 awaitable을 완료하지 못하면 취소하고 DeadlineExceeded를 발생"""
+        remaining = self._check_deadline(deadline, stage)
+        try:
+            return await asyncio.wait_for(awaitable, timeout=remaining)
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"요청 마감 시각이 지나 보고서 생성을 중단했습니다. (단계: {stage})")
+
+    async def generate_report(self, user_id: str, db: Session, deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        deadline(epoch 초)이 주어지면 단계마다 남은 시간을 확인하고,
+        답변 조회/문단 생성이 마감 시각을 넘기면 취소한 뒤 DeadlineExceeded를 발생시킵니다.
+        """
         # 1. 데이터 수집 (기존과 동일)
         logger.info(f"사용자 ID({user_id})에 대한 보고서 생성 시작")
         report_templates = self.report_repository.find_all_ordered_by_content_order(db)
@@ -142,7 +167,9 @@ class ReportService:
             logger.warning("보고서 템플릿이 DB에 존재하지 않습니다.")
             return []
         
-        user_answers = await self.disclosure_client.get_my_answers(user_id)
+        user_answers = await self._within_deadline(
+            self.disclosure_client.get_my_answers(user_id), deadline, "답변 조회"
+        )
         
         answers_dict = {}
         if user_answers:
@@ -168,15 +195,35 @@ class ReportService:
         ]
 
         # 3. 단 한 번의 호출로 모든 문단 생성
-        generated_paragraphs = await self.text_generator.generate_all_paragraphs(
-            paragraph_templates, answers_dict
+        generated_paragraphs = await self._within_deadline(
+            self.text_generator.generate_all_paragraphs(paragraph_templates, answers_dict),
+            deadline,
+            "문단 생성",
         )
         logger.info(f"일괄 처리로 {len(generated_paragraphs)}개의 문단 생성 완료")
 
-        # 4. 최종 보고서 조립
+        # 4. 테이블에 필요한 요구사항 정보를 한 번에 조회
+        table_requirement_ids = list(dict.fromkeys(
+            req_id
+            for t in report_templates
+            if t.content_type == 'TABLE' and t.source_requirement_ids
+            for req_id in t.source_requirement_ids
+        ))
+        requirements = await self._within_deadline(
+            self.disclosure_client.get_requirements_by_ids(table_requirement_ids, REQUIREMENT_FIELDS_FOR_TABLES),
+            deadline,
+            "요구사항 조회",
+        )
+        if requirements is None:
+            logger.warning("요구사항 일괄 조회 실패. 테이블마다 개별 조회로 진행합니다.")
+        else:
+            logger.info(f"테이블 요구사항 {len(requirements)}/{len(table_requirement_ids)}개 일괄 조회 완료")
+
+        # 5. 최종 보고서 조립
         report_contents: List[Dict[str, Any]] = []
         for template in report_templates:
-            content_item = await self._generate_content_item(template, answers_dict, generated_paragraphs)
+            self._check_deadline(deadline, "보고서 조립")
+            content_item = await self._generate_content_item(template, answers_dict, generated_paragraphs, requirements)
             if content_item:
                 report_contents.append(content_item)
 
@@ -187,10 +234,19 @@ class ReportService:
         self, 
         template: ReportTemplate, 
         answers_dict: Dict[str, Any],
-        generated_paragraphs: Dict[str, str]
+        generated_paragraphs: Dict[str, str],
+        requirements: Optional[Dict[str, Dict[str, Any]]] = None
     ) -> Optional[Dict[str, Any]]:
-        """템플릿과 생성된 텍스트를 기반으로 최종 보고서 콘텐츠 항목을 생성합니다."""
+        """
+        템플릿과 생성된 텍스트를 기반으로 최종 보고서 콘텐츠 항목을 생성합니다.
+        requirements(요구사항 ID → 정보)가 주어지면 테이블 요구사항을 disclosure-service에 다시 묻지 않습니다.
+        """
         content_type = template.content_type
+
+        async def get_requirement(req_id: str) -> Optional[Dict[str, Any]]:
+            if requirements is not None:
+                return requirements.get(req_id)
+            return await self.disclosure_client.get_requirement_by_id(req_id)
         
         if content_type == 'PARAGRAPH':
             content = generated_paragraphs.get(template.report_content_id, "오류: 해당 문단을 생성하지 못했습니다.")
@@ -236,8 +292,8 @@ class ReportService:
             driver_req_info = None
             # source_requirement_ids를 순회하며 'source_requirement' 키를 가진 '드라이버' 요구사항을 찾습니다.
             for req_id in template.source_requirement_ids:
-                req_info = await self.disclosure_client.get_requirement_by_id(req_id)
-                if req_info and req_info.get('input_schema', {}).get('source_requirement'):
+                req_info = await get_requirement(req_id)
+                if req_info and (req_info.get('input_schema') or {}).get('source_requirement'):
                     driver_id = req_id
                     driver_req_info = req_info
                     break  # 첫 번째 드라이버를 찾으면 중단
@@ -271,7 +327,7 @@ class ReportService:
             # --- 드라이버 미발견 시: 기존 테이블 생성 로직 실행 ---
             else:
                 primary_source_id = template.source_requirement_ids[0]
-                requirement_info = await self.disclosure_client.get_requirement_by_id(primary_source_id)
+                requirement_info = await get_requirement(primary_source_id)
                 if not requirement_info:
                     logger.error(f"Requirement 정보를 찾을 수 없습니다: id='{primary_source_id}'")
                     return empty_table
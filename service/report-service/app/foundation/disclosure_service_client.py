@@ -80,4 +80,46 @@ class DisclosureServiceClient:
                 return None
             except Exception as e:
                 logger.error(f"Disclosure Service 요구사항 통신 중 예외 발생: {e}")
-                return None 
\ No newline at end of file
+                return None
+
+    async def get_requirements_by_ids(
+        self,
+        requirement_ids: List[str],
+        fields: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        disclosure-service에 한 번의 요청으로 여러 요구사항의 상세 정보를 가져옵니다.
+
+        Args:
+            requirement_ids: 조회할 요구사항 ID 목록
+            fields: 응답에 포함할 필드 (생략 시 전체, 예: ["data_required_type", "input_schema"])
+
+        Returns:
+            요구사항 ID → 요구사항 데이터 딕셔너리 (찾을 수 없는 ID는 제외) 또는 실패 시 None
+        """
+        if not requirement_ids:
+            return {}
+
+        api_url = f"{self.base_url}/disclosure-data/requirements"
+        payload: Dict[str, Any] = {"ids": list(requirement_ids)}
+        if fields:
+            payload["fields"] = list(fields)
+
+        async with httpx.AsyncClient() as client:
+            try:
+                logger.info(f"disclosure-service에 요구사항 일괄 요청: {len(requirement_ids)}개")
+                response = await client.post(api_url, json=payload)
+                response.raise_for_status()
+
+                result = response.json()
+                if result.get("missing"):
+                    logger.warning(f"disclosure-service에서 찾을 수 없는 요구사항: {result['missing']}")
+                logger.info(f"disclosure-service로부터 요구사항 {len(result.get('requirements', {}))}개 수신 완료")
+                return result.get("requirements", {})
+
+            except httpx.HTTPStatusError as e:
+                logger.error(f"Disclosure Service 요구사항 일괄 API 호출 실패: {e.response.status_code} - {e.response.text}")
+                return None
+            except Exception as e:
+                logger.error(f"Disclosure Service 요구사항 일괄 통신 중 예외 발생: {e}")
+                return None